@@ -0,0 +1,69 @@
+"""Fixtures of the benchmark suite.
+
+Databases are seeded once per session for every size of `--users`.
+"""
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import Session
+
+from benchmarks.seed import seed_users
+from fastapi_user_management import crud
+from fastapi_user_management.config import SETTINGS
+from fastapi_user_management.core.database import set_sqlite_pragmas
+from fastapi_user_management.tools.encryption import get_password_hash
+
+PASSWORD = "super-secret"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add database sizes option."""
+    parser.addoption(
+        "--users",
+        default="10000",
+        help="comma separated users of seeded databases, e.g. 10000,100000,1000000",
+    )
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """Run benchmarks using a seeded database once per size."""
+    if "users_db" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("users").split(",")]
+        metafunc.parametrize(
+            "users_db",
+            sizes,
+            indirect=True,
+            scope="session",
+            ids=[f"{size}_users" for size in sizes],
+        )
+
+
+@pytest.fixture(scope="session")
+def password_hash() -> str:
+    """Password hash shared by seeded users."""
+    return get_password_hash(PASSWORD)
+
+
+@pytest.fixture(scope="session")
+def users_db(
+    request: pytest.FixtureRequest,
+    tmp_path_factory: pytest.TempPathFactory,
+    password_hash: str,
+) -> Generator[Engine, None, None]:
+    """Engine of a SQLite file seeded with `request.param` users."""
+    rows: int = request.param
+    path = tmp_path_factory.mktemp("benchmarks") / f"users-{rows}.db"
+    engine = create_engine(f"sqlite+pysqlite:///{path}")
+    set_sqlite_pragmas(engine, SETTINGS.SQLITE_PRAGMAS)
+    seed_users(engine, rows, password_hash)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def db(users_db: Engine) -> Generator[Session, None, None]:
+    """Session of the seeded database with a loaded role registry."""
+    with Session(users_db) as session:
+        crud.role.registry.load(session)
+        yield session
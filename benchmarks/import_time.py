@@ -0,0 +1,170 @@
+"""Check import time of package entry points against budgets.
+
+Imports every module of `IMPORT_BUDGETS_MS` in a fresh interpreter with
+`python -X importtime`, keeps the fastest of `--runs` runs and fails if it is
+over budget or loads a package of `DEFERRED_IMPORTS`, i.e. one that should
+only be imported on first use. The JSON report lists the slowest imports.
+
+Usage:
+    python -m benchmarks.import_time --runs 5 --top 10
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+# cumulative milliseconds, about 1.5x the fastest run on a laptop: above
+# run-to-run noise, low enough to catch a heavy import sneaking in.
+IMPORT_BUDGETS_MS = {
+    "fastapi_user_management.config": 10,
+    "fastapi_user_management.cli": 40,
+    "fastapi_user_management.app": 1000,
+}
+# routes are declared on the ORM models at import, loading settings &
+# everything built from them waits for `create_app` or their first use.
+DEFERRED_IMPORTS = {
+    "fastapi_user_management.config": ("omegaconf", "pydantic_settings"),
+    "fastapi_user_management.cli": ("fastapi", "sqlalchemy", "omegaconf", "passlib"),
+    "fastapi_user_management.app": (
+        "alembic",
+        "passlib",
+        "jose",
+        "omegaconf",
+        "aiosqlite",
+    ),
+}
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+@dataclass
+class ImportTime:
+    """Import of one module in a fresh interpreter."""
+
+    module: str
+    cumulative_ms: float
+    # cumulative milliseconds by module imported by `module`, itself included.
+    modules: dict[str, float] = field(default_factory=dict)
+
+    def top(self, count: int) -> dict[str, float]:
+        """Slowest imported modules.
+
+        Args:
+            count (int): number of modules
+
+        Returns:
+            dict[str, float]: cumulative milliseconds by module
+        """
+        slowest = sorted(self.modules.items(), key=lambda item: -item[1])
+        return {
+            name: round(ms, 1)
+            for name, ms in slowest[: count + 1]
+            if name != self.module
+        }
+
+
+def measure_import(module: str) -> ImportTime:
+    """Import module in a fresh interpreter with `-X importtime`.
+
+    Args:
+        module (str): module to import
+
+    Returns:
+        ImportTime: cumulative import time of module and its imports
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules: dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        _, cumulative_us, indent, name = match.groups()
+        modules[name] = int(cumulative_us) / 1000
+        if not indent and name != module:
+            # children are listed before their parent, keep subtree of module.
+            modules.clear()
+    return ImportTime(module, modules[module], modules)
+
+
+def fastest_import(module: str, runs: int) -> ImportTime:
+    """Fastest of several imports, the others being slowed down by noise.
+
+    Args:
+        module (str): module to import
+        runs (int): number of imports
+
+    Returns:
+        ImportTime: fastest import
+    """
+    return min(
+        (measure_import(module) for _ in range(runs)),
+        key=lambda measured: measured.cumulative_ms,
+    )
+
+
+def check(measured: ImportTime) -> list[str]:
+    """Budget & deferred imports violations.
+
+    Args:
+        measured (ImportTime): measured import
+
+    Returns:
+        list[str]: violations, empty if none
+    """
+    errors = []
+    budget = IMPORT_BUDGETS_MS[measured.module]
+    if measured.cumulative_ms > budget:
+        errors.append(
+            f"{measured.module} imports in {measured.cumulative_ms:.0f} ms,"
+            f" budget is {budget} ms"
+        )
+    errors.extend(
+        f"{measured.module} imports {package}, import it on first use instead"
+        for package in DEFERRED_IMPORTS.get(measured.module, ())
+        if package in measured.modules
+    )
+    return errors
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Measure imports and print JSON report.
+
+    Args:
+        argv (Sequence[str] | None, optional): arguments. Defaults to sys.argv.
+
+    Returns:
+        int: exit code, 1 if any import is over budget
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest imports shown")
+    args = parser.parse_args(argv)
+
+    report: dict[str, Any] = {}
+    errors: list[str] = []
+    for module in IMPORT_BUDGETS_MS:
+        measured = fastest_import(module, args.runs)
+        errors.extend(check(measured))
+        report[module] = {
+            "cumulative_ms": round(measured.cumulative_ms, 1),
+            "budget_ms": IMPORT_BUDGETS_MS[module],
+            "slowest": measured.top(args.top),
+        }
+    report["errors"] = errors
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
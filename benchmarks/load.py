@@ -0,0 +1,385 @@
+"""End-to-end load generator for the running service.
+
+Seeds a SQLite database, boots `fastapi_user_management.app:create_app` under
+uvicorn with `--workers` processes, drives mixed traffic from `--concurrency`
+clients for `--duration` seconds and prints a JSON report with throughput,
+error rates and latency percentiles & histograms per scenario.
+
+Scenarios:
+    login: `POST /auth/token` of a random active user (bcrypt verify).
+    me: `GET /users/me` with a token of a random active user.
+    list_users: `GET /users` with the admin token.
+
+Usage:
+    python -m benchmarks.load --users 100000 --workers 4 --concurrency 64 \
+        --duration 30 --mix login=1,me=8,list_users=1 --output report.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from benchmarks.seed import seed_users, status, username
+from fastapi_user_management.config import SETTINGS
+from fastapi_user_management.core.init_db import init_db
+from fastapi_user_management.models.user import UserStatusValues
+from fastapi_user_management.tools.encryption import get_password_hash
+
+ROOT = Path(__file__).resolve().parents[1]
+PASSWORD = "super-secret"
+SCENARIOS = ("login", "me", "list_users")
+# upper bounds in milliseconds, the last bucket holds slower requests.
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+STARTUP_TIMEOUT_SECONDS = 60
+
+
+@dataclass
+class ScenarioStats:
+    """Latencies and outcomes of one scenario."""
+
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    status_codes: Counter[str] = field(default_factory=Counter)
+
+    def record(self, latency_ms: float, status_code: str, ok: bool) -> None:
+        """Record a request.
+
+        Args:
+            latency_ms (float): response time
+            status_code (str): HTTP status or exception name
+            ok (bool): request succeeded
+        """
+        self.latencies_ms.append(latency_ms)
+        self.status_codes[status_code] += 1
+        if not ok:
+            self.errors += 1
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """Nearest-rank percentile.
+
+    Args:
+        values (Sequence[float]): sorted values
+        percent (float): percentile in [0, 100]
+
+    Returns:
+        float: percentile, 0 without values
+    """
+    if not values:
+        return 0.0
+    rank = max(1, round(percent / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+def summarize(stats: ScenarioStats, elapsed: float) -> dict[str, Any]:
+    """Report of a scenario.
+
+    Args:
+        stats (ScenarioStats): recorded requests
+        elapsed (float): seconds of traffic
+
+    Returns:
+        dict[str, Any]: throughput, errors, latency percentiles & histogram
+    """
+    latencies = sorted(stats.latencies_ms)
+    requests = len(latencies)
+    histogram = Counter[str]()
+    for latency in latencies:
+        bucket = next(
+            (f"<={bound}" for bound in HISTOGRAM_BUCKETS_MS if latency <= bound),
+            f">{HISTOGRAM_BUCKETS_MS[-1]}",
+        )
+        histogram[bucket] += 1
+    return {
+        "requests": requests,
+        "errors": stats.errors,
+        "error_rate": round(stats.errors / requests, 4) if requests else 0.0,
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "status_codes": dict(stats.status_codes),
+        "latency_ms": {
+            "mean": round(sum(latencies) / requests, 3) if requests else 0.0,
+            "p50": round(percentile(latencies, 50), 3),
+            "p90": round(percentile(latencies, 90), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+        "histogram_ms": {
+            bucket: histogram[bucket]
+            for bucket in [f"<={bound}" for bound in HISTOGRAM_BUCKETS_MS]
+            + [f">{HISTOGRAM_BUCKETS_MS[-1]}"]
+        },
+    }
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """Parse scenario weights like `login=1,me=8,list_users=1`.
+
+    Args:
+        mix (str): comma separated `scenario=weight`
+
+    Raises:
+        ValueError: raise if a scenario is unknown.
+
+    Returns:
+        dict[str, float]: weight by scenario
+    """
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario: {name}")
+        weights[name] = float(weight)
+    return weights
+
+
+def seed(path: Path, rows: int) -> list[str]:
+    """Seed users and the startup admin.
+
+    The admin is created here, so workers booting together don't race on it.
+
+    Args:
+        path (Path): SQLite file
+        rows (int): number of users
+
+    Returns:
+        list[str]: usernames of active users
+    """
+    engine = create_engine(f"sqlite+pysqlite:///{path}")
+    seed_users(engine, rows, get_password_hash(PASSWORD))
+    with Session(engine) as db:
+        init_db(db)
+    engine.dispose()
+    return [
+        username(user_id)
+        for user_id in range(1, rows + 1)
+        if status(user_id) is UserStatusValues.ACTIVE
+    ]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def start_server(path: Path, port: int, workers: int) -> subprocess.Popen[bytes]:
+    """Boot app under uvicorn against the seeded database.
+
+    Args:
+        path (Path): SQLite file
+        port (int): port to listen on
+        workers (int): uvicorn worker processes
+
+    Returns:
+        subprocess.Popen[bytes]: server process
+    """
+    env = {
+        **os.environ,
+        "DATABASE_URI": f"sqlite+pysqlite:///{path}",
+        # every client logs in from one address, far above per IP limits.
+        "LOGIN_THROTTLE_ENABLED": "false",
+    }
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "--factory",
+            "fastapi_user_management.app:create_app",
+            "--host=127.0.0.1",
+            f"--port={port}",
+            f"--workers={workers}",
+            "--log-level=warning",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+
+
+async def wait_until_ready(client: httpx.AsyncClient) -> None:
+    """Poll health check until the server answers.
+
+    Args:
+        client (httpx.AsyncClient): client of the server
+
+    Raises:
+        TimeoutError: raise if server doesn't start in time.
+    """
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError("Server didn't start in time")
+
+
+async def login(client: httpx.AsyncClient, name: str, password: str) -> str:
+    """Get access token.
+
+    Args:
+        client (httpx.AsyncClient): client of the server
+        name (str): username
+        password (str): password
+
+    Returns:
+        str: access token
+    """
+    response = await client.post(
+        "/auth/token", data={"username": name, "password": password}
+    )
+    response.raise_for_status()
+    return str(response.json()["access_token"])
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    args: argparse.Namespace,
+    usernames: list[str],
+) -> dict[str, Any]:
+    """Send mixed traffic and report it.
+
+    Args:
+        client (httpx.AsyncClient): client of the server
+        args (argparse.Namespace): parsed arguments
+        usernames (list[str]): active users
+
+    Returns:
+        dict[str, Any]: report
+    """
+    rng = random.Random(args.seed)
+    weights = parse_mix(args.mix)
+    scenarios, scenario_weights = list(weights), list(weights.values())
+    admin_token = await login(client, SETTINGS.ADMIN_EMAIL, SETTINGS.ADMIN_PASSWORD)
+    token_users = rng.sample(usernames, min(args.token_pool, len(usernames)))
+    tokens = [await login(client, name, PASSWORD) for name in token_users]
+    stats = {scenario: ScenarioStats() for scenario in scenarios}
+
+    def request(scenario: str) -> Any:
+        if scenario == "login":
+            return client.post(
+                "/auth/token",
+                data={"username": rng.choice(usernames), "password": PASSWORD},
+            )
+        if scenario == "me":
+            headers = {"Authorization": f"Bearer {rng.choice(tokens)}"}
+            return client.get("/users/me", headers=headers)
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        return client.get("/users", params={"limit": 50}, headers=headers)
+
+    async def user(deadline: float) -> None:
+        while time.monotonic() < deadline:
+            scenario = rng.choices(scenarios, scenario_weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await request(scenario)
+            except httpx.HTTPError as e:
+                status_code, ok = type(e).__name__, False
+            else:
+                status_code, ok = str(response.status_code), response.is_success
+            latency_ms = (time.perf_counter() - started) * 1000
+            stats[scenario].record(latency_ms, status_code, ok)
+
+    started = time.monotonic()
+    deadline = started + args.duration
+    await asyncio.gather(*(user(deadline) for _ in range(args.concurrency)))
+    elapsed = time.monotonic() - started
+
+    total = ScenarioStats()
+    for scenario_stats in stats.values():
+        total.latencies_ms.extend(scenario_stats.latencies_ms)
+        total.errors += scenario_stats.errors
+        total.status_codes.update(scenario_stats.status_codes)
+    return {
+        "config": {
+            "users": args.users,
+            "workers": args.workers,
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "mix": weights,
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "total": summarize(total, elapsed),
+        "scenarios": {
+            scenario: summarize(scenario_stats, elapsed)
+            for scenario, scenario_stats in stats.items()
+        },
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Seed database, boot server, drive traffic and stop server.
+
+    Args:
+        args (argparse.Namespace): parsed arguments
+
+    Returns:
+        dict[str, Any]: report
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "load.db"
+        usernames = seed(path, args.users)
+        port = _free_port()
+        server = start_server(path, port, args.workers)
+        try:
+            async with httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{port}",
+                timeout=args.timeout,
+                limits=httpx.Limits(max_connections=args.concurrency),
+            ) as client:
+                await wait_until_ready(client)
+                return await drive(client, args, usernames)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run load test and print JSON report.
+
+    Args:
+        argv (Sequence[str] | None, optional): arguments. Defaults to sys.argv.
+
+    Returns:
+        int: exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000, help="seeded users")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--concurrency", type=int, default=32, help="clients")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--mix", default="login=1,me=8,list_users=1")
+    parser.add_argument(
+        "--token-pool", type=int, default=50, help="users logged in for `me`"
+    )
+    parser.add_argument("--timeout", type=float, default=30, help="request seconds")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--output", type=Path, help="also write report to file")
+    args = parser.parse_args(argv)
+
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output is not None:
+        args.output.write_text(report + "\n", encoding="utf-8")
+    sys.stdout.write(report + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Compare query plans & timings of user queries without and with indexes.
+
+Seeds a throwaway SQLite database with `--rows` users (see `seed_users`),
+runs the hot queries once without the indexes of migration `8e4d2b6a1f3c`,
+then creates them from the model declarations and runs the queries again.
+
+Usage:
+    python -m benchmarks.query_plans --rows 1000000
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from collections.abc import Sequence
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import Engine, Index, Select, create_engine, func, select
+
+from benchmarks.seed import ADMIN_ROLE_ID, SEED_START, seed_users
+from fastapi_user_management.models.role import RoleModel
+from fastapi_user_management.models.user import UserModel, UserStatusValues
+from fastapi_user_management.models.user_role import UserRoleModel
+
+INDEXES: list[Index] = [
+    index
+    for table in (UserModel.__table__, UserRoleModel.__table__)
+    for index in table.indexes
+]
+REPEAT = 20
+
+
+def seed(engine: Engine, rows: int) -> None:
+    """Seed users, then drop the benchmarked indexes.
+
+    Args:
+        engine (Engine): database engine
+        rows (int): number of users
+    """
+    seed_users(engine, rows)
+    for index in INDEXES:
+        index.drop(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+
+
+def queries(rows: int) -> dict[str, Select[Any]]:
+    """Hot user queries.
+
+    Args:
+        rows (int): number of seeded users
+
+    Returns:
+        dict[str, Select[Any]]: statements by name
+    """
+    middle = SEED_START + timedelta(seconds=rows // 2)
+    return {
+        "roles_of_user": (
+            select(RoleModel.name)
+            .join(UserRoleModel, UserRoleModel.role_id == RoleModel.id)
+            .where(UserRoleModel.user_id == rows // 2)
+        ),
+        "admins": (
+            select(UserRoleModel.user_id)
+            .where(UserRoleModel.role_id == ADMIN_ROLE_ID)
+            .limit(50)
+        ),
+        "count_admins": (
+            select(func.count())
+            .select_from(UserRoleModel)
+            .where(UserRoleModel.role_id == 1)
+        ),
+        "users_by_status": (
+            select(UserModel.id)
+            .where(UserModel.status == UserStatusValues.DEACTIVATE)
+            .order_by(UserModel.id)
+            .limit(50)
+        ),
+        "keyset_page_by_created_at": (
+            select(UserModel)
+            .where(UserModel.created_at > middle)
+            .order_by(UserModel.created_at, UserModel.id)
+            .limit(50)
+        ),
+    }
+
+
+def measure(engine: Engine, statements: dict[str, Select[Any]]) -> dict[str, Any]:
+    """Explain & time statements.
+
+    Args:
+        engine (Engine): database engine
+        statements (dict[str, Select[Any]]): statements by name
+
+    Returns:
+        dict[str, Any]: plan and median milliseconds by name
+    """
+    report: dict[str, Any] = {}
+    with engine.connect() as connection:
+        for name, statement in statements.items():
+            compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+            plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")
+            timings = []
+            for _ in range(REPEAT):
+                started = time.perf_counter()
+                connection.execute(statement).all()
+                timings.append((time.perf_counter() - started) * 1000)
+            report[name] = {
+                "plan": [row[-1] for row in plan],
+                "median_ms": round(sorted(timings)[len(timings) // 2], 3),
+            }
+    return report
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run benchmark and print JSON report.
+
+    Args:
+        argv (Sequence[str] | None, optional): arguments. Defaults to sys.argv.
+
+    Returns:
+        int: exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite+pysqlite:///{Path(directory) / 'plans.db'}")
+        started = time.perf_counter()
+        seed(engine, args.rows)
+        seconds = time.perf_counter() - started
+        statements = queries(args.rows)
+
+        before = measure(engine, statements)
+        for index in INDEXES:
+            index.create(engine)
+        with engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+        after = measure(engine, statements)
+        engine.dispose()
+
+    report = {
+        "rows": args.rows,
+        "seed_seconds": round(seconds, 1),
+        "indexes": [index.name for index in INDEXES],
+        "queries": {
+            name: {"before": before[name], "after": after[name]} for name in statements
+        },
+    }
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
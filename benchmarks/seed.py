@@ -0,0 +1,108 @@
+"""Seed SQLite databases with many users for benchmarks.
+
+Rows are written with the `sqlite3` driver directly, far faster than the ORM:
+every user gets the `user` role, every tenth one `admin` too, and all share
+one password hash.
+"""
+import sqlite3
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any
+
+from sqlalchemy import Engine
+
+from fastapi_user_management.models.base import Base
+from fastapi_user_management.models.role import RoleNames
+from fastapi_user_management.models.user import UserStatusValues
+
+ADMIN_ROLE_ID = 1
+USER_ROLE_ID = 2
+SEED_BATCH_SIZE = 50_000
+SEED_START = datetime(2023, 10, 4)
+STATUSES = list(UserStatusValues)
+
+
+def username(user_id: int) -> str:
+    """Username of a seeded user.
+
+    Args:
+        user_id (int): user id
+
+    Returns:
+        str: username
+    """
+    return f"user-{user_id}@mail.com"
+
+
+def status(user_id: int) -> UserStatusValues:
+    """Status of a seeded user, every third one is active.
+
+    Args:
+        user_id (int): user id
+
+    Returns:
+        UserStatusValues: status
+    """
+    return STATUSES[user_id % len(STATUSES)]
+
+
+def _users(rows: int, password_hash: str) -> Iterator[tuple[Any, ...]]:
+    for user_id in range(1, rows + 1):
+        yield (
+            user_id,
+            f"user {user_id}",
+            username(user_id),
+            password_hash,
+            (SEED_START + timedelta(seconds=user_id)).isoformat(" "),
+            status(user_id).name,
+            0,
+        )
+
+
+def _user_roles(rows: int) -> Iterator[tuple[int, int]]:
+    for user_id in range(1, rows + 1):
+        yield (user_id, USER_ROLE_ID)
+        if user_id % 10 == 0:
+            yield (user_id, ADMIN_ROLE_ID)
+
+
+def _insert(
+    connection: sqlite3.Connection, statement: str, rows: Iterator[tuple[Any, ...]]
+) -> None:
+    while batch := list(islice(rows, SEED_BATCH_SIZE)):
+        connection.executemany(statement, batch)
+
+
+def seed_users(engine: Engine, rows: int, password_hash: str = "not-a-hash") -> None:
+    """Create tables and fill them with users.
+
+    Args:
+        engine (Engine): engine of an empty SQLite file database
+        rows (int): number of users
+        password_hash (str, optional): password hash of every user. \
+            Defaults to "not-a-hash".
+    """
+    Base.metadata.create_all(engine)
+    connection = sqlite3.connect(engine.url.database)
+    with connection:
+        connection.executemany(
+            "INSERT INTO role (id, name) VALUES (?, ?)",
+            [
+                (ADMIN_ROLE_ID, RoleNames.ADMIN.name),
+                (USER_ROLE_ID, RoleNames.USER.name),
+            ],
+        )
+        _insert(
+            connection,
+            "INSERT INTO user_account (id, fullname, username, password, created_at,"
+            " status, security_version) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            _users(rows, password_hash),
+        )
+        _insert(
+            connection,
+            "INSERT INTO user_role (user_id, role_id) VALUES (?, ?)",
+            _user_roles(rows),
+        )
+    connection.execute("ANALYZE")
+    connection.close()
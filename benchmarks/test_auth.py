@@ -0,0 +1,92 @@
+"""Benchmarks of tokens, password hashing and the current user dependency."""
+import asyncio
+from datetime import timedelta
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from benchmarks.conftest import PASSWORD
+from benchmarks.seed import username
+from fastapi_user_management.routes.auth import get_current_user
+from fastapi_user_management.schemas.auth import TokenData
+from fastapi_user_management.tools.cache import get_principal_cache, get_token_cache
+from fastapi_user_management.tools.encryption import (
+    get_password_hash,
+    verify_password,
+)
+from fastapi_user_management.tools.token import (
+    create_access_token,
+    verify_access_token,
+)
+
+# bcrypt is slow on purpose, a few rounds are enough.
+HASH_ROUNDS = 5
+
+
+def _token() -> str:
+    return create_access_token(
+        {"sub": username(1)}, expires_delta=timedelta(minutes=60)
+    )
+
+
+def test_create_access_token(benchmark: BenchmarkFixture) -> None:
+    """Sign an access token."""
+    benchmark(_token)
+
+
+def test_verify_access_token(benchmark: BenchmarkFixture) -> None:
+    """Decode & validate an access token missing the token cache."""
+    token = _token()
+    benchmark.pedantic(
+        verify_access_token,
+        args=(token, TokenData),
+        setup=get_token_cache().clear,
+        rounds=1000,
+    )
+
+
+def test_verify_access_token_cached(benchmark: BenchmarkFixture) -> None:
+    """Decode & validate an access token hitting the token cache."""
+    token = _token()
+    verify_access_token(token, TokenData)
+    benchmark(verify_access_token, token, TokenData)
+
+
+def test_get_password_hash(benchmark: BenchmarkFixture) -> None:
+    """Hash a password."""
+    benchmark.pedantic(get_password_hash, args=(PASSWORD,), rounds=HASH_ROUNDS)
+
+
+def test_verify_password(benchmark: BenchmarkFixture, password_hash: str) -> None:
+    """Verify a password."""
+    benchmark.pedantic(
+        verify_password, args=(PASSWORD, password_hash), rounds=HASH_ROUNDS
+    )
+
+
+@pytest.mark.parametrize("cached", [False, True], ids=["cold", "cached"])
+def test_get_current_user(
+    benchmark: BenchmarkFixture, users_db: Engine, cached: bool
+) -> None:
+    """Resolve the current user of a token, with and without caches."""
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{users_db.url.database}")
+    loop = asyncio.new_event_loop()
+    token = _token()
+
+    async def current_user() -> None:
+        async with AsyncSession(async_engine) as db:
+            await get_current_user(token, db)
+
+    def setup() -> None:
+        if not cached:
+            get_token_cache().clear()
+            get_principal_cache().clear()
+
+    loop.run_until_complete(current_user())
+    benchmark.pedantic(
+        lambda: loop.run_until_complete(current_user()), setup=setup, rounds=200
+    )
+    loop.run_until_complete(async_engine.dispose())
+    loop.close()
@@ -0,0 +1,83 @@
+"""Benchmarks of user CRUD against seeded databases."""
+import itertools
+
+from pytest_benchmark.fixture import BenchmarkFixture
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+from benchmarks.conftest import PASSWORD
+from benchmarks.seed import username
+from fastapi_user_management import crud
+from fastapi_user_management.schemas.role import RoleBase
+from fastapi_user_management.schemas.user import UserCreate
+
+# `create` hashes the password with bcrypt, a few rounds are enough.
+CREATE_ROUNDS = 5
+
+
+def _rows(users_db: Engine) -> int:
+    with users_db.connect() as connection:
+        return int(
+            connection.exec_driver_sql("SELECT MAX(id) FROM user_account").scalar()
+        )
+
+
+def test_create(benchmark: BenchmarkFixture, db: Session) -> None:
+    """Create a user with a role."""
+    counter = itertools.count()
+
+    def create() -> None:
+        crud.user.create(
+            db,
+            obj_in=UserCreate(
+                fullname="Bench User",
+                username=f"bench-{next(counter)}@mail.com",
+                password=PASSWORD,
+                roles=[RoleBase(name="user")],
+            ),
+        )
+        db.expunge_all()
+
+    benchmark.pedantic(create, rounds=CREATE_ROUNDS)
+
+
+def test_get_by_username(
+    benchmark: BenchmarkFixture, db: Session, users_db: Engine
+) -> None:
+    """Look a user up by username, roles included."""
+    name = username(_rows(users_db) // 2)
+
+    def get_by_username() -> None:
+        crud.user.get_by_username(db, username=name)
+        db.expunge_all()
+
+    benchmark(get_by_username)
+
+
+def test_get_multi(benchmark: BenchmarkFixture, db: Session) -> None:
+    """List the first page of users."""
+
+    def get_multi() -> None:
+        crud.user.get_multi(db, limit=50)
+        db.expunge_all()
+
+    benchmark(get_multi)
+
+
+def test_get_multi_deep_offset(
+    benchmark: BenchmarkFixture, db: Session, users_db: Engine
+) -> None:
+    """List a page of users from the middle of the table."""
+    skip = _rows(users_db) // 2
+
+    def get_multi() -> None:
+        crud.user.get_multi(db, skip=skip, limit=50)
+        db.expunge_all()
+
+    benchmark(get_multi)
+
+
+def test_is_admin(benchmark: BenchmarkFixture, db: Session) -> None:
+    """Check admin role of a loaded user."""
+    user = crud.user.get_by_username(db, username=username(10))
+    benchmark(crud.user.is_admin, db, db_obj=user)
@@ -0,0 +1,10 @@
+"""Import time of package entry points, see `benchmarks.import_time`."""
+import pytest
+
+from benchmarks.import_time import IMPORT_BUDGETS_MS, check, fastest_import
+
+
+@pytest.mark.parametrize("module", IMPORT_BUDGETS_MS)
+def test_import_time_budget(module: str) -> None:
+    """Import within budget and without deferred packages."""
+    assert check(fastest_import(module, runs=3)) == []
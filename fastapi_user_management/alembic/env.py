@@ -15,6 +15,8 @@ if config.config_file_name is not None:
 # add your model's MetaData object here
 # for 'autogenerate' support
 from fastapi_user_management.models.base import Base
+from fastapi_user_management.models.refresh_token import RefreshTokenModel  # noqa: F401
+from fastapi_user_management.models.revoked_token import RevokedTokenModel  # noqa: F401
 from fastapi_user_management.models.role import RoleModel  # noqa: F401
 from fastapi_user_management.models.user import UserModel  # noqa: F401
 from fastapi_user_management.models.user_role import UserRoleModel  # noqa: F401
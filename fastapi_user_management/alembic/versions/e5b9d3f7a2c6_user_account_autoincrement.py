@@ -0,0 +1,39 @@
+"""Never reuse user ids on SQLite.
+
+Revision ID: e5b9d3f7a2c6
+Revises: d2f8a6c1e0b4
+Create Date: 2026-10-18 19:21:08.417305
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b9d3f7a2c6"
+down_revision: str | None = "d2f8a6c1e0b4"
+branch_labels: str | (Sequence[str] | None) = None
+depends_on: str | (Sequence[str] | None) = None
+
+
+def upgrade() -> None:
+    # other databases never reuse sequence values, SQLite needs AUTOINCREMENT.
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    with op.batch_alter_table(
+        "user_account",
+        recreate="always",
+        table_kwargs={"sqlite_autoincrement": True},
+    ):
+        pass
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    with op.batch_alter_table(
+        "user_account",
+        recreate="always",
+        table_kwargs={"sqlite_autoincrement": False},
+    ):
+        pass
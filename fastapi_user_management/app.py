@@ -3,39 +3,141 @@
 Authors: pejmans21
 Date: July 6, 2023
 """
+import asyncio
+import math
+from collections.abc import AsyncIterator
+from contextlib import ExitStack, asynccontextmanager, suppress
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
-from fastapi_user_management.config import SETTINGS
-from fastapi_user_management.core.database import engine
+from fastapi_user_management import crud
+from fastapi_user_management.config import get_settings
+from fastapi_user_management.core.database import (
+    get_async_session_local,
+    get_engine,
+)
 from fastapi_user_management.core.init_db import init_db
-from fastapi_user_management.models.base import Base
-from fastapi_user_management.routes import auth
+from fastapi_user_management.core.startup import (
+    StartupTimings,
+    prepare_schema,
+    startup_lock,
+)
+from fastapi_user_management.errors.exceptions import (
+    HashingQueueFullError,
+    LoginThrottledError,
+)
+from fastapi_user_management.routes import auth, metrics, users
+from fastapi_user_management.tools.cache import get_cache_backend
+from fastapi_user_management.tools.hashing import (
+    get_hashing_service,
+    get_import_hashing_service,
+)
+from fastapi_user_management.tools.metrics import MetricsMiddleware
+from fastapi_user_management.tools.profiler import ProfilerMiddleware
+from fastapi_user_management.tools.revocation import get_revocation_list
 
 
-def create_db_and_tables() -> None:
-    """Create db and tables."""
-    Base.metadata.create_all(engine)
+def prepare_database(timings: StartupTimings) -> None:
+    """Create schema if needed, seed admin user and load roles.
 
+    Args:
+        timings (StartupTimings): startup phases timer
+    """
+    engine = get_engine()
+    with ExitStack() as stack:
+        with timings.phase("lock"):
+            stack.enter_context(startup_lock(engine, get_settings().STARTUP_LOCK_PATH))
+        with timings.phase("schema"):
+            prepare_schema(engine)
+        with timings.phase("seed"), Session(bind=engine) as session:
+            init_db(db=session)
+    with timings.phase("roles"), Session(bind=engine) as session:
+        crud.role.registry.load(db=session)
 
-app = FastAPI(
-    title=SETTINGS.TITLE,
-    description=SETTINGS.DESCRIPTION,
-    docs_url=SETTINGS.DOCS_URL,
-    redoc_url=SETTINGS.REDOC_URL,
-)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Prepare database & background sync on startup, release them on shutdown.
+
+    Args:
+        app (FastAPI): application
+
+    Yields:
+        AsyncIterator[None]: running application
+    """
+    settings = get_settings()
+    async_session_local = get_async_session_local()
+    revocation_list = get_revocation_list()
+    timings = StartupTimings()
+    await run_in_threadpool(prepare_database, timings)
+    async with async_session_local() as db:
+        # routes use the async engine, which has its own registry bucket.
+        with timings.phase("async_roles"):
+            await crud.role.registry.load_async(db)
+        with timings.phase("revocations"):
+            await revocation_list.sync_async(db)
+    timings.report()
+    app.state.startup_timings = timings.phases
+    revocation_sync = asyncio.create_task(
+        revocation_list.run(
+            async_session_local,
+            sync_interval=settings.REVOCATION_SYNC_INTERVAL_SECONDS,
+            purge_interval=settings.REVOCATION_PURGE_INTERVAL_SECONDS,
+            purge_batch_size=settings.REVOCATION_PURGE_BATCH_SIZE,
+        )
+    )
+    try:
+        yield
+    finally:
+        revocation_sync.cancel()
+        with suppress(asyncio.CancelledError):
+            await revocation_sync
+        get_hashing_service().shutdown()
+        get_import_hashing_service().shutdown()
+        get_cache_backend().close()
+
+
+async def hashing_queue_full_handler(
+    request: Request, exc: HashingQueueFullError
+) -> JSONResponse:
+    """Reject request fast when password hashing is saturated.
+
+    Args:
+        request (Request): incoming request
+        exc (HashingQueueFullError): raised error
+
+    Returns:
+        JSONResponse: 503 response with `Retry-After` header.
+    """
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": exc.message},
+        headers={"Retry-After": "1"},
+    )
+
+
+async def login_throttled_handler(
+    request: Request, exc: LoginThrottledError
+) -> JSONResponse:
+    """Reject login attempts of throttled usernames or client IPs.
 
-@app.on_event("startup")
-def on_startup() -> None:
-    """Initiate database on startup."""
-    create_db_and_tables()
-    with Session(bind=engine) as session:
-        init_db(db=session)
+    Args:
+        request (Request): incoming request
+        exc (LoginThrottledError): raised error
+
+    Returns:
+        JSONResponse: 429 response with `Retry-After` header.
+    """
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": exc.message},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
 
 
-@app.get("/")
 def main() -> dict[str, str]:
     """Simple hello-world.
 
@@ -45,4 +147,35 @@ def main() -> dict[str, str]:
     return {"message": "hello-world!", "status": "ok"}
 
 
-app.include_router(auth.router)
+def create_app() -> FastAPI:
+    """Build application from settings.
+
+    Serve with `uvicorn --factory fastapi_user_management.app:create_app`.
+
+    Returns:
+        FastAPI: application
+    """
+    settings = get_settings()
+    app = FastAPI(
+        title=settings.TITLE,
+        description=settings.DESCRIPTION,
+        docs_url=settings.DOCS_URL,
+        redoc_url=settings.REDOC_URL,
+        lifespan=lifespan,
+    )
+    app.add_exception_handler(HashingQueueFullError, hashing_queue_full_handler)
+    app.add_exception_handler(LoginThrottledError, login_throttled_handler)
+    app.add_api_route("/", main, methods=["GET"])
+    app.include_router(auth.router)
+    app.include_router(users.router)
+
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics.router)
+
+    if settings.PROFILER_ENABLED:
+        app.add_middleware(
+            ProfilerMiddleware,
+            repeated_statement_threshold=settings.PROFILER_REPEATED_STATEMENT_THRESHOLD,
+        )
+    return app
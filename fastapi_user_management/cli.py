@@ -0,0 +1,157 @@
+"""Command line tools.
+
+Usage:
+    python -m fastapi_user_management.cli import-users users.csv --workers 8
+    python -m fastapi_user_management.cli calibrate-hashing --target-ms 250
+    python -m fastapi_user_management.cli --settings prod.yaml import-users ...
+
+Commands import the ORM, password hashing and settings when they run, so
+`--help` stays fast and `--settings` applies before settings are loaded.
+"""
+import argparse
+import os
+import sys
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+
+def import_users(args: argparse.Namespace) -> int:
+    """Import users from file with batched inserts and parallel hashing.
+
+    Args:
+        args (argparse.Namespace): parsed arguments
+
+    Returns:
+        int: exit code, 1 if the import stopped on an invalid or existing user
+    """
+    from fastapi_user_management import crud
+    from fastapi_user_management.core.database import get_session_local
+    from fastapi_user_management.crud.crud_users import IMPORT_BATCH_SIZE
+    from fastapi_user_management.errors.exceptions import UserImportError
+    from fastapi_user_management.tools.user_import import read_users
+
+    path: Path = args.path
+    file_format = args.format or path.suffix.lstrip(".")
+    with (
+        path.open(newline="", encoding="utf-8") as stream,
+        ProcessPoolExecutor(max_workers=args.workers) as executor,
+        get_session_local()() as db,
+    ):
+        try:
+            created = crud.user.create_many(
+                db,
+                objs_in=read_users(stream, file_format),
+                batch_size=args.batch_size or IMPORT_BATCH_SIZE,
+                executor=executor,
+            )
+        except UserImportError as e:
+            sys.stderr.write(
+                f"Import stopped after {e.created} users from {path}: {e.message}\n"
+            )
+            return 1
+    sys.stdout.write(f"Imported {created} users from {path}\n")
+    return 0
+
+
+def calibrate_hashing(args: argparse.Namespace) -> int:
+    """Recommend hashing cost verifying within target time on this machine.
+
+    Args:
+        args (argparse.Namespace): parsed arguments
+
+    Returns:
+        int: exit code, 1 if even the lowest cost is over target
+    """
+    from fastapi_user_management.config import SETTINGS
+    from fastapi_user_management.tools.calibration import calibrate
+
+    scheme = args.scheme or SETTINGS.HASHING_SCHEME
+    min_cost, max_cost = (4, 16) if scheme == "bcrypt" else (1, 10)
+    result = calibrate(
+        scheme,
+        args.target_ms,
+        min_cost=args.min_cost or min_cost,
+        max_cost=args.max_cost or max_cost,
+        samples=args.samples,
+        memory_cost=SETTINGS.HASHING_ARGON2_MEMORY_COST,
+        parallelism=SETTINGS.HASHING_ARGON2_PARALLELISM,
+    )
+    for cost, elapsed_ms in result.timings_ms.items():
+        sys.stdout.write(f"{scheme} cost {cost}: {elapsed_ms:.1f} ms\n")
+    if result.recommended is None:
+        sys.stdout.write(f"No cost verifies within {args.target_ms} ms\n")
+        return 1
+    snippet = result.settings_snippet(
+        SETTINGS.HASHING_ARGON2_MEMORY_COST, SETTINGS.HASHING_ARGON2_PARALLELISM
+    )
+    sys.stdout.write(f"Recommended settings.yaml:\n{snippet}\n")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build command line parser.
+
+    Returns:
+        argparse.ArgumentParser: parser with sub-commands
+    """
+    parser = argparse.ArgumentParser(prog="fastapi_user_management")
+    parser.add_argument(
+        "--settings",
+        type=Path,
+        help="settings file, defaults to SETTINGS_FILE or settings.yaml",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser(
+        "import-users", help="bulk import users from CSV or JSON Lines"
+    )
+    import_parser.add_argument("path", type=Path)
+    import_parser.add_argument(
+        "--format", help="csv or jsonl, defaults to file extension"
+    )
+    import_parser.add_argument("--batch-size", type=int, help="users per insert")
+    import_parser.add_argument(
+        "--workers", type=int, default=None, help="hashing processes"
+    )
+    import_parser.set_defaults(func=import_users)
+
+    calibrate_parser = subparsers.add_parser(
+        "calibrate-hashing", help="recommend password hashing cost"
+    )
+    calibrate_parser.add_argument(
+        "--target-ms", type=float, default=250, help="verify time budget"
+    )
+    calibrate_parser.add_argument(
+        "--scheme", help="bcrypt or argon2, defaults to hashing.scheme setting"
+    )
+    calibrate_parser.add_argument(
+        "--samples", type=int, default=5, help="verifications per cost"
+    )
+    calibrate_parser.add_argument(
+        "--min-cost", type=int, help="bcrypt rounds or argon2 time cost"
+    )
+    calibrate_parser.add_argument(
+        "--max-cost", type=int, help="bcrypt rounds or argon2 time cost"
+    )
+    calibrate_parser.set_defaults(func=calibrate_hashing)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run command line tools.
+
+    Args:
+        argv (Sequence[str] | None, optional): arguments. Defaults to sys.argv.
+
+    Returns:
+        int: exit code
+    """
+    args = build_parser().parse_args(argv)
+    if args.settings is not None:
+        os.environ["SETTINGS_FILE"] = str(args.settings)
+    return int(args.func(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
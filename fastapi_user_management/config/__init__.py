@@ -1,3 +1,19 @@
-from fastapi_user_management.config._config import SETTINGS
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["SETTINGS"]
+if TYPE_CHECKING:
+    from fastapi_user_management.config._config import (
+        SETTINGS,
+        Settings,
+        get_settings,
+    )
+
+__all__ = ["SETTINGS", "Settings", "get_settings"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import settings module and load `SETTINGS` on first access."""
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from fastapi_user_management.config import _config
+
+    return getattr(_config, name)
@@ -1,39 +1,364 @@
-"""Fastapi application config."""
+"""Fastapi application config.
 
-from omegaconf import OmegaConf
-from pydantic import EmailStr
-from pydantic_settings import BaseSettings
+Values of `settings.yaml` are defaults of `Settings` fields, overridden by
+environment variables & `.env`. Nothing is read until `SETTINGS` or
+`get_settings` is first used, the file comes from `SETTINGS_FILE` (init
+argument or environment) or `settings.yaml` of the working directory, else
+of the project root.
+"""
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pydantic import EmailStr, Field, model_validator
+from pydantic.fields import FieldInfo
+from pydantic_settings import BaseSettings, PydanticBaseSettingsSource
 
 from fastapi_user_management import __version__
 
-APP_CUSTOM_CONFIG = OmegaConf.load("settings.yaml")
+if TYPE_CHECKING:
+    from omegaconf import DictConfig
+
+SETTINGS_FILE_NAME = "settings.yaml"
+PROJECT_SETTINGS_FILE = Path(__file__).resolve().parents[2] / SETTINGS_FILE_NAME
+CUSTOM_CONFIG_KEY = "custom_config"
+# async driver of each sync dialect & driver, used for unset async URIs.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgresql+psycopg": "postgresql+psycopg",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+}
+
+
+def default_runtime_dir(database_uri: str) -> str:
+    """Runtime directory shared by workers of one host using one database.
+
+    Args:
+        database_uri (str): sync database URI
+
+    Returns:
+        str: directory in the system temp dir
+    """
+    digest = hashlib.sha256(database_uri.encode()).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"fastapi-user-management-{digest}")
+
+
+def custom_config(key: str) -> Any:
+    """Field read from settings file, unless set by environment.
+
+    Args:
+        key (str): dotted key in settings file, e.g. "fastapi.title"
+
+    Returns:
+        Any: pydantic field
+    """
+    return Field(json_schema_extra={CUSTOM_CONFIG_KEY: key})
+
+
+def async_database_uri(uri: str) -> str:
+    """Same database URL with the async driver of its dialect.
+
+    Args:
+        uri (str): sync database URL, e.g. "sqlite+pysqlite:///db.sqlite3"
+
+    Raises:
+        ValueError: raise if no async driver is known for the dialect.
+
+    Returns:
+        str: async database URL, e.g. "sqlite+aiosqlite:///db.sqlite3"
+    """
+    driver, separator, rest = uri.partition("://")
+    if not separator or driver not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for {driver!r}, set the async URI")
+    return f"{ASYNC_DRIVERS[driver]}://{rest}"
+
+
+def resolve_settings_file(path: str | os.PathLike[str] | None = None) -> Path:
+    """Settings file to load.
+
+    Args:
+        path (str | os.PathLike[str] | None, optional): explicit file. \
+            Defaults to `settings.yaml` of working directory or project root.
+
+    Returns:
+        Path: settings file
+    """
+    if path is not None:
+        return Path(path)
+    if Path(SETTINGS_FILE_NAME).is_file():
+        return Path(SETTINGS_FILE_NAME)
+    return PROJECT_SETTINGS_FILE
+
+
+@lru_cache
+def load_custom_config(path: Path) -> "DictConfig":
+    """Load settings file once per path.
+
+    Args:
+        path (Path): settings file
+
+    Returns:
+        DictConfig: file content
+    """
+    from omegaconf import OmegaConf
+
+    config = OmegaConf.load(path)
+    OmegaConf.set_readonly(config, True)
+    return config
+
+
+class CustomConfigSource(PydanticBaseSettingsSource):
+    """Settings source of fields declared with `custom_config`."""
+
+    def __init__(
+        self,
+        settings_cls: type[BaseSettings],
+        path_sources: tuple[PydanticBaseSettingsSource, ...],
+    ) -> None:
+        """Source reading the file named by the first source setting `SETTINGS_FILE`.
+
+        Args:
+            settings_cls (type[BaseSettings]): settings class
+            path_sources (tuple[PydanticBaseSettingsSource, ...]): sources of \
+                higher priority, searched for `SETTINGS_FILE`
+        """
+        super().__init__(settings_cls)
+        self.path_sources = path_sources
+
+    def get_field_value(
+        self, field: FieldInfo, field_name: str
+    ) -> tuple[Any, str, bool]:
+        """Unused, values are read all at once by `__call__`."""
+        return None, field_name, False
+
+    def __call__(self) -> dict[str, Any]:
+        """Read every `custom_config` field.
+
+        Returns:
+            dict[str, Any]: values by field name
+        """
+        from omegaconf import OmegaConf
+
+        path = next(
+            (
+                values["SETTINGS_FILE"]
+                for values in (source() for source in self.path_sources)
+                if values.get("SETTINGS_FILE")
+            ),
+            None,
+        )
+        path = resolve_settings_file(path)
+        config = load_custom_config(path)
+        data: dict[str, Any] = {"SETTINGS_FILE": str(path)}
+        for field_name, field in self.settings_cls.model_fields.items():
+            extra = field.json_schema_extra
+            if not isinstance(extra, dict) or CUSTOM_CONFIG_KEY not in extra:
+                continue
+            value = OmegaConf.select(
+                config, extra[CUSTOM_CONFIG_KEY], throw_on_missing=True
+            )
+            data[field_name] = (
+                OmegaConf.to_container(value) if OmegaConf.is_config(value) else value
+            )
+        return data
 
 
 class Settings(BaseSettings):
+    SETTINGS_FILE: str | None = None
+
     SECRET_KEY: str
 
     ADMIN_FULLNAME: str
     ADMIN_EMAIL: EmailStr
     ADMIN_PASSWORD: str
 
-    TITLE: str = APP_CUSTOM_CONFIG.fastapi.title
-    DESCRIPTION: str = APP_CUSTOM_CONFIG.fastapi.description
+    TITLE: str = custom_config("fastapi.title")
+    DESCRIPTION: str = custom_config("fastapi.description")
 
     VERSION: str = __version__
 
-    DOCS_URL: str = APP_CUSTOM_CONFIG.fastapi.docs_url
-    REDOC_URL: str = APP_CUSTOM_CONFIG.fastapi.redoc_url
+    DOCS_URL: str = custom_config("fastapi.docs_url")
+    REDOC_URL: str = custom_config("fastapi.redoc_url")
+
+    ALGORITHM: str = custom_config("fastapi.algorithm")
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = custom_config(
+        "fastapi.access_token_expire_minutes"
+    )
+    REFRESH_TOKEN_EXPIRE_DAYS: int = custom_config("fastapi.refresh_token_expire_days")
+
+    STATELESS_AUTH: bool = custom_config("fastapi.stateless_auth")
+
+    DATABASE_URI: str = custom_config("database.uri")
+    ASYNC_DATABASE_URI: str | None = custom_config("database.async_uri")
+    DATABASE_REPLICA_URIS: list[str] = custom_config("database.replica_uris")
+    ASYNC_DATABASE_REPLICA_URIS: list[str] = custom_config(
+        "database.async_replica_uris"
+    )
+    DATABASE_REPLICA_RETRY_SECONDS: float = custom_config(
+        "database.replica_retry_seconds"
+    )
+    STRICT_LOADING: bool = custom_config("database.strict_loading")
+    DATABASE_POOL_CLASS: str = custom_config("database.pool.poolclass")
+    DATABASE_POOL_SIZE: int = custom_config("database.pool.size")
+    DATABASE_MAX_OVERFLOW: int = custom_config("database.pool.max_overflow")
+    DATABASE_POOL_TIMEOUT: float = custom_config("database.pool.timeout")
+    DATABASE_POOL_RECYCLE: int = custom_config("database.pool.recycle")
+    DATABASE_POOL_PRE_PING: bool = custom_config("database.pool.pre_ping")
+    DATABASE_CONNECT_ARGS: dict[str, Any] = custom_config("database.pool.connect_args")
+    SQLITE_PRAGMAS: dict[str, str | int] = custom_config("database.sqlite")
+
+    METRICS_ENABLED: bool = custom_config("metrics.enabled")
+    METRICS_TOKEN: str | None = None
+    PROFILER_ENABLED: bool = custom_config("profiler.enabled")
+    PROFILER_REPEATED_STATEMENT_THRESHOLD: int = custom_config(
+        "profiler.repeated_statement_threshold"
+    )
+
+    HASHING_SCHEME: str = custom_config("hashing.scheme")
+    HASHING_BCRYPT_ROUNDS: int = custom_config("hashing.bcrypt_rounds")
+    HASHING_ARGON2_MEMORY_COST: int = custom_config("hashing.argon2_memory_cost")
+    HASHING_ARGON2_TIME_COST: int = custom_config("hashing.argon2_time_cost")
+    HASHING_ARGON2_PARALLELISM: int = custom_config("hashing.argon2_parallelism")
+    HASHING_EXECUTOR: str = custom_config("hashing.executor")
+    HASHING_MAX_WORKERS: int = custom_config("hashing.max_workers")
+    HASHING_MAX_IN_FLIGHT: int = custom_config("hashing.max_in_flight")
+    HASHING_IMPORT_MAX_WORKERS: int = custom_config("hashing.import_max_workers")
+
+    LOGIN_THROTTLE_ENABLED: bool = custom_config("login_throttle.enabled")
+    LOGIN_THROTTLE_USERNAME_PER_MINUTE: float = custom_config(
+        "login_throttle.username.per_minute"
+    )
+    LOGIN_THROTTLE_USERNAME_BURST: int = custom_config("login_throttle.username.burst")
+    LOGIN_THROTTLE_USERNAME_MAX_FAILURES: int = custom_config(
+        "login_throttle.username.max_failures"
+    )
+    LOGIN_THROTTLE_IP_PER_MINUTE: float = custom_config("login_throttle.ip.per_minute")
+    LOGIN_THROTTLE_IP_BURST: int = custom_config("login_throttle.ip.burst")
+    LOGIN_THROTTLE_IP_MAX_FAILURES: int = custom_config(
+        "login_throttle.ip.max_failures"
+    )
+    LOGIN_THROTTLE_LOCKOUT_SECONDS: float = custom_config(
+        "login_throttle.lockout_seconds"
+    )
+    LOGIN_THROTTLE_MAX_LOCKOUT_SECONDS: float = custom_config(
+        "login_throttle.max_lockout_seconds"
+    )
+    LOGIN_THROTTLE_MAXSIZE: int = custom_config("login_throttle.maxsize")
+    LOGIN_THROTTLE_IDLE_SECONDS: float = custom_config("login_throttle.idle_seconds")
+
+    REVOCATION_SYNC_INTERVAL_SECONDS: float = custom_config(
+        "revocation.sync_interval_seconds"
+    )
+    REVOCATION_SYNC_OVERLAP: int = custom_config("revocation.sync_overlap")
+    REVOCATION_PURGE_INTERVAL_SECONDS: float = custom_config(
+        "revocation.purge_interval_seconds"
+    )
+    REVOCATION_PURGE_BATCH_SIZE: int = custom_config("revocation.purge_batch_size")
 
-    ALGORITHM: str = APP_CUSTOM_CONFIG.fastapi.algorithm
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = (
-        APP_CUSTOM_CONFIG.fastapi.access_token_expire_minutes
+    CACHE_BACKEND: str = custom_config("cache.backend")
+    CACHE_SQLITE_PATH: str = custom_config("cache.sqlite_path")
+    CACHE_REDIS_URL: str = custom_config("cache.redis_url")
+    CACHE_BROADCAST: str = custom_config("cache.broadcast")
+    CACHE_BROADCAST_POLL_SECONDS: float = custom_config("cache.broadcast_poll_seconds")
+    PRINCIPAL_CACHE_MAXSIZE: int = custom_config("cache.principal_maxsize")
+    PRINCIPAL_CACHE_TTL_SECONDS: float = custom_config("cache.principal_ttl_seconds")
+    SECURITY_VERSION_CACHE_MAXSIZE: int = custom_config(
+        "cache.security_version_maxsize"
+    )
+    SECURITY_VERSION_CACHE_TTL_SECONDS: float = custom_config(
+        "cache.security_version_ttl_seconds"
     )
+    TOKEN_CACHE_MAXSIZE: int = custom_config("cache.token_maxsize")
 
-    DATABASE_URI: str = APP_CUSTOM_CONFIG.database.uri
+    STARTUP_LOCK_PATH: str = custom_config("startup.lock_path")
+    RUNTIME_DIR: str | None = custom_config("runtime.dir")
 
     class Config:
         env_file = ".env"
         case_sensitive = True
 
+    @model_validator(mode="after")
+    def derive_async_database_uris(self) -> "Settings":
+        """Point async engines at the sync databases unless set explicitly.
+
+        Returns:
+            Settings: settings with async URIs
+        """
+        if self.ASYNC_DATABASE_URI is None:
+            self.ASYNC_DATABASE_URI = async_database_uri(self.DATABASE_URI)
+        if not self.ASYNC_DATABASE_REPLICA_URIS:
+            self.ASYNC_DATABASE_REPLICA_URIS = [
+                async_database_uri(uri) for uri in self.DATABASE_REPLICA_URIS
+            ]
+        return self
+
+    @model_validator(mode="after")
+    def resolve_runtime_paths(self) -> "Settings":
+        """Place lock & cache files in the runtime directory, not the CWD.
+
+        Returns:
+            Settings: settings with absolute runtime paths
+        """
+        if self.RUNTIME_DIR is None:
+            self.RUNTIME_DIR = default_runtime_dir(self.DATABASE_URI)
+        self.STARTUP_LOCK_PATH = os.path.join(self.RUNTIME_DIR, self.STARTUP_LOCK_PATH)
+        self.CACHE_SQLITE_PATH = os.path.join(self.RUNTIME_DIR, self.CACHE_SQLITE_PATH)
+        return self
+
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        """Read settings file after every other source.
+
+        Returns:
+            tuple[PydanticBaseSettingsSource, ...]: sources by priority
+        """
+        return (
+            init_settings,
+            env_settings,
+            dotenv_settings,
+            file_secret_settings,
+            CustomConfigSource(
+                settings_cls, (init_settings, env_settings, dotenv_settings)
+            ),
+        )
+
+
+# set by `__getattr__` on first access, declared for type checkers.
+SETTINGS: Settings
+
+
+@lru_cache
+def get_settings(settings_file: str | None = None) -> Settings:
+    """Load settings once per file.
+
+    Args:
+        settings_file (str | None, optional): settings file, default is set \
+            by `SETTINGS_FILE` environment variable or `resolve_settings_file`.
+
+    Returns:
+        Settings: application settings
+    """
+    if settings_file is None:
+        return Settings()
+    return Settings(SETTINGS_FILE=settings_file)
+
 
-SETTINGS = Settings()
+def __getattr__(name: str) -> Any:
+    """Load `SETTINGS` on first access."""
+    if name == "SETTINGS":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,16 +1,459 @@
 """DataBase Session maker."""
-from collections.abc import Generator
-from typing import Any
+import itertools
+import threading
+import time
+from collections.abc import AsyncGenerator, Callable, Generator, Mapping, Sequence
+from functools import lru_cache
+from typing import Any, TypeVar
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import (
+    Connection,
+    Engine,
+    Result,
+    ScalarResult,
+    Select,
+    create_engine,
+    event,
+    make_url,
+)
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import (
+    Mapper,
+    Session,
+    SessionTransaction,
+    sessionmaker,
+)
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    NullPool,
+    Pool,
+    QueuePool,
+    SingletonThreadPool,
+    StaticPool,
+)
 
-from fastapi_user_management.config import SETTINGS
+from fastapi_user_management.config import get_settings
+from fastapi_user_management.tools.metrics import instrument_engine
+from fastapi_user_management.tools.profiler import profile_engine
 
-engine = create_engine(
-    SETTINGS.DATABASE_URI, pool_pre_ping=True, connect_args={"check_same_thread": False}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_T = TypeVar("_T")
+
+POOL_CLASSES: dict[str, type[Pool]] = {
+    "queue": QueuePool,
+    "null": NullPool,
+    "static": StaticPool,
+    "singleton": SingletonThreadPool,
+}
+
+
+def engine_options(uri: str, *, is_async: bool = False) -> dict[str, Any]:
+    """Build `create_engine` keyword arguments from pool settings.
+
+    Args:
+        uri (str): database URI, picks dialect defaults of `connect_args`
+        is_async (bool, optional): build for `create_async_engine`. \
+            Defaults to False.
+
+    Raises:
+        ValueError: raise if pool class is unknown.
+
+    Returns:
+        dict[str, Any]: engine keyword arguments
+    """
+    settings = get_settings()
+    if settings.DATABASE_POOL_CLASS not in POOL_CLASSES:
+        raise ValueError(f"Unknown pool class: {settings.DATABASE_POOL_CLASS}")
+    poolclass = POOL_CLASSES[settings.DATABASE_POOL_CLASS]
+    connect_args: dict[str, Any] = {}
+    if make_url(uri).get_backend_name() == "sqlite":
+        connect_args["check_same_thread"] = False
+    connect_args.update(settings.DATABASE_CONNECT_ARGS)
+
+    options: dict[str, Any] = {
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "connect_args": connect_args,
+    }
+    if poolclass is QueuePool:
+        options.update(
+            poolclass=AsyncAdaptedQueuePool if is_async else QueuePool,
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        )
+    else:
+        options["poolclass"] = poolclass
+    return options
+
+
+def set_sqlite_pragmas(engine: Engine, pragmas: Mapping[str, str | int]) -> None:
+    """Run PRAGMAs on every new connection of a SQLite engine.
+
+    Args:
+        engine (Engine): sync engine, `AsyncEngine.sync_engine` for async ones
+        pragmas (Mapping[str, str | int]): PRAGMA values by name
+    """
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+class ReplicaRouter:
+    """Pick engines for reads, round-robin over healthy replicas.
+
+    A replica failing to connect or losing its connection is skipped for
+    `retry_seconds`; reads go to the primary while no replica is healthy.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: Sequence[Engine] = (),
+        *,
+        retry_seconds: float = 30,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize router.
+
+        Args:
+            primary (Engine): engine of writes and read-your-writes sessions
+            replicas (Sequence[Engine], optional): read-only engines. Defaults to ().
+            retry_seconds (float, optional): time an unhealthy replica is skipped. \
+                Defaults to 30.
+            timer (Callable[[], float], optional): clock. Defaults to time.monotonic.
+        """
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.retry_seconds = retry_seconds
+        self.timer = timer
+        self._next = itertools.cycle(self.replicas)
+        self._unhealthy_until: dict[Engine, float] = {}
+        self._lock = threading.Lock()
+        for replica in self.replicas:
+            event.listen(replica, "handle_error", self._handle_error)
+
+    def _handle_error(self, context: ExceptionContext) -> None:
+        # no connection means connecting failed.
+        if context.is_disconnect or context.connection is None:
+            self.mark_unhealthy(context.engine)
+
+    def mark_unhealthy(self, replica: Engine) -> None:
+        """Skip replica for `retry_seconds`.
+
+        Args:
+            replica (Engine): replica engine
+        """
+        with self._lock:
+            self._unhealthy_until[replica] = self.timer() + self.retry_seconds
+
+    def read_engine(self) -> Engine:
+        """Next healthy replica, or primary if there isn't any.
+
+        Returns:
+            Engine: engine to read from
+        """
+        now = self.timer()
+        with self._lock:
+            for _ in range(len(self.replicas)):
+                replica = next(self._next)
+                if self._unhealthy_until.get(replica, 0) <= now:
+                    return replica
+        return self.primary
+
+
+class RoutingSession(Session):
+    """Session sending SELECTs to replicas and everything else to primary.
+
+    Once a session writes, it reads from primary until closed, so it sees
+    its own writes regardless of replication lag. A read failing on a
+    replica marks it unhealthy and is retried on primary, where the rest of
+    the transaction reads.
+
+    Replica connections join the session transaction as already begun
+    connections, so the session only rolls them back and a lost one can't
+    fail its commit. They're released when the transaction ends.
+    """
+
+    def __init__(self, *args: Any, router: ReplicaRouter | None = None, **kw: Any):
+        """Initialize session.
+
+        Args:
+            *args (Any): `Session` arguments
+            router (ReplicaRouter | None, optional): engine router, all \
+                statements go to `bind` if None. Defaults to None.
+            **kw (Any): `Session` keyword arguments
+        """
+        super().__init__(*args, **kw)
+        self.router = router
+        self.use_primary = False
+        self._read_primary = False
+        self._read_replica: Engine | None = None
+        self._replica_connections: dict[Engine, Connection] = {}
+
+    def get_bind(
+        self,
+        mapper: Mapper[Any] | None = None,
+        *,
+        clause: Any | None = None,
+        **kw: Any,
+    ) -> Engine | Connection:
+        """Pick engine of a statement, or the connection of a replica.
+
+        Args:
+            mapper (Mapper[Any] | None, optional): mapper of statement. \
+                Defaults to None.
+            clause (Any | None, optional): statement. Defaults to None.
+            **kw (Any): `Session.get_bind` keyword arguments
+
+        Returns:
+            Engine | Connection: engine or replica connection to execute on
+        """
+        if self.router is None or not self.router.replicas:
+            return super().get_bind(mapper, clause=clause, **kw)
+        if mapper is None and clause is None:
+            # asked for the session database, not about to run a statement.
+            return self.router.primary
+        if isinstance(clause, Select) and not (self.use_primary or self._read_primary):
+            self._read_replica = self.router.read_engine()
+            if self._read_replica is not self.router.primary:
+                return self._replica_connection(self._read_replica)
+            return self.router.primary
+        if not isinstance(clause, Select):
+            self.use_primary = True
+        return self.router.primary
+
+    def _replica_connection(self, replica: Engine) -> Connection:
+        connection = self._replica_connections.get(replica)
+        if connection is None:
+            connection = replica.connect()
+            connection.begin()
+            self._replica_connections[replica] = connection
+        return connection
+
+    def _retry_lost_replica(
+        self, method: Callable[..., _T], *args: Any, **kw: Any
+    ) -> _T:
+        # `get`, lazy and relationship loads all run through `execute`.
+        self._read_replica = None
+        try:
+            return method(*args, **kw)
+        except OperationalError:
+            replica = self._read_replica
+            if self.router is None or replica in (None, self.router.primary):
+                raise
+            self.router.mark_unhealthy(replica)
+            self._read_primary = True
+            return method(*args, **kw)
+
+    def execute(self, *args: Any, **kw: Any) -> Result[Any]:
+        """Execute statement, retrying a lost replica read on primary.
+
+        Args:
+            *args (Any): `Session.execute` arguments
+            **kw (Any): `Session.execute` keyword arguments
+
+        Returns:
+            Result[Any]: result
+        """
+        return self._retry_lost_replica(super().execute, *args, **kw)
+
+    def scalar(self, *args: Any, **kw: Any) -> Any:
+        """Execute statement and return a scalar, retrying a lost replica read.
+
+        Args:
+            *args (Any): `Session.scalar` arguments
+            **kw (Any): `Session.scalar` keyword arguments
+
+        Returns:
+            Any: scalar value
+        """
+        return self._retry_lost_replica(super().scalar, *args, **kw)
+
+    def scalars(self, *args: Any, **kw: Any) -> ScalarResult[Any]:
+        """Execute statement and return scalars, retrying a lost replica read.
+
+        Args:
+            *args (Any): `Session.scalars` arguments
+            **kw (Any): `Session.scalars` keyword arguments
+
+        Returns:
+            ScalarResult[Any]: scalar result
+        """
+        return self._retry_lost_replica(super().scalars, *args, **kw)
+
+    def release_replicas(self) -> None:
+        """Return replica connections to their pools and read from them again."""
+        self._read_primary = False
+        while self._replica_connections:
+            _, connection = self._replica_connections.popitem()
+            connection.close()
+
+    def close(self) -> None:
+        """Close session and read from replicas again."""
+        super().close()
+        self.release_replicas()
+        self.use_primary = False
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def _use_primary_on_flush(session: RoutingSession, *args: Any) -> None:
+    # flushing writes, the session must read them back from primary.
+    session.use_primary = True
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_replicas(session: RoutingSession, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.release_replicas()
+
+
+def build_engine(uri: str) -> Engine:
+    """Create engine with pool settings & SQLite PRAGMAs.
+
+    Args:
+        uri (str): database URI
+
+    Returns:
+        Engine: engine
+    """
+    new_engine = create_engine(uri, **engine_options(uri))
+    set_sqlite_pragmas(new_engine, get_settings().SQLITE_PRAGMAS)
+    return new_engine
+
+
+def build_async_engine(uri: str) -> AsyncEngine:
+    """Create async engine with pool settings & SQLite PRAGMAs.
+
+    Args:
+        uri (str): async database URI
+
+    Returns:
+        AsyncEngine: async engine
+    """
+    new_engine = create_async_engine(uri, **engine_options(uri, is_async=True))
+    set_sqlite_pragmas(new_engine.sync_engine, get_settings().SQLITE_PRAGMAS)
+    return new_engine
+
+
+def instrument_named_engine(name: str, named_engine: Engine) -> None:
+    """Attach metrics & profiler listeners enabled in settings to an engine.
+
+    Args:
+        name (str): engine label of metrics
+        named_engine (Engine): sync engine, `AsyncEngine.sync_engine` for async ones
+    """
+    settings = get_settings()
+    if settings.METRICS_ENABLED:
+        instrument_engine(named_engine, name)
+    if settings.PROFILER_ENABLED:
+        profile_engine(named_engine)
+
+
+@lru_cache
+def get_router() -> ReplicaRouter:
+    """Router of the primary engine & replicas, built on first use.
+
+    Returns:
+        ReplicaRouter: sync engines router
+    """
+    settings = get_settings()
+    router = ReplicaRouter(
+        build_engine(settings.DATABASE_URI),
+        [build_engine(uri) for uri in settings.DATABASE_REPLICA_URIS],
+        retry_seconds=settings.DATABASE_REPLICA_RETRY_SECONDS,
+    )
+    instrument_named_engine("primary", router.primary)
+    for index, replica in enumerate(router.replicas):
+        instrument_named_engine(f"replica_{index}", replica)
+    return router
+
+
+@lru_cache
+def get_async_router() -> ReplicaRouter:
+    """Router of the async primary engine & replicas, built on first use.
+
+    Returns:
+        ReplicaRouter: router over `AsyncEngine.sync_engine` of async engines
+    """
+    settings = get_settings()
+    router = ReplicaRouter(
+        get_async_engine().sync_engine,
+        [
+            build_async_engine(uri).sync_engine
+            for uri in settings.ASYNC_DATABASE_REPLICA_URIS
+        ],
+        retry_seconds=settings.DATABASE_REPLICA_RETRY_SECONDS,
+    )
+    instrument_named_engine("async_primary", router.primary)
+    for index, replica in enumerate(router.replicas):
+        instrument_named_engine(f"async_replica_{index}", replica)
+    return router
+
+
+def get_engine() -> Engine:
+    """Primary engine.
+
+    Returns:
+        Engine: primary engine
+    """
+    return get_router().primary
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    """Async primary engine, built on first use.
+
+    Returns:
+        AsyncEngine: async primary engine
+    """
+    return build_async_engine(get_settings().ASYNC_DATABASE_URI)
+
+
+@lru_cache
+def get_session_local() -> sessionmaker[RoutingSession]:
+    """Session factory, built on first use.
+
+    Returns:
+        sessionmaker[RoutingSession]: session factory
+    """
+    return sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=get_engine(),
+        class_=RoutingSession,
+        router=get_router(),
+    )
+
+
+@lru_cache
+def get_async_session_local() -> async_sessionmaker[AsyncSession]:
+    """Async session factory, built on first use.
+
+    Returns:
+        async_sessionmaker[AsyncSession]: async session factory
+    """
+    return async_sessionmaker(
+        bind=get_async_engine(),
+        autoflush=False,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        router=get_async_router(),
+    )
 
 
 # Dependency
@@ -21,7 +464,17 @@ def get_db() -> Generator[Any, Any, None]:
         Generator[Any, Any, None]: database session.
     """
     try:
-        db = SessionLocal()
+        db = get_session_local()()
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Function to inject async database session as dependency.
+
+    Yields:
+        AsyncGenerator[AsyncSession, None]: async database session.
+    """
+    async with get_async_session_local()() as db:
+        yield db
@@ -4,7 +4,7 @@ from typing import Any
 from sqlalchemy.orm import Session
 
 from fastapi_user_management import crud
-from fastapi_user_management.config import SETTINGS
+from fastapi_user_management.config import get_settings
 from fastapi_user_management.models.role import RoleNames
 from fastapi_user_management.models.user import UserModel, UserStatusValues
 from fastapi_user_management.schemas.role import RoleBase
@@ -17,12 +17,13 @@ def init_db(db: Session) -> None:
     Args:
         db (Session): database session.
     """
-    user: UserModel | Any = crud.user.get_by_username(db, username=SETTINGS.ADMIN_EMAIL)
+    settings = get_settings()
+    user: UserModel | Any = crud.user.get_by_username(db, username=settings.ADMIN_EMAIL)
     if not user:
         user_in = UserCreate(
-            username=SETTINGS.ADMIN_EMAIL,
-            fullname=SETTINGS.ADMIN_FULLNAME,
-            password=SETTINGS.ADMIN_PASSWORD,
+            username=settings.ADMIN_EMAIL,
+            fullname=settings.ADMIN_FULLNAME,
+            password=settings.ADMIN_PASSWORD,
             status=UserStatusValues.ACTIVE,
             roles=[RoleBase(name=RoleNames.ADMIN)],
         )
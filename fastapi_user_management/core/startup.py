@@ -0,0 +1,159 @@
+"""Application startup phases: schema check, cross-process lock and timings.
+
+Workers booting together take `startup_lock` before touching the schema or
+seeding, so only the first one creates tables & the admin user; the others
+find the schema at the alembic head and skip `create_all` reflection.
+"""
+import fcntl
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from enum import StrEnum, auto
+from pathlib import Path
+
+from sqlalchemy import Engine, inspect, text
+
+from fastapi_user_management.models.base import Base
+from fastapi_user_management.models.refresh_token import RefreshTokenModel  # noqa: F401
+from fastapi_user_management.models.revoked_token import RevokedTokenModel  # noqa: F401
+from fastapi_user_management.models.user import UserModel  # noqa: F401
+from fastapi_user_management.tools.metrics import STARTUP_PHASE_DURATION
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_SCRIPT_LOCATION = Path(__file__).resolve().parents[1] / "alembic"
+# any constant shared by workers, `pg_advisory_lock` takes a bigint.
+STARTUP_ADVISORY_LOCK_KEY = 0x5EED
+
+
+class SchemaState(StrEnum):
+    """Schema state found on startup.
+
+    Values:
+        CURRENT: at alembic head, nothing to do
+        CREATED: empty database, tables created & stamped at head
+        UNVERSIONED: tables without alembic version, missing tables created
+        BEHIND: older alembic revision, migrations must be run
+    """
+
+    CURRENT = auto()
+    CREATED = auto()
+    UNVERSIONED = auto()
+    BEHIND = auto()
+
+
+def prepare_schema(engine: Engine) -> SchemaState:
+    """Create tables unless the database is already at the alembic head.
+
+    The revision check reads one row of `alembic_version`, so booting on
+    an up to date schema skips reflecting every table.
+
+    Args:
+        engine (Engine): database engine
+
+    Returns:
+        SchemaState: state found
+    """
+    # alembic is only needed here, importing it with the app slows down spawn.
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    script = ScriptDirectory(str(ALEMBIC_SCRIPT_LOCATION))
+    head = script.get_current_head()
+    with engine.begin() as connection:
+        context = MigrationContext.configure(connection)
+        revision = context.get_current_revision()
+        if revision == head:
+            return SchemaState.CURRENT
+        if revision is not None:
+            # tables made by `create_all` would clash with pending migrations.
+            logger.warning(
+                "Database at revision %s, head is %s, run `alembic upgrade head`",
+                revision,
+                head,
+            )
+            return SchemaState.BEHIND
+        empty = not inspect(connection).get_table_names()
+        Base.metadata.create_all(connection)
+        if empty:
+            context.stamp(script, "head")
+            return SchemaState.CREATED
+    logger.warning(
+        "Database has no alembic version, check it matches head and run"
+        " `alembic stamp head` to skip schema creation on startup"
+    )
+    return SchemaState.UNVERSIONED
+
+
+@contextmanager
+def startup_lock(engine: Engine, path: str) -> Iterator[None]:
+    """Serialize startup across processes.
+
+    PostgreSQL databases are locked with an advisory lock, shared by every
+    host; others with an exclusive lock on a local file.
+
+    Args:
+        engine (Engine): database engine
+        path (str): lock file
+
+    Yields:
+        Iterator[None]: locked block
+    """
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as connection:
+            connection.execute(
+                text("SELECT pg_advisory_lock(:key)"),
+                {"key": STARTUP_ADVISORY_LOCK_KEY},
+            )
+            try:
+                yield
+            finally:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"),
+                    {"key": STARTUP_ADVISORY_LOCK_KEY},
+                )
+        return
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class StartupTimings:
+    """Wall time of startup phases."""
+
+    def __init__(self) -> None:
+        """No phase timed yet."""
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase.
+
+        Args:
+            name (str): phase name
+
+        Yields:
+            Iterator[None]: timed block
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    def report(self) -> None:
+        """Log phases and expose them as metrics."""
+        for name, seconds in self.phases.items():
+            STARTUP_PHASE_DURATION.labels(phase=name).set(seconds)
+        logger.info(
+            "Startup phases: %s",
+            ", ".join(
+                f"{name}={seconds * 1000:.1f}ms"
+                for name, seconds in self.phases.items()
+            ),
+        )
@@ -1,4 +1,6 @@
+from fastapi_user_management.crud.crud_refresh_token import refresh_token
+from fastapi_user_management.crud.crud_revoked_token import revoked_token
 from fastapi_user_management.crud.crud_role import role
 from fastapi_user_management.crud.crud_users import user
 
-__all__ = ["user", "role"]
+__all__ = ["user", "role", "refresh_token", "revoked_token"]
@@ -1,21 +1,55 @@
 """Base CRUD module for inheritance."""
-from typing import Any, Generic, TypeVar
+from collections.abc import AsyncIterator, Sequence
+from typing import Any, ClassVar, Generic, NamedTuple, TypeVar
 
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy.orm.interfaces import ORMOption
 
+from fastapi_user_management.config import get_settings
 from fastapi_user_management.models.base import Base
+from fastapi_user_management.tools.pagination import decode_cursor, encode_cursor
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+LoaderOptions = Sequence[ORMOption]
+
+
+def jsonable_encoder(obj: Any) -> Any:
+    """FastAPI `jsonable_encoder`, imported on first use by command line tools.
+
+    Args:
+        obj (Any): object to encode
+
+    Returns:
+        Any: JSON compatible value
+    """
+    from fastapi.encoders import jsonable_encoder as encoder
+
+    return encoder(obj)
+
+
+class KeysetPage(NamedTuple, Generic[ModelType]):
+    """Page of objects with cursor to the next one, None on last page."""
+
+    items: list[ModelType]
+    next_cursor: str | None
 
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Base CRUD moduel."""
 
+    # columns allowed to order keyset pages by, `id` breaks ties.
+    keyset_columns: ClassVar[tuple[str, ...]] = ("id",)
+    # loader options (selectinload, joinedload, ...) of reads without `options`.
+    default_options: ClassVar[tuple[ORMOption, ...]] = ()
+    # add `raiseload("*")` to every read, so accidental lazy loads fail,
+    # None follows `database.strict_loading`.
+    strict_loading: ClassVar[bool | None] = None
+
     def __init__(self, model: type[ModelType]):
         """CRUD object with default methods to Create, Read, Update, Delete (CRUD).
 
@@ -26,22 +60,66 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
 
-    def get(self, db: Session, id: Any) -> ModelType | Any:
+    def _select(self, options: LoaderOptions | None = None) -> Select[Any]:
+        """Select model with loader options.
+
+        Args:
+            options (LoaderOptions | None, optional): loader options, \
+                `default_options` if None.
+
+        Returns:
+            Select[Any]: select statement
+        """
+        loader_options = list(self.default_options if options is None else options)
+        strict_loading = self.strict_loading
+        if strict_loading is None:
+            strict_loading = get_settings().STRICT_LOADING
+        if strict_loading:
+            loader_options.append(raiseload("*"))
+        return select(self.model).options(*loader_options)
+
+    def get(
+        self, db: Session, id: Any, *, options: LoaderOptions | None = None
+    ) -> ModelType | Any:
         """Get object by id.
 
         Args:
             db (Session): database session
             id (Any): row id
+            options (LoaderOptions | None, optional): loader options. \
+                Defaults to `default_options`.
 
         Returns:
             ModelType | Any: _description_
         """
         return db.execute(
-            select(self.model).where(self.model.id == id)
+            self._select(options).where(self.model.id == id)
         ).scalar_one()  # pragma: no cover
 
+    async def get_async(
+        self, db: AsyncSession, id: Any, *, options: LoaderOptions | None = None
+    ) -> ModelType | Any:
+        """Get object by id with async session.
+
+        Args:
+            db (AsyncSession): async database session
+            id (Any): row id
+            options (LoaderOptions | None, optional): loader options. \
+                Defaults to `default_options`.
+
+        Returns:
+            ModelType | Any: selected object
+        """
+        result = await db.execute(self._select(options).where(self.model.id == id))
+        return result.scalar_one()
+
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 50
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 50,
+        options: LoaderOptions | None = None,
     ) -> list[ModelType] | Any:
         """Get list of object.
 
@@ -49,14 +127,167 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             db (Session): database session
             skip (int, optional): skip an id. Defaults to 0.
             limit (int, optional): loading limit. Defaults to 50.
+            options (LoaderOptions | None, optional): loader options. \
+                Defaults to `default_options`.
 
         Returns:
             list[ModelType] | Any: list of objects
         """
         return (
-            db.execute(select(self.model).offset(skip).limit(limit)).scalars().all()
+            db.execute(self._select(options).offset(skip).limit(limit)).scalars().all()
         )  # pragma: no cover
 
+    async def get_multi_async(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 50,
+        options: LoaderOptions | None = None,
+    ) -> list[ModelType] | Any:
+        """Get list of object with async session.
+
+        Args:
+            db (AsyncSession): async database session
+            skip (int, optional): skip an id. Defaults to 0.
+            limit (int, optional): loading limit. Defaults to 50.
+            options (LoaderOptions | None, optional): loader options. \
+                Defaults to `default_options`.
+
+        Returns:
+            list[ModelType] | Any: list of objects
+        """
+        result = await db.execute(self._select(options).offset(skip).limit(limit))
+        return result.scalars().all()
+
+    def _keyset_statement(
+        self,
+        cursor: str | None,
+        limit: int,
+        order_by: str,
+        options: LoaderOptions | None,
+    ) -> Select[Any]:
+        if order_by not in self.keyset_columns:
+            raise ValueError(f"Can't paginate by {order_by}")
+        columns = [getattr(self.model, order_by)]
+        if order_by != "id":
+            columns.append(self.model.id)
+        statement = self._select(options).order_by(*columns).limit(limit + 1)
+        if cursor is None:
+            return statement
+        values = decode_cursor(cursor, [column.type.python_type for column in columns])
+        condition = columns[-1] > values[-1]
+        for column, value in zip(columns[-2::-1], values[-2::-1], strict=True):
+            condition = or_(column > value, and_(column == value, condition))
+        return statement.where(condition)
+
+    def _keyset_page(
+        self, rows: list[ModelType], limit: int, order_by: str
+    ) -> KeysetPage[ModelType]:
+        if len(rows) <= limit:
+            return KeysetPage(items=rows, next_cursor=None)
+        last = rows[limit - 1]
+        values = [getattr(last, order_by)] + ([last.id] if order_by != "id" else [])
+        return KeysetPage(items=rows[:limit], next_cursor=encode_cursor(values))
+
+    def get_page(
+        self,
+        db: Session,
+        *,
+        cursor: str | None = None,
+        limit: int = 50,
+        order_by: str = "id",
+        options: LoaderOptions | None = None,
+    ) -> KeysetPage[ModelType]:
+        """Get page of objects with keyset pagination.
+
+        Unlike `get_multi`, cost doesn't grow with page depth since rows
+        are seeked from the cursor instead of skipped with OFFSET.
+
+        Args:
+            db (Session): database session
+            cursor (str | None, optional): `next_cursor` of previous page. \
+                Defaults to None.
+            limit (int, optional): page size. Defaults to 50.
+            order_by (str, optional): one of `keyset_columns`. Defaults to "id".
+            options (LoaderOptions | None, optional): loader options. \
+                Defaults to `default_options`.
+
+        Raises:
+            ValueError: raise if `order_by` isn't allowed.
+            InvalidCursorError: raise if cursor is malformed.
+
+        Returns:
+            KeysetPage[ModelType]: objects & next cursor
+        """
+        statement = self._keyset_statement(cursor, limit, order_by, options)
+        rows = list(db.execute(statement).scalars().all())
+        return self._keyset_page(rows, limit, order_by)
+
+    async def get_page_async(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: str | None = None,
+        limit: int = 50,
+        order_by: str = "id",
+        options: LoaderOptions | None = None,
+    ) -> KeysetPage[ModelType]:
+        """Get page of objects with keyset pagination and async session.
+
+        Args:
+            db (AsyncSession): async database session
+            cursor (str | None, optional): `next_cursor` of previous page. \
+                Defaults to None.
+            limit (int, optional): page size. Defaults to 50.
+            order_by (str, optional): one of `keyset_columns`. Defaults to "id".
+            options (LoaderOptions | None, optional): loader options. \
+                Defaults to `default_options`.
+
+        Raises:
+            ValueError: raise if `order_by` isn't allowed.
+            InvalidCursorError: raise if cursor is malformed.
+
+        Returns:
+            KeysetPage[ModelType]: objects & next cursor
+        """
+        statement = self._keyset_statement(cursor, limit, order_by, options)
+        result = await db.execute(statement)
+        return self._keyset_page(list(result.scalars().all()), limit, order_by)
+
+    async def iter_partitions_async(
+        self,
+        db: AsyncSession,
+        *,
+        batch_size: int = 1000,
+        options: LoaderOptions | None = None,
+    ) -> AsyncIterator[list[ModelType]]:
+        """Stream every object in id order, one partition at a time.
+
+        Rows are fetched with `yield_per` from a server-side cursor and each
+        partition is expunged from the session once the caller moves on, so
+        memory stays flat regardless of table size.
+
+        Args:
+            db (AsyncSession): async database session
+            batch_size (int, optional): rows per partition. Defaults to 1000.
+            options (LoaderOptions | None, optional): loader options, must \
+                support `yield_per` (no joined collections). \
+                Defaults to `default_options`.
+
+        Yields:
+            AsyncIterator[list[ModelType]]: partitions of objects
+        """
+        result = await db.stream_scalars(
+            self._select(options)
+            .order_by(self.model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield list(partition)
+            for obj in partition:
+                db.expunge(obj)
+
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """Create new object.
 
@@ -74,6 +305,25 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.refresh(db_obj)  # pragma: no cover
         return db_obj  # pragma: no cover
 
+    async def create_async(
+        self, db: AsyncSession, *, obj_in: CreateSchemaType
+    ) -> ModelType:
+        """Create new object with async session.
+
+        Args:
+            db (AsyncSession): async database session
+            obj_in (CreateSchemaType): new object based on schema
+
+        Returns:
+            ModelType: created object
+        """
+        obj_in_data = jsonable_encoder(obj_in)  # pragma: no cover
+        db_obj = self.model(**obj_in_data)  # pragma: no cover
+        db.add(db_obj)  # pragma: no cover
+        await db.commit()  # pragma: no cover
+        await db.refresh(db_obj)  # pragma: no cover
+        return db_obj  # pragma: no cover
+
     def update(
         self,
         db: Session,
@@ -104,6 +354,36 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.refresh(db_obj)
         return db_obj
 
+    async def update_async(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: UpdateSchemaType | dict[str, Any],
+    ) -> ModelType:
+        """Update existing record with async session.
+
+        Args:
+            db (AsyncSession): async database session
+            db_obj (ModelType): existing record
+            obj_in (UpdateSchemaType | dict[str, Any]): updated information
+
+        Returns:
+            ModelType: updated record
+        """
+        obj_data = jsonable_encoder(db_obj)
+        if isinstance(obj_in, dict):  # pragma: no cover
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)  # pragma: no cover
+        for field in obj_data:
+            if field in update_data:
+                setattr(db_obj, field, update_data[field])
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
     def remove(self, db: Session, *, id: int) -> ModelType:
         """Remove existing object.
 
@@ -115,8 +395,24 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             ModelType: deleted object
         """
         obj: ModelType = db.execute(
-            select(self.model).where(self.model.id == id)
+            self._select().where(self.model.id == id)
         ).scalar_one()
         db.delete(obj)  # type: ignore  # `[no-untyped-call]`
         db.commit()
         return obj
+
+    async def remove_async(self, db: AsyncSession, *, id: int) -> ModelType:
+        """Remove existing object with async session.
+
+        Args:
+            db (AsyncSession): async database session
+            id (int): object id
+
+        Returns:
+            ModelType: deleted object
+        """
+        result = await db.execute(self._select().where(self.model.id == id))
+        obj: ModelType = result.scalar_one()
+        await db.delete(obj)
+        await db.commit()
+        return obj
@@ -0,0 +1,156 @@
+"""CRUD module for RefreshTokenModel table."""
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from fastapi_user_management.config import get_settings
+from fastapi_user_management.crud.crud_revoked_token import PURGE_BATCH_SIZE
+from fastapi_user_management.models.refresh_token import RefreshTokenModel
+from fastapi_user_management.models.user import UserModel
+
+REFRESH_TOKEN_BYTES = 32
+FAMILY_ID_BYTES = 16
+
+
+def _digest(token: str) -> bytes:
+    # tokens are random, so a fast hash resists guessing as well as bcrypt.
+    return hashlib.sha256(token.encode()).digest()
+
+
+class CRUDRefreshToken:
+    """CRUD for opaque refresh tokens rotated on every use."""
+
+    def __init__(self, model: type[RefreshTokenModel]):
+        """CRUD object for refresh tokens.
+
+        Args:
+            model (type[RefreshTokenModel]): refresh token model
+        """
+        self.model = model
+
+    async def issue_async(
+        self,
+        db: AsyncSession,
+        *,
+        user: UserModel,
+        family_id: bytes | None = None,
+    ) -> str:
+        """Issue refresh token for user.
+
+        Args:
+            db (AsyncSession): async database session
+            user (UserModel): token owner
+            family_id (bytes | None, optional): family of rotated token, \
+                a new family if None.
+
+        Returns:
+            str: refresh token, only its digest is stored
+        """
+        token = secrets.token_urlsafe(REFRESH_TOKEN_BYTES)
+        db.add(
+            self.model(
+                token_hash=_digest(token),
+                family_id=family_id or secrets.token_bytes(FAMILY_ID_BYTES),
+                user_id=user.id,
+                security_version=user.security_version,
+                expires_at=datetime.utcnow()
+                + timedelta(days=get_settings().REFRESH_TOKEN_EXPIRE_DAYS),
+            )
+        )
+        await db.commit()
+        return token
+
+    async def rotate_async(
+        self, db: AsyncSession, *, token: str
+    ) -> tuple[UserModel, str] | None:
+        """Exchange refresh token for a new one of the same family.
+
+        A token presented twice means it leaked, so its whole family is
+        revoked and the legitimate holder has to log in again.
+
+        Args:
+            db (AsyncSession): async database session
+            token (str): refresh token
+
+        Returns:
+            tuple[UserModel, str] | None: owner & new refresh token or None \
+                if token is unknown, expired, reused or the owner's \
+                security version changed.
+        """
+        row = (
+            await db.execute(
+                select(self.model, UserModel)
+                .join(UserModel, UserModel.id == self.model.user_id)
+                .where(
+                    self.model.token_hash == _digest(token),
+                    self.model.expires_at > datetime.utcnow(),
+                )
+                .options(selectinload(UserModel.roles))
+            )
+        ).one_or_none()
+        if row is None:
+            return None
+        refresh_token, user = row
+        if refresh_token.security_version != user.security_version:
+            return None
+        # conditional update, so only one of concurrent rotations wins.
+        result = await db.execute(
+            update(self.model)
+            .where(self.model.id == refresh_token.id, self.model.used.is_(False))
+            .values(used=True)
+        )
+        if result.rowcount != 1:
+            await self.revoke_family_async(db, family_id=refresh_token.family_id)
+            return None
+        new_token = await self.issue_async(
+            db, user=user, family_id=refresh_token.family_id
+        )
+        return user, new_token
+
+    async def revoke_family_async(self, db: AsyncSession, *, family_id: bytes) -> None:
+        """Revoke every token rotated from one login.
+
+        Args:
+            db (AsyncSession): async database session
+            family_id (bytes): token family
+        """
+        await db.execute(delete(self.model).where(self.model.family_id == family_id))
+        await db.commit()
+
+    async def purge_expired_async(
+        self, db: AsyncSession, *, batch_size: int = PURGE_BATCH_SIZE
+    ) -> int:
+        """Delete expired tokens in batches, used ones are kept until then.
+
+        Used tokens stay for reuse detection; short transactions keep the
+        table writable for logins & refreshes meanwhile.
+
+        Args:
+            db (AsyncSession): async database session
+            batch_size (int, optional): rows per delete. Defaults to PURGE_BATCH_SIZE.
+
+        Returns:
+            int: deleted tokens
+        """
+        deleted = 0
+        while True:
+            expired_ids = (
+                select(self.model.id)
+                .where(self.model.expires_at <= datetime.utcnow())
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            result = await db.execute(
+                delete(self.model).where(self.model.id.in_(expired_ids))
+            )
+            await db.commit()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted
+
+
+refresh_token = CRUDRefreshToken(RefreshTokenModel)
@@ -0,0 +1,98 @@
+"""CRUD module for RevokedTokenModel table."""
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_user_management.models.revoked_token import RevokedTokenModel
+
+PURGE_BATCH_SIZE = 1000
+
+
+class CRUDRevokedToken:
+    """CRUD for revoked access token ids."""
+
+    def __init__(self, model: type[RevokedTokenModel]):
+        """CRUD object for revoked tokens.
+
+        Args:
+            model (type[RevokedTokenModel]): revoked token model
+        """
+        self.model = model
+
+    async def revoke_async(
+        self, db: AsyncSession, *, jti: str, expires_at: datetime
+    ) -> RevokedTokenModel:
+        """Revoke access token until it expires, idempotent across workers.
+
+        Args:
+            db (AsyncSession): async database session
+            jti (str): token id
+            expires_at (datetime): token expiration, UTC
+
+        Returns:
+            RevokedTokenModel: revoked token, the existing one if already revoked
+        """
+        revoked_token = self.model(jti=jti, expires_at=expires_at)
+        db.add(revoked_token)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # another request or worker revoked the same token first
+            await db.rollback()
+            return (
+                await db.execute(select(self.model).where(self.model.jti == jti))
+            ).scalar_one()
+        return revoked_token
+
+    async def get_since_async(
+        self, db: AsyncSession, *, after_id: int
+    ) -> Sequence[RevokedTokenModel]:
+        """Get tokens revoked after a high-water mark, in revocation order.
+
+        Args:
+            db (AsyncSession): async database session
+            after_id (int): largest id already seen
+
+        Returns:
+            Sequence[RevokedTokenModel]: revoked tokens
+        """
+        result = await db.execute(
+            select(self.model).where(self.model.id > after_id).order_by(self.model.id)
+        )
+        return result.scalars().all()
+
+    async def purge_expired_async(
+        self, db: AsyncSession, *, batch_size: int = PURGE_BATCH_SIZE
+    ) -> int:
+        """Delete expired tokens in batches, committing each one.
+
+        Short transactions keep the table writable for revocations meanwhile.
+
+        Args:
+            db (AsyncSession): async database session
+            batch_size (int, optional): rows per delete. Defaults to PURGE_BATCH_SIZE.
+
+        Returns:
+            int: deleted tokens
+        """
+        deleted = 0
+        while True:
+            expired_ids = (
+                select(self.model.id)
+                .where(self.model.expires_at <= datetime.utcnow())
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            result = await db.execute(
+                delete(self.model).where(self.model.id.in_(expired_ids))
+            )
+            await db.commit()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted
+
+
+revoked_token = CRUDRevokedToken(RevokedTokenModel)
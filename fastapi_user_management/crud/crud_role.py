@@ -1,17 +1,176 @@
 """CRUD module for RoleModel table."""
+import threading
 from typing import Any
+from weakref import WeakKeyDictionary
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import Engine, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from fastapi_user_management.crud.crud_base import CRUDBase
-from fastapi_user_management.models.role import RoleModel
+from fastapi_user_management.models.role import RoleModel, RoleNames
 from fastapi_user_management.schemas.role import RoleBase, RoleCreate
 
 
+class RoleRegistry:
+    """In-memory map of role names to ids, kept per database engine."""
+
+    def __init__(self) -> None:
+        """Empty registry, filled by `load` or as roles are seen."""
+        self._roles: WeakKeyDictionary[Engine, dict[RoleNames, int]] = (
+            WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _bucket(self, db: Session) -> dict[RoleNames, int]:
+        engine: Engine = db.get_bind()  # type: ignore[assignment]
+        with self._lock:
+            return self._roles.setdefault(engine, {})
+
+    def load(self, db: Session) -> None:
+        """Load every role of the session database.
+
+        Args:
+            db (Session): database session
+        """
+        rows = db.execute(select(RoleModel.id, RoleModel.name)).all()
+        self._bucket(db).update({name: id for id, name in rows})
+
+    async def load_async(self, db: AsyncSession) -> None:
+        """Load every role of the session database with async session.
+
+        Args:
+            db (AsyncSession): async database session
+        """
+        result = await db.execute(select(RoleModel.id, RoleModel.name))
+        self._bucket(db.sync_session).update({name: id for id, name in result})
+
+    def register(self, db: Session, role: RoleModel) -> None:
+        """Remember a persisted role.
+
+        Args:
+            db (Session): database session the role belongs to
+            role (RoleModel): persisted role
+        """
+        self._bucket(db)[role.name] = role.id
+
+    def get_id(self, db: Session, name: RoleNames | None) -> int | None:
+        """Get role id by name without querying the database.
+
+        Args:
+            db (Session): database session
+            name (RoleNames | None): role name
+
+        Returns:
+            int | None: role id or None if not registered
+        """
+        return self._bucket(db).get(name) if name is not None else None
+
+    def forget(self, db: Session, name: RoleNames) -> None:
+        """Forget a deleted role.
+
+        Args:
+            db (Session): database session the role belonged to
+            name (RoleNames): role name
+        """
+        self._bucket(db).pop(name, None)
+
+    def clear(self) -> None:
+        """Forget every registered role."""
+        with self._lock:
+            self._roles.clear()
+
+
 class CRUDRole(CRUDBase[RoleModel, RoleBase, RoleCreate]):
     """CRUD for roles."""
 
+    def __init__(self, model: type[RoleModel]):
+        """CRUD object for roles with an in-memory `registry` of role ids.
+
+        **Parameters**
+
+        * `model`: A SQLAlchemy model class
+        """
+        super().__init__(model)
+        self.registry = RoleRegistry()
+
+    def _detached(self, role_id: int, name: RoleNames) -> RoleModel:
+        role = self.model(id=role_id, name=name)
+        make_transient_to_detached(role)
+        return role
+
+    def get_registered(self, db: Session, *, role_obj: RoleBase) -> RoleModel | None:
+        """Get role attached to session, using registry before the database.
+
+        Args:
+            db (Session): database session
+            role_obj (RoleBase): role object from schema
+
+        Returns:
+            RoleModel | None: role or None if it doesn't exist
+        """
+        role_id = self.registry.get_id(db, role_obj.name)
+        if role_id is not None and role_obj.name is not None:
+            return db.merge(self._detached(role_id, role_obj.name), load=False)
+        role: RoleModel | None = self.get_by_name(db, role_obj=role_obj)
+        if role is not None:
+            self.registry.register(db, role)
+        return role
+
+    async def get_registered_async(
+        self, db: AsyncSession, *, role_obj: RoleBase
+    ) -> RoleModel | None:
+        """Get role attached to async session, using registry before the database.
+
+        Args:
+            db (AsyncSession): async database session
+            role_obj (RoleBase): role object from schema
+
+        Returns:
+            RoleModel | None: role or None if it doesn't exist
+        """
+        role_id = self.registry.get_id(db.sync_session, role_obj.name)
+        if role_id is not None and role_obj.name is not None:
+            return await db.merge(self._detached(role_id, role_obj.name), load=False)
+        role: RoleModel | None = await self.get_by_name_async(db, role_obj=role_obj)
+        if role is not None:
+            self.registry.register(db.sync_session, role)
+        return role
+
+    def get_registered_id(self, db: Session, *, name: RoleNames) -> int | None:
+        """Get role id by name, using registry before the database.
+
+        Args:
+            db (Session): database session
+            name (RoleNames): role name
+
+        Returns:
+            int | None: role id or None if it doesn't exist
+        """
+        role_id = self.registry.get_id(db, name)
+        if role_id is not None:
+            return role_id
+        role = self.get_registered(db, role_obj=RoleBase(name=name))
+        return role.id if role is not None else None
+
+    async def get_registered_id_async(
+        self, db: AsyncSession, *, name: RoleNames
+    ) -> int | None:
+        """Get role id by name with async session, using registry first.
+
+        Args:
+            db (AsyncSession): async database session
+            name (RoleNames): role name
+
+        Returns:
+            int | None: role id or None if it doesn't exist
+        """
+        role_id = self.registry.get_id(db.sync_session, name)
+        if role_id is not None:
+            return role_id
+        role = await self.get_registered_async(db, role_obj=RoleBase(name=name))
+        return role.id if role is not None else None
+
     def get_by_name(self, db: Session, *, role_obj: RoleBase) -> RoleModel | Any:
         """Get role by name.
 
@@ -26,6 +185,23 @@ class CRUDRole(CRUDBase[RoleModel, RoleBase, RoleCreate]):
             select(self.model).where(self.model.name == role_obj.name)
         ).scalar_one_or_none()
 
+    async def get_by_name_async(
+        self, db: AsyncSession, *, role_obj: RoleBase
+    ) -> RoleModel | Any:
+        """Get role by name with async session.
+
+        Args:
+            db (AsyncSession): async database session
+            role_obj (RoleBase): role object from schema
+
+        Returns:
+            RoleModel | Any: loaded object
+        """
+        result = await db.execute(
+            select(self.model).where(self.model.name == role_obj.name)
+        )
+        return result.scalar_one_or_none()
+
     def create(self, db: Session, *, obj_in: RoleBase) -> RoleModel:
         """Creat new role in database.
 
@@ -41,6 +217,53 @@ class CRUDRole(CRUDBase[RoleModel, RoleBase, RoleCreate]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self.registry.register(db, db_obj)
+        return db_obj
+
+    async def create_async(self, db: AsyncSession, *, obj_in: RoleBase) -> RoleModel:
+        """Creat new role in database with async session.
+
+        Args:
+            db (AsyncSession): async database session
+            obj_in (RoleBase): role object from schema
+
+        Returns:
+            RoleModel: created role
+        """
+        db_obj: RoleModel = self.model(name=obj_in.name)
+
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        self.registry.register(db.sync_session, db_obj)
+        return db_obj
+
+    def remove(self, db: Session, *, id: int) -> RoleModel:
+        """Remove existing role and drop it from the registry.
+
+        Args:
+            db (Session): database session
+            id (int): role id
+
+        Returns:
+            RoleModel: deleted role
+        """
+        db_obj = super().remove(db, id=id)
+        self.registry.forget(db, db_obj.name)
+        return db_obj
+
+    async def remove_async(self, db: AsyncSession, *, id: int) -> RoleModel:
+        """Remove existing role with async session and drop it from the registry.
+
+        Args:
+            db (AsyncSession): async database session
+            id (int): role id
+
+        Returns:
+            RoleModel: deleted role
+        """
+        db_obj = await super().remove_async(db, id=id)
+        self.registry.forget(db.sync_session, db_obj.name)
         return db_obj
 
 
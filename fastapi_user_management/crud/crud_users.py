@@ -1,40 +1,153 @@
 """CRUD module for UserModel table."""
 import secrets
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor
 from datetime import datetime
+from itertools import islice
 from typing import Any
 
 from pydantic import EmailStr
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
 from fastapi_user_management import crud
-from fastapi_user_management.crud.crud_base import CRUDBase
-from fastapi_user_management.errors.exceptions import PasswordMatchError
+from fastapi_user_management.crud.crud_base import CRUDBase, LoaderOptions
+from fastapi_user_management.errors.exceptions import (
+    PasswordMatchError,
+    UserImportError,
+)
 from fastapi_user_management.models.role import RoleModel, RoleNames
 from fastapi_user_management.models.user import UserModel, UserStatusValues
-from fastapi_user_management.schemas.user import BaseUserCreate, UserCreate, UserUpdate
-from fastapi_user_management.tools.encryption import get_password_hash, verify_password
+from fastapi_user_management.models.user_role import UserRoleModel
+from fastapi_user_management.schemas.role import RoleBase
+from fastapi_user_management.schemas.user import (
+    BaseUserCreate,
+    UserCreate,
+    UserImport,
+    UserPrincipal,
+    UserUpdate,
+)
+from fastapi_user_management.tools.cache import (
+    get_principal_cache,
+    get_security_version_cache,
+)
+from fastapi_user_management.tools.encryption import (
+    get_password_hash,
+    get_pwd_context,
+    verify_and_update_password,
+)
+from fastapi_user_management.tools.hashing import get_hashing_service
 
 PASSWORD_LENGTH = 8
+IMPORT_BATCH_SIZE = 1000
+
+
+def _batched(iterable: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
 
 
 class CRUDUser(CRUDBase[UserModel, BaseUserCreate | UserCreate, UserUpdate]):
     """CRUD for user database model."""
 
-    def get_by_username(self, db: Session, *, username: EmailStr) -> UserModel | Any:
+    keyset_columns = ("id", "created_at")
+    # roles are read by listings, exports and `is_admin`, load them up front
+    # with one extra query per statement instead of one per user.
+    default_options = (selectinload(UserModel.roles),)
+
+    def get_by_username(
+        self,
+        db: Session,
+        *,
+        username: EmailStr,
+        options: LoaderOptions | None = None,
+    ) -> UserModel | Any:
         """Get user by username.
 
         Args:
             db (Session): database session
             username (EmailStr): username
+            options (LoaderOptions | None, optional): loader options. \
+                Defaults to `default_options`.
 
         Returns:
             UserModel | Any: selected user
         """
         return db.execute(
-            select(self.model).where(self.model.username == username)
+            self._select(options).where(self.model.username == username)
         ).scalar_one_or_none()
 
+    async def get_by_username_async(
+        self,
+        db: AsyncSession,
+        *,
+        username: EmailStr,
+        options: LoaderOptions | None = None,
+    ) -> UserModel | Any:
+        """Get user by username with async session.
+
+        Args:
+            db (AsyncSession): async database session
+            username (EmailStr): username
+            options (LoaderOptions | None, optional): loader options. \
+                Defaults to `default_options`.
+
+        Returns:
+            UserModel | Any: selected user
+        """
+        result = await db.execute(
+            self._select(options).where(self.model.username == username)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_principal_async(
+        self, db: AsyncSession, *, username: EmailStr
+    ) -> UserPrincipal | None:
+        """Get read-only user view, served from `principal_cache` when possible.
+
+        Args:
+            db (AsyncSession): async database session
+            username (EmailStr): username
+
+        Returns:
+            UserPrincipal | None: user view or None
+        """
+        principal: UserPrincipal | None = await get_principal_cache().get_async(
+            username
+        )
+        if principal is not None:
+            return principal
+        user = await self.get_by_username_async(db, username=username)
+        if user is None:
+            return None
+        principal = await self.build_principal_async(user)
+        await get_principal_cache().set_async(username, principal)
+        return principal
+
+    async def build_principal_async(self, user: UserModel) -> UserPrincipal:
+        """Build read-only user view and record its security version.
+
+        Args:
+            user (UserModel): user loaded with async session
+
+        Returns:
+            UserPrincipal: user view
+        """
+        await get_security_version_cache().set_async(
+            str(user.id), user.security_version
+        )
+        return UserPrincipal(
+            id=user.id,
+            fullname=user.fullname,
+            username=user.username,
+            status=user.status,
+            roles=tuple(role.name for role in await user.awaitable_attrs.roles),
+            security_version=user.security_version,
+        )
+
     def create(self, db: Session, *, obj_in: BaseUserCreate) -> UserModel:
         """Create new user.
 
@@ -47,12 +160,11 @@ class CRUDUser(CRUDBase[UserModel, BaseUserCreate | UserCreate, UserUpdate]):
         """
         roles: list[RoleModel] = []
         for role_obj in obj_in.roles:
-            role = (
-                crud.role.get_by_name(db=db, role_obj=role_obj)
-                if crud.role.get_by_name(db=db, role_obj=role_obj) is not None
-                else crud.role.create(db=db, obj_in=role_obj)
-            )
-            roles.append(role)
+            role = crud.role.get_registered(db=db, role_obj=role_obj)
+            if role is None:
+                role = crud.role.create(db=db, obj_in=role_obj)
+            if role not in roles:
+                roles.append(role)
 
         db_obj: UserModel = self.model(
             username=obj_in.username,
@@ -73,6 +185,196 @@ class CRUDUser(CRUDBase[UserModel, BaseUserCreate | UserCreate, UserUpdate]):
         db.refresh(db_obj)
         return db_obj
 
+    async def create_async(
+        self, db: AsyncSession, *, obj_in: BaseUserCreate
+    ) -> UserModel:
+        """Create new user with async session.
+
+        Args:
+            db (AsyncSession): async database session
+            obj_in (BaseUserCreate): user data based on schema
+
+        Raises:
+            HashingQueueFullError: raise if too many hashes are in flight
+
+        Returns:
+            UserModel: created user
+        """
+        hashed_password = await get_hashing_service().hash(
+            obj_in.password
+            if obj_in.password is not None
+            else secrets.token_urlsafe(PASSWORD_LENGTH)
+        )
+        roles: list[RoleModel] = []
+        for role_obj in obj_in.roles:
+            role = await crud.role.get_registered_async(db=db, role_obj=role_obj)
+            if role is None:
+                role = await crud.role.create_async(db=db, obj_in=role_obj)
+            if role not in roles:
+                roles.append(role)
+
+        db_obj: UserModel = self.model(
+            username=obj_in.username,
+            fullname=obj_in.fullname,
+            password=hashed_password,
+            created_at=datetime.utcnow(),
+            status=(
+                obj_in.status if obj_in.status is not None else UserStatusValues.PENDING
+            ),
+            roles=roles,
+        )
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj, attribute_names=["id", "roles"])
+        return db_obj
+
+    def create_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Iterable[BaseUserCreate | UserImport],
+        batch_size: int = IMPORT_BATCH_SIZE,
+        executor: Executor | None = None,
+    ) -> int:
+        """Create users in batches, one transaction per batch.
+
+        Roles are resolved once, passwords are hashed with `executor` and
+        `UserImport.password_hash` values from legacy systems are stored as is.
+
+        Args:
+            db (Session): database session
+            objs_in (Iterable[BaseUserCreate | UserImport]): users, may be a stream
+            batch_size (int, optional): users per transaction. \
+                Defaults to IMPORT_BATCH_SIZE.
+            executor (Executor | None, optional): pool to hash passwords in \
+                parallel, hash serially if None. Defaults to None.
+
+        Raises:
+            UserImportError: raise if a user is invalid or exists, or a given \
+                password hash isn't recognized, with the number of users \
+                created by the batches committed before. The original \
+                `ValueError` or `IntegrityError` is chained as `__cause__`.
+
+        Returns:
+            int: number of created users
+        """
+        role_ids: dict[RoleNames, int] = {}
+        created = 0
+        try:
+            for batch in _batched(objs_in, batch_size):
+                for name in {role.name for obj_in in batch for role in obj_in.roles}:
+                    if name is not None and name not in role_ids:
+                        role_obj = RoleBase(name=name)
+                        role = crud.role.get_registered(
+                            db=db, role_obj=role_obj
+                        ) or crud.role.create(db=db, obj_in=role_obj)
+                        role_ids[name] = role.id
+                created += self._insert_batch(db, batch, role_ids, executor)
+        except IntegrityError as e:
+            raise UserImportError(created, "User already exists") from e
+        except ValueError as e:
+            raise UserImportError(created, str(e)) from e
+        return created
+
+    def _insert_batch(
+        self,
+        db: Session,
+        batch: list[BaseUserCreate | UserImport],
+        role_ids: dict[RoleNames, int],
+        executor: Executor | None,
+    ) -> int:
+        hashes: list[str | None] = []
+        plain_passwords: list[str] = []
+        for obj_in in batch:
+            password_hash = getattr(obj_in, "password_hash", None)
+            if (
+                password_hash is not None
+                and get_pwd_context().identify(password_hash) is None
+            ):
+                raise ValueError(f"Unknown password hash for {obj_in.username}")
+            hashes.append(password_hash)
+            if password_hash is None:
+                plain_passwords.append(
+                    obj_in.password
+                    if obj_in.password is not None
+                    else secrets.token_urlsafe(PASSWORD_LENGTH)
+                )
+        hashed_passwords = iter(
+            executor.map(
+                get_password_hash,
+                plain_passwords,
+                chunksize=max(1, len(plain_passwords) // 64),
+            )
+            if executor is not None
+            else map(get_password_hash, plain_passwords)
+        )
+
+        created_at = datetime.utcnow()
+        rows = [
+            {
+                "username": obj_in.username,
+                "fullname": obj_in.fullname,
+                "password": (
+                    password_hash
+                    if password_hash is not None
+                    else next(hashed_passwords)
+                ),
+                "created_at": created_at,
+                "status": (
+                    obj_in.status
+                    if obj_in.status is not None
+                    else UserStatusValues.PENDING
+                ),
+            }
+            for obj_in, password_hash in zip(batch, hashes, strict=True)
+        ]
+        try:
+            user_ids = dict(
+                db.execute(
+                    insert(self.model).returning(self.model.username, self.model.id),
+                    rows,
+                ).all()
+            )
+            user_roles = [
+                {"user_id": user_ids[obj_in.username], "role_id": role_ids[name]}
+                for obj_in in batch
+                for name in {role.name for role in obj_in.roles}
+                if name is not None
+            ]
+            if user_roles:
+                db.execute(insert(UserRoleModel), user_roles)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return len(rows)
+
+    def _invalidate_updated(self, previous_username: str, user: UserModel) -> None:
+        """Drop cached views of updated user, under its old name if renamed.
+
+        Args:
+            previous_username (str): username before update
+            user (UserModel): updated user
+        """
+        get_principal_cache().delete(user.username)
+        get_security_version_cache().delete(str(user.id))
+        if previous_username != user.username:
+            get_principal_cache().delete(previous_username)
+
+    async def _invalidate_updated_async(
+        self, previous_username: str, user: UserModel
+    ) -> None:
+        """Drop cached views of updated user off the event loop.
+
+        Args:
+            previous_username (str): username before update
+            user (UserModel): updated user
+        """
+        await get_principal_cache().delete_async(user.username)
+        await get_security_version_cache().delete_async(str(user.id))
+        if previous_username != user.username:
+            await get_principal_cache().delete_async(previous_username)
+
     def update(
         self,
         db: Session,
@@ -101,15 +403,61 @@ class CRUDUser(CRUDBase[UserModel, BaseUserCreate | UserCreate, UserUpdate]):
             hashed_password = get_password_hash(update_data["new_password"])
             del update_data["new_password"]
             update_data["password"] = hashed_password
+            update_data["security_version"] = db_obj.security_version + 1
+        else:
+            raise PasswordMatchError
+        previous_username = db_obj.username
+        updated_user = super().update(db, db_obj=db_obj, obj_in=update_data)
+        self._invalidate_updated(previous_username, updated_user)
+        return updated_user
+
+    async def update_async(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: UserModel,
+        obj_in: UserUpdate | dict[str, Any],
+    ) -> UserModel:
+        """Update user info with async session.
+
+        Args:
+            db (AsyncSession): async database session
+            db_obj (UserModel): selected user
+            obj_in (UserUpdate | dict[str, Any]): updating data
+
+        Raises:
+            PasswordMatchError: raise if password and its confirmation doesn't match
+            HashingQueueFullError: raise if too many hashes are in flight
+
+        Returns:
+            UserModel: selected user
+        """
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        if update_data["new_password"] == update_data["new_password_confirm"]:
+            hashed_password = await get_hashing_service().hash(
+                update_data["new_password"]
+            )
+            del update_data["new_password"]
+            update_data["password"] = hashed_password
+            update_data["security_version"] = db_obj.security_version + 1
         else:
             raise PasswordMatchError
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        previous_username = db_obj.username
+        updated_user = await super().update_async(db, db_obj=db_obj, obj_in=update_data)
+        await self._invalidate_updated_async(previous_username, updated_user)
+        return updated_user
 
     def authenticate(
         self, db: Session, *, username: EmailStr, password: str
     ) -> UserModel | None:
         """Check user credentials for authentication.
 
+        Outdated password hashes are replaced with one of configured scheme
+        and parameters.
+
         Args:
             db (Session): database session
             username (EmailStr): user cred
@@ -121,10 +469,78 @@ class CRUDUser(CRUDBase[UserModel, BaseUserCreate | UserCreate, UserUpdate]):
         user = self.get_by_username(db, username=username)
         if not user:
             return None
-        if not verify_password(password, user.password):
+        valid, new_hash = verify_and_update_password(password, user.password)
+        if not valid:
+            return None
+        if new_hash is not None:
+            # same password, so tokens and cached views stay valid.
+            user.password = new_hash
+            db.commit()
+        return user
+
+    async def authenticate_async(
+        self, db: AsyncSession, *, username: EmailStr, password: str
+    ) -> UserModel | None:
+        """Check user credentials for authentication with async session.
+
+        Outdated password hashes are replaced with one of configured scheme
+        and parameters.
+
+        Args:
+            db (AsyncSession): async database session
+            username (EmailStr): user cred
+            password (str): user cred
+
+        Raises:
+            HashingQueueFullError: raise if too many hashes are in flight
+
+        Returns:
+            UserModel | None: logged in user or None
+        """
+        user = await self.get_by_username_async(db, username=username)
+        if not user:
+            return None
+        valid, new_hash = await get_hashing_service().verify_and_update(
+            password, user.password
+        )
+        if not valid:
             return None
+        if new_hash is not None:
+            # same password, so tokens and cached views stay valid.
+            user.password = new_hash
+            await db.commit()
         return user
 
+    def remove(self, db: Session, *, id: int) -> UserModel:
+        """Remove user by id and drop its cached view.
+
+        Args:
+            db (Session): database session
+            id (int): user id
+
+        Returns:
+            UserModel: deleted user
+        """
+        removed_user = super().remove(db, id=id)
+        get_principal_cache().delete(removed_user.username)
+        get_security_version_cache().delete(str(removed_user.id))
+        return removed_user
+
+    async def remove_async(self, db: AsyncSession, *, id: int) -> UserModel:
+        """Remove user by id with async session and drop its cached view.
+
+        Args:
+            db (AsyncSession): async database session
+            id (int): user id
+
+        Returns:
+            UserModel: deleted user
+        """
+        removed_user = await super().remove_async(db, id=id)
+        await get_principal_cache().delete_async(removed_user.username)
+        await get_security_version_cache().delete_async(str(removed_user.id))
+        return removed_user
+
     def remove_by_username(self, db: Session, *, username: EmailStr) -> UserModel:
         """Delete user by username.
 
@@ -136,7 +552,22 @@ class CRUDUser(CRUDBase[UserModel, BaseUserCreate | UserCreate, UserUpdate]):
             UserModel: deleted user
         """
         selected_user = self.get_by_username(db=db, username=username)
-        return super().remove(db, id=selected_user.id)
+        return self.remove(db, id=selected_user.id)
+
+    async def remove_by_username_async(
+        self, db: AsyncSession, *, username: EmailStr
+    ) -> UserModel:
+        """Delete user by username with async session.
+
+        Args:
+            db (AsyncSession): async database session
+            username (EmailStr): username
+
+        Returns:
+            UserModel: deleted user
+        """
+        selected_user = await self.get_by_username_async(db=db, username=username)
+        return await self.remove_async(db, id=selected_user.id)
 
     def is_active(self, user: UserModel) -> bool:
         """Check user status.
@@ -159,10 +590,21 @@ class CRUDUser(CRUDBase[UserModel, BaseUserCreate | UserCreate, UserUpdate]):
         Returns:
             bool: True if user is admin.
         """
-        admin_role = db.execute(
-            select(RoleModel).where(RoleModel.name == RoleNames.ADMIN)
-        ).scalar_one_or_none()
-        return admin_role in db_obj.roles
+        admin_id = crud.role.get_registered_id(db, name=RoleNames.ADMIN)
+        return any(role.id == admin_id for role in db_obj.roles)
+
+    async def is_admin_async(self, db: AsyncSession, db_obj: UserModel) -> bool:
+        """Check for admin role in user with async session.
+
+        Args:
+            db (AsyncSession): async database session
+            db_obj (UserModel): selected user
+
+        Returns:
+            bool: True if user is admin.
+        """
+        admin_id = await crud.role.get_registered_id_async(db, name=RoleNames.ADMIN)
+        return any(role.id == admin_id for role in await db_obj.awaitable_attrs.roles)
 
 
 user = CRUDUser(UserModel)
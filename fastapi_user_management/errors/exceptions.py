@@ -16,3 +16,94 @@ class PasswordMatchError(Exception):
         """
         self.message = message
         super().__init__(message)
+
+
+class HashingQueueFullError(Exception):
+    """HashingQueueFullError Custom error.
+
+    Custom error that occur when too many password hashes are already in flight.
+    """
+
+    def __init__(self, message: str = "Too many password hashing requests!") -> None:
+        """Initiate custom error.
+
+        Args:
+            message (str): error message to display, \
+                default is set to 'Too many password hashing requests!'.
+        """
+        self.message = message
+        super().__init__(message)
+
+
+class InvalidCursorError(ValueError):
+    """InvalidCursorError Custom error.
+
+    Custom error that occur when a pagination cursor can't be decoded.
+    """
+
+    def __init__(self, message: str = "Invalid pagination cursor!") -> None:
+        """Initiate custom error.
+
+        Args:
+            message (str): error message to display, \
+                default is set to 'Invalid pagination cursor!'.
+        """
+        self.message = message
+        super().__init__(message)
+
+
+class InvalidTokenError(ValueError):
+    """InvalidTokenError Custom error.
+
+    Custom error that occur when an access token signature or expiration is invalid.
+    """
+
+    def __init__(self, message: str = "Invalid access token!") -> None:
+        """Initiate custom error.
+
+        Args:
+            message (str): error message to display, \
+                default is set to 'Invalid access token!'.
+        """
+        self.message = message
+        super().__init__(message)
+
+
+class LoginThrottledError(Exception):
+    """LoginThrottledError Custom error.
+
+    Custom error that occur when a username or client IP makes too many login attempts.
+    """
+
+    def __init__(
+        self, retry_after: float, message: str = "Too many login attempts!"
+    ) -> None:
+        """Initiate custom error.
+
+        Args:
+            retry_after (float): seconds until next attempt is allowed.
+            message (str): error message to display, \
+                default is set to 'Too many login attempts!'.
+        """
+        self.retry_after = retry_after
+        self.message = message
+        super().__init__(message)
+
+
+class UserImportError(Exception):
+    """UserImportError Custom error.
+
+    Custom error that occur when a bulk import stops after committing some batches.
+    """
+
+    def __init__(self, created: int, message: str = "User import failed!") -> None:
+        """Initiate custom error.
+
+        Args:
+            created (int): users created by batches committed before the error.
+            message (str): error message to display, \
+                default is set to 'User import failed!'.
+        """
+        self.created = created
+        self.message = message
+        super().__init__(message)
@@ -1,8 +1,13 @@
 """Define Declarative Base for tables."""
+from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase
 
 
-class Base(DeclarativeBase):
-    """Base model for inheritance."""
+class Base(AsyncAttrs, DeclarativeBase):
+    """Base model for inheritance.
+
+    `AsyncAttrs` exposes `awaitable_attrs` to load lazy relationships
+    from an `AsyncSession`.
+    """
 
     pass
@@ -0,0 +1,34 @@
+"""Refresh Token Table for rotating long-lived sessions."""
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+
+from fastapi_user_management.models.base import Base
+
+
+class RefreshTokenModel(Base):
+    """RefreshToken Table storing digests of issued refresh tokens.
+
+    Tokens rotated from one login share a `family_id`, so a reused token
+    revokes its whole family.
+    """
+
+    __tablename__ = "refresh_token"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # SHA-256 of the token, raw tokens are never stored.
+    token_hash: Mapped[bytes] = mapped_column(
+        LargeBinary(32), nullable=False, unique=True
+    )
+    family_id: Mapped[bytes] = mapped_column(
+        LargeBinary(16), nullable=False, index=True
+    )
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("user_account.id", ondelete="CASCADE"), index=True
+    )
+    # user security version at issue time, bumped versions revoke the token.
+    security_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+    used: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
@@ -0,0 +1,24 @@
+"""Revoked Token Table listing access tokens rejected before expiry."""
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from fastapi_user_management.models.base import Base
+
+
+class RevokedTokenModel(Base):
+    """RevokedToken Table keyed by access token `jti`.
+
+    Workers poll rows with `id` above the last one seen, less an overlap
+    for rows committed out of id order, so ids must only grow.
+    """
+
+    __tablename__ = "revoked_token"
+    # without AUTOINCREMENT SQLite reuses ids of purged rows.
+    __table_args__ = {"sqlite_autoincrement": True}
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    jti: Mapped[str] = mapped_column(String(32), nullable=False, unique=True)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
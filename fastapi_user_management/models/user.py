@@ -39,15 +39,23 @@ class UserModel(Base):
     """
 
     __tablename__ = "user_account"
+    # ids identify users in stateless tokens, SQLite must not reuse them.
+    __table_args__ = {"sqlite_autoincrement": True}
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     fullname: Mapped[str] = mapped_column(String, nullable=False, unique=False)
     username: Mapped[str] = mapped_column(String, nullable=False, unique=True)
     password: Mapped[str] = mapped_column(String, nullable=False, unique=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, unique=False
+        DateTime(timezone=True), nullable=False, unique=False, index=True
     )
     status: Mapped[UserStatusValues] = mapped_column(
-        Enum(UserStatusValues), nullable=False, default=UserStatusValues.PENDING
+        Enum(UserStatusValues),
+        nullable=False,
+        default=UserStatusValues.PENDING,
+        index=True,
+    )
+    security_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
     )
     roles: Mapped[list["RoleModel"]] = relationship(
         "RoleModel", secondary="user_role", backref=backref("users", lazy="dynamic")
@@ -1,21 +1,39 @@
 """Token provider endpoint for JWT."""
-from datetime import timedelta
-from typing import Annotated, Any
+from datetime import datetime, timedelta
+from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from pydantic import EmailStr
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from fastapi_user_management import crud
-from fastapi_user_management.config import SETTINGS
-from fastapi_user_management.core.database import get_db
+from fastapi_user_management.config import get_settings
+from fastapi_user_management.core.database import get_async_db
+from fastapi_user_management.errors.exceptions import (
+    InvalidTokenError,
+    LoginThrottledError,
+)
+from fastapi_user_management.models.role import RoleNames
 from fastapi_user_management.models.user import UserModel, UserStatusValues
-from fastapi_user_management.schemas.auth import Token, TokenData
-from fastapi_user_management.schemas.user import UserBase
-from fastapi_user_management.tools.token import create_access_token
+from fastapi_user_management.schemas.auth import (
+    RefreshRequest,
+    Token,
+    TokenClaims,
+    TokenData,
+)
+from fastapi_user_management.schemas.user import UserPrincipal
+from fastapi_user_management.tools.cache import get_security_version_cache
+from fastapi_user_management.tools.revocation import get_revocation_list
+from fastapi_user_management.tools.throttle import (
+    get_ip_throttle,
+    get_username_throttle,
+)
+from fastapi_user_management.tools.token import (
+    create_access_token,
+    create_user_claims,
+    verify_access_token_async,
+)
 
 router = APIRouter(
     prefix="/auth",
@@ -25,25 +43,24 @@ router = APIRouter(
     },
 )
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 
 async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_db)
-) -> UserModel | Any:
-    """Get current user information from token and database.
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: AsyncSession = Depends(get_async_db),
+) -> UserPrincipal:
+    """Get current user information from token and cached user view.
 
     Args:
         token (Annotated[str, Depends): access token
-        db (Session, optional): db session. Defaults to Depends(get_db).
+        db (AsyncSession, optional): db session. Defaults to Depends(get_async_db).
 
     Raises:
         CREDENTIALS_EXCEPTION: HTTPException with 401 status code.
 
     Returns:
-        UserModel | Any: Current user or Any.
+        UserPrincipal: Current user read-only view.
     """
     CREDENTIALS_EXCEPTION = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -51,16 +68,12 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(
-            token, SETTINGS.SECRET_KEY, algorithms=[SETTINGS.ALGORITHM]
-        )
-        username: EmailStr = payload.get("sub")
-        if username is None:
-            raise CREDENTIALS_EXCEPTION
-        token_data = TokenData(username=username)
-    except JWTError as e:
+        token_data = await verify_access_token_async(token, TokenData)
+    except (InvalidTokenError, ValidationError) as e:
         raise CREDENTIALS_EXCEPTION from e
-    user: UserModel | Any = crud.user.get_by_username(
+    if token_data.username is None or get_revocation_list().is_revoked(token_data.jti):
+        raise CREDENTIALS_EXCEPTION
+    user: UserPrincipal | None = await crud.user.get_principal_async(
         db=db, username=token_data.username
     )
     if user is None:
@@ -68,19 +81,85 @@ async def get_current_user(
     return user
 
 
+async def get_current_user_from_claims(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: AsyncSession = Depends(get_async_db),
+) -> UserPrincipal:
+    """Get current user from claims of a stateless access token.
+
+    Claims are trusted while their security version matches the one this
+    process last read for the user id. An unknown version (first request,
+    evicted, or dropped by a password or status change in any worker) is
+    checked against the database and cached for the next requests.
+
+    Args:
+        token (Annotated[str, Depends): access token issued with `stateless_auth`
+        db (AsyncSession, optional): db session. Defaults to Depends(get_async_db).
+
+    Raises:
+        CREDENTIALS_EXCEPTION: HTTPException with 401 status code.
+
+    Returns:
+        UserPrincipal: Current user read-only view.
+    """
+    CREDENTIALS_EXCEPTION = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        claims = await verify_access_token_async(token, TokenClaims)
+    except (InvalidTokenError, ValidationError) as e:
+        raise CREDENTIALS_EXCEPTION from e
+    if get_revocation_list().is_revoked(claims.jti):
+        raise CREDENTIALS_EXCEPTION
+    if await get_security_version_cache().get_async(str(claims.uid)) == claims.ver:
+        return UserPrincipal(
+            id=claims.uid,
+            fullname=claims.name,
+            username=claims.sub,
+            status=claims.status,
+            roles=tuple(claims.roles),
+            security_version=claims.ver,
+        )
+    user = await crud.user.get_by_username_async(db=db, username=claims.sub)
+    # a removed & recreated username gets another id.
+    if user is None or user.id != claims.uid or user.security_version != claims.ver:
+        raise CREDENTIALS_EXCEPTION
+    return await crud.user.build_principal_async(user)
+
+
+async def get_authenticated_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: AsyncSession = Depends(get_async_db),
+) -> UserPrincipal:
+    """Get current user from token claims in stateless mode, else from user view.
+
+    Args:
+        token (Annotated[str, Depends): access token
+        db (AsyncSession, optional): db session. Defaults to Depends(get_async_db).
+
+    Returns:
+        UserPrincipal: Current user read-only view.
+    """
+    if get_settings().STATELESS_AUTH:
+        return await get_current_user_from_claims(token=token, db=db)
+    return await get_current_user(token=token, db=db)
+
+
 async def get_current_active_user(
-    current_user: Annotated[UserBase, Depends(get_current_user)]
-) -> UserBase:
+    current_user: Annotated[UserPrincipal, Depends(get_authenticated_user)]
+) -> UserPrincipal:
     """Check if user is active or not.
 
     Args:
-        current_user (Annotated[UserBase, Depends): current user.
+        current_user (Annotated[UserPrincipal, Depends): current user.
 
     Raises:
         HTTPException: return 400 and not active user.
 
     Returns:
-        UserBase: current user
+        UserPrincipal: current user
     """
     if current_user.status is not UserStatusValues.ACTIVE:
         raise HTTPException(
@@ -89,34 +168,180 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_current_admin_user(
+    current_user: Annotated[UserPrincipal, Depends(get_current_active_user)]
+) -> UserPrincipal:
+    """Check if user has admin role.
+
+    Args:
+        current_user (Annotated[UserPrincipal, Depends): current active user.
+
+    Raises:
+        HTTPException: return 403 if user is not admin.
+
+    Returns:
+        UserPrincipal: current user
+    """
+    if RoleNames.ADMIN not in current_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+        )
+    return current_user
+
+
+async def create_user_access_token(user: UserModel) -> str:
+    """Create access token of user, with full claims in stateless mode.
+
+    Args:
+        user (UserModel): authenticated user
+
+    Returns:
+        str: access token
+    """
+    settings = get_settings()
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    claims = (
+        create_user_claims(await crud.user.build_principal_async(user))
+        if settings.STATELESS_AUTH
+        else {"sub": user.username}
+    )
+    return create_access_token(data=claims, expires_delta=access_token_expires)
+
+
+async def issue_tokens(db: AsyncSession, user: UserModel) -> dict[str, str]:
+    """Issue access token and a refresh token of a new family.
+
+    Args:
+        db (AsyncSession): db session
+        user (UserModel): authenticated user
+
+    Returns:
+        dict[str, str]: access & refresh token values and type.
+    """
+    return {
+        "access_token": await create_user_access_token(user),
+        "refresh_token": await crud.refresh_token.issue_async(db, user=user),
+        "token_type": "bearer",
+    }
+
+
+def check_login_throttle(username: str, client_ip: str) -> None:
+    """Take a login attempt of username & client IP.
+
+    Args:
+        username (str): normalized username
+        client_ip (str): client address
+
+    Raises:
+        LoginThrottledError: raise if either one is over its limits.
+    """
+    retry_after = get_ip_throttle().acquire(
+        client_ip
+    ) or get_username_throttle().acquire(username)
+    if retry_after:
+        raise LoginThrottledError(retry_after)
+
+
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
+    request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> dict[str, str]:
     """Endpoint to generate access token for write credentials.
 
+    Throttled attempts are rejected before any database or hashing work.
+
     Args:
+        request (Request): incoming request
         form_data (Annotated[OAuth2PasswordRequestForm, Depends): credentials
-        db (Session, optional): db session. Defaults to Depends(get_db).
+        db (AsyncSession, optional): db session. Defaults to Depends(get_async_db).
 
     Raises:
         HTTPException: raise exception if credentials is incorrect.
+        LoginThrottledError: raise if username or client IP is throttled.
 
     Returns:
-        dict[str, str]: access token value & type.s
+        dict[str, str]: access & refresh token values and type.
     """
-    user: UserModel | None = crud.user.authenticate(
+    # case variants of one username share limits.
+    username = form_data.username.lower()
+    client_ip = request.client.host if request.client else "unknown"
+    throttle_enabled = get_settings().LOGIN_THROTTLE_ENABLED
+    if throttle_enabled:
+        check_login_throttle(username, client_ip)
+    user: UserModel | None = await crud.user.authenticate_async(
         db=db, username=form_data.username, password=form_data.password
     )
+    if throttle_enabled:
+        for throttle, key in (
+            (get_ip_throttle(), client_ip),
+            (get_username_throttle(), username),
+        ):
+            if user:
+                throttle.record_success(key)
+            else:
+                throttle.record_failure(key)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token_expires = timedelta(minutes=SETTINGS.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+    return await issue_tokens(db, user)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(
+    body: RefreshRequest,
+    db: AsyncSession = Depends(get_async_db),
+) -> dict[str, str]:
+    """Endpoint to exchange refresh token for new access & refresh tokens.
+
+    No password is verified, the refresh token is looked up by digest and
+    rotated; reusing a rotated token revokes every token of its login.
+
+    Args:
+        body (RefreshRequest): refresh token
+        db (AsyncSession, optional): db session. Defaults to Depends(get_async_db).
+
+    Raises:
+        HTTPException: raise exception if refresh token is invalid.
+
+    Returns:
+        dict[str, str]: access & refresh token values and type.
+    """
+    rotated = await crud.refresh_token.rotate_async(db, token=body.refresh_token)
+    if rotated is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user, refresh_token = rotated
+    return {
+        "access_token": await create_user_access_token(user),
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+    }
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    current_user: Annotated[UserPrincipal, Depends(get_authenticated_user)],
+    db: AsyncSession = Depends(get_async_db),
+) -> None:
+    """Endpoint to revoke the presented access token before it expires.
+
+    Args:
+        token (Annotated[str, Depends): access token
+        current_user (Annotated[UserPrincipal, Depends): current user.
+        db (AsyncSession, optional): db session. Defaults to Depends(get_async_db).
+    """
+    token_data = await verify_access_token_async(token, TokenData)
+    if token_data.jti is None or token_data.exp is None:
+        return
+    await get_revocation_list().revoke_async(
+        db, jti=token_data.jti, expires_at=datetime.utcfromtimestamp(token_data.exp)
     )
-    return {"access_token": access_token, "token_type": "bearer"}
@@ -0,0 +1,50 @@
+"""Prometheus metrics endpoint."""
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+
+from fastapi_user_management.config import get_settings
+
+router = APIRouter(tags=["metrics"])
+metrics_bearer = HTTPBearer(auto_error=False)
+
+
+def verify_metrics_token(
+    credentials: HTTPAuthorizationCredentials | None = Depends(metrics_bearer),
+) -> None:
+    """Check scraper sent the metrics token.
+
+    Args:
+        credentials (HTTPAuthorizationCredentials | None, optional): bearer \
+            credentials. Defaults to Depends(metrics_bearer).
+
+    Raises:
+        HTTPException: return 401 if token is missing, wrong or not configured.
+    """
+    token = get_settings().METRICS_TOKEN
+    if (
+        not token
+        or credentials is None
+        or not secrets.compare_digest(credentials.credentials.encode(), token.encode())
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get(
+    "/metrics",
+    include_in_schema=False,
+    dependencies=[Depends(verify_metrics_token)],
+)
+def read_metrics() -> Response:
+    """Metrics of this process in Prometheus text format.
+
+    Returns:
+        Response: exposition of default registry
+    """
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
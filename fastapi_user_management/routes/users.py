@@ -0,0 +1,188 @@
+"""User management endpoints."""
+import io
+from collections.abc import AsyncIterator
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from fastapi_user_management import crud
+from fastapi_user_management.core.database import (
+    get_async_db,
+    get_async_session_local,
+    get_db,
+)
+from fastapi_user_management.crud.crud_users import IMPORT_BATCH_SIZE
+from fastapi_user_management.errors.exceptions import (
+    InvalidCursorError,
+    UserImportError,
+)
+from fastapi_user_management.routes.auth import (
+    get_current_active_user,
+    get_current_admin_user,
+)
+from fastapi_user_management.schemas.pagination import Page
+from fastapi_user_management.schemas.user import UserPrincipal, UserRead
+from fastapi_user_management.tools.hashing import get_import_hashing_service
+from fastapi_user_management.tools.user_export import (
+    EXPORT_MEDIA_TYPES,
+    export_header,
+    serialize_users,
+)
+from fastapi_user_management.tools.user_import import read_users
+
+EXPORT_BATCH_SIZE = 1000
+MAX_IMPORT_BATCH_SIZE = 10000
+
+router = APIRouter(
+    prefix="/users",
+    tags=["users"],
+    responses={
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal Server Error"},
+    },
+)
+
+
+@router.get(
+    "/me",
+    response_model=UserPrincipal,
+    response_model_exclude={"security_version"},
+)
+async def read_current_user(
+    current_user: Annotated[UserPrincipal, Depends(get_current_active_user)]
+) -> UserPrincipal:
+    """Current active user.
+
+    Args:
+        current_user (Annotated[UserPrincipal, Depends): current active user.
+
+    Returns:
+        UserPrincipal: current user
+    """
+    return current_user
+
+
+@router.get("", response_model=Page[UserRead])
+async def list_users(
+    admin: Annotated[UserPrincipal, Depends(get_current_admin_user)],
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+    order_by: Literal["id", "created_at"] = "id",
+    db: AsyncSession = Depends(get_async_db),
+) -> Page[UserRead]:
+    """List users page by page with keyset pagination.
+
+    Args:
+        admin (Annotated[UserPrincipal, Depends): current admin user.
+        cursor (str | None, optional): `next_cursor` of previous page. \
+            Defaults to None.
+        limit (int, optional): page size. Defaults to 50.
+        order_by (Literal["id", "created_at"], optional): sort column. \
+            Defaults to "id".
+        db (AsyncSession, optional): db session. Defaults to Depends(get_async_db).
+
+    Raises:
+        HTTPException: return 400 for invalid cursor.
+
+    Returns:
+        Page[UserRead]: users & next cursor
+    """
+    try:
+        page = await crud.user.get_page_async(
+            db, cursor=cursor, limit=limit, order_by=order_by
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=e.message
+        ) from e
+    return Page[UserRead](
+        items=[UserRead.model_validate(user) for user in page.items],
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_users(
+    admin: Annotated[UserPrincipal, Depends(get_current_admin_user)],
+    file_format: Literal["ndjson", "csv"] = "ndjson",
+) -> StreamingResponse:
+    """Stream every user as NDJSON or CSV with flat memory usage.
+
+    Args:
+        admin (Annotated[UserPrincipal, Depends): current admin user.
+        file_format (Literal["ndjson", "csv"], optional): output format. \
+            Defaults to "ndjson".
+
+    Returns:
+        StreamingResponse: users file
+    """
+
+    async def content() -> AsyncIterator[str]:
+        # own session, so it lives as long as the response body
+        async with get_async_session_local()() as db:
+            yield export_header(file_format)
+            async for users in crud.user.iter_partitions_async(
+                db, batch_size=EXPORT_BATCH_SIZE
+            ):
+                yield serialize_users(
+                    (UserRead.model_validate(user) for user in users), file_format
+                )
+
+    return StreamingResponse(
+        content(),
+        media_type=EXPORT_MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="users.{file_format}"'},
+    )
+
+
+@router.post("/import", status_code=status.HTTP_201_CREATED)
+def import_users(
+    file: UploadFile,
+    admin: Annotated[UserPrincipal, Depends(get_current_admin_user)],
+    file_format: Literal["csv", "jsonl"] = "csv",
+    batch_size: Annotated[
+        int, Query(ge=1, le=MAX_IMPORT_BATCH_SIZE)
+    ] = IMPORT_BATCH_SIZE,
+    db: Session = Depends(get_db),
+) -> dict[str, int]:
+    """Bulk import users from an uploaded CSV or JSON Lines file.
+
+    Args:
+        file (UploadFile): users file, see `tools.user_import.read_users`
+        admin (Annotated[UserPrincipal, Depends): current admin user.
+        file_format (Literal["csv", "jsonl"], optional): input format. \
+            Defaults to "csv".
+        batch_size (int, optional): users per transaction, at most \
+            MAX_IMPORT_BATCH_SIZE. Defaults to IMPORT_BATCH_SIZE.
+        db (Session, optional): db session. Defaults to Depends(get_db).
+
+    Raises:
+        HTTPException: return 422 for invalid file or 409 for existing users, \
+            with the number of users created by batches committed before.
+
+    Returns:
+        dict[str, int]: number of created users
+    """
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    try:
+        created = crud.user.create_many(
+            db,
+            objs_in=read_users(stream, file_format),
+            batch_size=batch_size,
+            executor=get_import_hashing_service().executor,
+        )
+    except UserImportError as e:
+        raise HTTPException(
+            status_code=(
+                status.HTTP_409_CONFLICT
+                if isinstance(e.__cause__, IntegrityError)
+                else status.HTTP_422_UNPROCESSABLE_ENTITY
+            ),
+            detail={"message": e.message, "created": e.created},
+        ) from e
+    finally:
+        stream.detach()
+    return {"created": created}
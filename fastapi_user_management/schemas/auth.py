@@ -1,5 +1,8 @@
 """Define schame for auth."""
-from pydantic import BaseModel, EmailStr
+from pydantic import AliasChoices, BaseModel, EmailStr, Field
+
+from fastapi_user_management.models.role import RoleNames
+from fastapi_user_management.models.user import UserStatusValues
 
 
 class Token(BaseModel):
@@ -7,14 +10,38 @@ class Token(BaseModel):
 
     Args:
         access_token
+        refresh_token
         token_type
     """
 
     access_token: str
+    refresh_token: str
     token_type: str
 
 
+class RefreshRequest(BaseModel):
+    """Refresh token request schema for token refresh endpoint."""
+
+    refresh_token: str
+
+
 class TokenData(BaseModel):
-    """Token data schema."""
+    """Token data schema, `username` is read from the `sub` claim."""
+
+    username: EmailStr | None = Field(
+        default=None, validation_alias=AliasChoices("username", "sub")
+    )
+    jti: str | None = None
+    exp: int | None = None
+
+
+class TokenClaims(BaseModel):
+    """Authorization claims carried by access tokens in stateless mode."""
 
-    username: EmailStr | None = None
+    sub: EmailStr
+    uid: int
+    name: str
+    status: UserStatusValues
+    roles: list[RoleNames]
+    ver: int
+    jti: str | None = None
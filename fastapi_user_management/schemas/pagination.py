@@ -0,0 +1,13 @@
+"""Module to define pagination schemas."""
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+ItemType = TypeVar("ItemType")
+
+
+class Page(BaseModel, Generic[ItemType]):
+    """Keyset page, pass `next_cursor` back to get the following page."""
+
+    items: list[ItemType]
+    next_cursor: str | None = None
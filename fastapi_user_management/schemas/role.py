@@ -1,5 +1,5 @@
 """Module to define Role schemas."""
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from fastapi_user_management.models.role import RoleNames
 
@@ -7,6 +7,8 @@ from fastapi_user_management.models.role import RoleNames
 class RoleBase(BaseModel):
     """Base Schema for role."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     name: RoleNames | None = None
 
 
@@ -1,6 +1,9 @@
 """Module to define User schemas."""
-from pydantic import BaseModel, EmailStr
+from datetime import datetime
 
+from pydantic import BaseModel, ConfigDict, EmailStr
+
+from fastapi_user_management.models.role import RoleNames
 from fastapi_user_management.models.user import UserStatusValues
 from fastapi_user_management.schemas.role import RoleBase
 
@@ -14,6 +17,19 @@ class UserBase(BaseModel):
     roles: list[RoleBase] | None = None
 
 
+class UserRead(BaseModel):
+    """Schema to list users."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    fullname: str
+    username: EmailStr
+    status: UserStatusValues
+    created_at: datetime
+    roles: list[RoleBase] = []
+
+
 class UserLogin(BaseModel):
     """Schema use for login request."""
 
@@ -39,8 +55,27 @@ class UserCreate(BaseUserCreate):
     roles: list[RoleBase]
 
 
+class UserImport(BaseUserCreate):
+    """Schema for bulk imported users, optionally with an existing hash."""
+
+    password_hash: str | None = None
+
+
 class UserUpdate(UserBase):
     """Schema to update user password."""
 
     new_password: str
     new_password_confirm: str
+
+
+class UserPrincipal(BaseModel):
+    """Read-only view of an authenticated user, detached from any session."""
+
+    model_config = ConfigDict(frozen=True)
+
+    id: int
+    fullname: str
+    username: EmailStr
+    status: UserStatusValues
+    roles: tuple[RoleNames, ...] = ()
+    security_version: int = 0
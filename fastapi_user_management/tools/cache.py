@@ -0,0 +1,279 @@
+"""Namespaced caches of the auth layer on a configurable backend.
+
+`cache.backend` picks where entries live: `memory` (per worker), `sqlite`
+(file shared by local workers) or `redis`. With the memory backend,
+`cache.broadcast` can share deletes & clears between workers.
+
+Coroutines use the `*_async` methods, which run blocking backend I/O in
+the thread pool instead of the event loop. The backend and namespaces of
+the auth layer are built from settings on first use by their `get_*`
+accessors.
+"""
+import logging
+from functools import lru_cache
+from typing import Any
+
+from starlette.concurrency import run_in_threadpool
+
+from fastapi_user_management.config import get_settings
+from fastapi_user_management.tools.cache_backends import (
+    CacheBackend,
+    InvalidationBroadcaster,
+    MemoryBackend,
+    RedisBackend,
+    RedisBroadcaster,
+    SQLiteBackend,
+    SQLiteBroadcaster,
+    TTLCache,
+)
+from fastapi_user_management.tools.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+CACHE_BACKENDS = ("memory", "sqlite", "redis")
+CACHE_BROADCASTS = ("none", "sqlite", "redis")
+
+__all__ = ["Cache", "TTLCache", "build_cache_backend", "cache_stats"]
+
+
+class Cache:
+    """Namespace of a cache backend with its own size, TTL and statistics."""
+
+    registry: dict[str, "Cache"] = {}
+
+    def __init__(
+        self,
+        namespace: str,
+        backend: CacheBackend,
+        *,
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+    ) -> None:
+        """Cache namespace.
+
+        Args:
+            namespace (str): key prefix & statistics label, unique per process
+            backend (CacheBackend): storage
+            maxsize (int, optional): max number of entries. Defaults to 1024.
+            ttl (float, optional): default time-to-live in seconds. Defaults to 60.0.
+        """
+        self.namespace = namespace
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # label lookups resolved once, lookups only increment.
+        self._hit_counter = CACHE_REQUESTS.labels(namespace=namespace, result="hit")
+        self._miss_counter = CACHE_REQUESTS.labels(namespace=namespace, result="miss")
+        backend.register(namespace, maxsize)
+        Cache.registry[namespace] = self
+
+    def get(self, key: str) -> Any | None:
+        """Get value if present and not expired.
+
+        Args:
+            key (str): cache key
+
+        Returns:
+            Any | None: cached value or None
+        """
+        value = self.backend.get(self.namespace, key)
+        if value is None:
+            self.misses += 1
+            self._miss_counter.inc()
+        else:
+            self.hits += 1
+            self._hit_counter.inc()
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store value.
+
+        Args:
+            key (str): cache key
+            value (Any): value to store
+            ttl (float | None, optional): time-to-live in seconds, \
+                default is set to `self.ttl`.
+        """
+        self.backend.set(self.namespace, key, value, self.ttl if ttl is None else ttl)
+
+    def delete(self, key: str) -> None:
+        """Remove entry if present, in every worker.
+
+        Called once the change making the entry stale is committed, so a
+        backend failure is logged instead of failing the change; the entry
+        then lives until its TTL.
+
+        Args:
+            key (str): cache key
+        """
+        try:
+            self.backend.delete(self.namespace, key)
+        except Exception:
+            logger.exception("Cache %s delete failed, kept until TTL", self.namespace)
+
+    async def get_async(self, key: str) -> Any | None:
+        """Get value if present and not expired, off the event loop.
+
+        Args:
+            key (str): cache key
+
+        Returns:
+            Any | None: cached value or None
+        """
+        if not self.backend.blocking_reads:
+            return self.get(key)
+        return await run_in_threadpool(self.get, key)
+
+    async def set_async(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store value, off the event loop.
+
+        Args:
+            key (str): cache key
+            value (Any): value to store
+            ttl (float | None, optional): time-to-live in seconds, \
+                default is set to `self.ttl`.
+        """
+        if not self.backend.blocking_writes:
+            self.set(key, value, ttl)
+            return
+        await run_in_threadpool(self.set, key, value, ttl)
+
+    async def delete_async(self, key: str) -> None:
+        """Remove entry if present, in every worker, off the event loop.
+
+        Args:
+            key (str): cache key
+        """
+        if not self.backend.blocking_writes:
+            self.delete(key)
+            return
+        await run_in_threadpool(self.delete, key)
+
+    def clear(self) -> None:
+        """Remove all entries, in every worker, and reset statistics."""
+        self.backend.clear(self.namespace)
+        self.hits = 0
+        self.misses = 0
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    """Hits & misses of every namespace since start or last clear.
+
+    Returns:
+        dict[str, dict[str, int]]: statistics by namespace
+    """
+    return {
+        namespace: {"hits": cache.hits, "misses": cache.misses}
+        for namespace, cache in Cache.registry.items()
+    }
+
+
+def build_cache_backend(
+    backend: str,
+    *,
+    broadcast: str = "none",
+    sqlite_path: str = "cache.sqlite3",
+    redis_url: str = "redis://localhost:6379/0",
+    broadcast_poll_seconds: float = 1.0,
+) -> CacheBackend:
+    """Build cache backend.
+
+    Args:
+        backend (str): one of `CACHE_BACKENDS`
+        broadcast (str, optional): one of `CACHE_BROADCASTS`, memory backend \
+            only. Defaults to "none".
+        sqlite_path (str, optional): file of sqlite backend & broadcast. \
+            Defaults to "cache.sqlite3".
+        redis_url (str, optional): server of redis backend & broadcast. \
+            Defaults to "redis://localhost:6379/0".
+        broadcast_poll_seconds (float, optional): seconds between polls of \
+            sqlite broadcast. Defaults to 1.0.
+
+    Raises:
+        ValueError: raise if backend or broadcast is unknown.
+
+    Returns:
+        CacheBackend: cache backend
+    """
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown cache backend: {backend}")
+    if broadcast not in CACHE_BROADCASTS:
+        raise ValueError(f"Unknown cache broadcast: {broadcast}")
+    if backend == "sqlite":
+        return SQLiteBackend(sqlite_path)
+    if backend == "redis":
+        return RedisBackend(redis_url)
+    broadcaster: InvalidationBroadcaster | None = None
+    if broadcast == "sqlite":
+        broadcaster = SQLiteBroadcaster(
+            sqlite_path, poll_seconds=broadcast_poll_seconds
+        )
+    elif broadcast == "redis":
+        broadcaster = RedisBroadcaster(redis_url)
+    return MemoryBackend(broadcaster)
+
+
+@lru_cache
+def get_cache_backend() -> CacheBackend:
+    """Backend of `cache` settings shared by every namespace, built on first use.
+
+    Returns:
+        CacheBackend: cache backend
+    """
+    settings = get_settings()
+    return build_cache_backend(
+        settings.CACHE_BACKEND,
+        broadcast=settings.CACHE_BROADCAST,
+        sqlite_path=settings.CACHE_SQLITE_PATH,
+        redis_url=settings.CACHE_REDIS_URL,
+        broadcast_poll_seconds=settings.CACHE_BROADCAST_POLL_SECONDS,
+    )
+
+
+@lru_cache
+def get_principal_cache() -> Cache:
+    """Cache of read-only user views by username.
+
+    Returns:
+        Cache: `principal` namespace
+    """
+    settings = get_settings()
+    return Cache(
+        "principal",
+        get_cache_backend(),
+        maxsize=settings.PRINCIPAL_CACHE_MAXSIZE,
+        ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    )
+
+
+@lru_cache
+def get_security_version_cache() -> Cache:
+    """Cache of user security versions by user id.
+
+    Returns:
+        Cache: `security_version` namespace
+    """
+    settings = get_settings()
+    return Cache(
+        "security_version",
+        get_cache_backend(),
+        maxsize=settings.SECURITY_VERSION_CACHE_MAXSIZE,
+        ttl=settings.SECURITY_VERSION_CACHE_TTL_SECONDS,
+    )
+
+
+@lru_cache
+def get_token_cache() -> Cache:
+    """Cache of verified access token claims by token digest.
+
+    Returns:
+        Cache: `token` namespace
+    """
+    settings = get_settings()
+    return Cache(
+        "token",
+        get_cache_backend(),
+        maxsize=settings.TOKEN_CACHE_MAXSIZE,
+        ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
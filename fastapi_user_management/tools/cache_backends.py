@@ -0,0 +1,820 @@
+"""Storage backends of `Cache` namespaces and invalidation broadcasters.
+
+Backends:
+    MemoryBackend: LRU/TTL mapping per namespace, private to the process.
+    SQLiteBackend: file shared by workers of one host.
+    RedisBackend: any server speaking the Redis protocol (RESP2).
+
+Shared backends store pickled values, point them only at files & servers
+this service alone writes to.
+
+`MemoryBackend` can take an `InvalidationBroadcaster`, so deletes & clears
+of one worker reach the memory of every other one.
+"""
+import logging
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+InvalidationCallback = Callable[[str, str | None], None]
+
+
+class TTLCache:
+    """Bounded LRU mapping whose entries expire after a time-to-live."""
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """LRU cache with TTL.
+
+        Args:
+            maxsize (int, optional): max number of entries. Defaults to 1024.
+            ttl (float, optional): default time-to-live in seconds. Defaults to 60.0.
+            timer (Callable[[], float], optional): clock. Defaults to time.monotonic.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of stored entries, expired ones included until touched.
+
+        Returns:
+            int: entries count
+        """
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Get value if present and not expired.
+
+        Args:
+            key (Hashable): cache key
+
+        Returns:
+            Any | None: cached value or None
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, value = item
+            if expires_at <= self.timer():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Store value, evicting the least recently used entry when full.
+
+        Args:
+            key (Hashable): cache key
+            value (Any): value to store
+            ttl (float | None, optional): time-to-live in seconds, \
+                default is set to `self.ttl`.
+        """
+        expires_at = self.timer() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove entry if present.
+
+        Args:
+            key (Hashable): cache key
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class CacheBackend(ABC):
+    """Key-value store split in namespaces with per-entry expiration.
+
+    Attributes:
+        blocking_reads (bool): `get` does file or network I/O.
+        blocking_writes (bool): `set`, `delete` & `clear` do file or network I/O.
+    """
+
+    blocking_reads = True
+    blocking_writes = True
+
+    def register(self, namespace: str, maxsize: int) -> None:  # noqa: B027
+        """Declare namespace and its max entries, backends may ignore it.
+
+        Args:
+            namespace (str): cache namespace
+            maxsize (int): max number of entries
+        """
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Any | None:
+        """Get value if present and not expired.
+
+        Args:
+            namespace (str): cache namespace
+            key (str): cache key
+
+        Returns:
+            Any | None: cached value or None
+        """
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        """Store value.
+
+        Args:
+            namespace (str): cache namespace
+            key (str): cache key
+            value (Any): value to store
+            ttl (float): time-to-live in seconds
+        """
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove entry if present, in every worker.
+
+        Args:
+            namespace (str): cache namespace
+            key (str): cache key
+        """
+
+    @abstractmethod
+    def clear(self, namespace: str) -> None:
+        """Remove all entries of a namespace, in every worker.
+
+        Args:
+            namespace (str): cache namespace
+        """
+
+    def close(self) -> None:  # noqa: B027
+        """Release connections & background threads."""
+
+
+class InvalidationBroadcaster(ABC):
+    """Channel telling other workers which cache entries to drop."""
+
+    @abstractmethod
+    def publish(self, namespace: str, key: str | None) -> None:
+        """Announce removed entry.
+
+        Args:
+            namespace (str): cache namespace
+            key (str | None): removed key, None if namespace was cleared
+        """
+
+    @abstractmethod
+    def start(self, callback: InvalidationCallback) -> None:
+        """Call `callback` with every announcement, from a background thread.
+
+        Args:
+            callback (InvalidationCallback): receives namespace & key
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """Stop listening."""
+
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU/TTL backend, one `TTLCache` per namespace."""
+
+    def __init__(
+        self,
+        broadcaster: InvalidationBroadcaster | None = None,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """In-process backend.
+
+        Args:
+            broadcaster (InvalidationBroadcaster | None, optional): channel \
+                sharing deletes & clears with other workers. Defaults to None.
+            timer (Callable[[], float], optional): clock. Defaults to time.monotonic.
+        """
+        self.timer = timer
+        self.broadcaster = broadcaster
+        self.blocking_reads = False
+        # deletes & clears are published to other workers.
+        self.blocking_writes = broadcaster is not None
+        self._caches: dict[str, TTLCache] = {}
+        if broadcaster is not None:
+            broadcaster.start(self._invalidate)
+
+    def _cache(self, namespace: str) -> TTLCache:
+        cache = self._caches.get(namespace)
+        if cache is None:
+            cache = self._caches.setdefault(namespace, TTLCache(timer=self.timer))
+        return cache
+
+    def register(self, namespace: str, maxsize: int) -> None:
+        """Create namespace holding at most `maxsize` entries.
+
+        Args:
+            namespace (str): cache namespace
+            maxsize (int): max number of entries
+        """
+        self._cache(namespace).maxsize = maxsize
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        """Get value if present and not expired.
+
+        Args:
+            namespace (str): cache namespace
+            key (str): cache key
+
+        Returns:
+            Any | None: cached value or None
+        """
+        return self._cache(namespace).get(key)
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        """Store value, evicting the least recently used entry when full.
+
+        Args:
+            namespace (str): cache namespace
+            key (str): cache key
+            value (Any): value to store
+            ttl (float): time-to-live in seconds
+        """
+        self._cache(namespace).set(key, value, ttl=ttl)
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove entry here and announce it to other workers.
+
+        Args:
+            namespace (str): cache namespace
+            key (str): cache key
+        """
+        self._cache(namespace).delete(key)
+        if self.broadcaster is not None:
+            self.broadcaster.publish(namespace, key)
+
+    def clear(self, namespace: str) -> None:
+        """Remove entries here and announce it to other workers.
+
+        Args:
+            namespace (str): cache namespace
+        """
+        self._cache(namespace).clear()
+        if self.broadcaster is not None:
+            self.broadcaster.publish(namespace, None)
+
+    def close(self) -> None:
+        """Stop listening to other workers."""
+        if self.broadcaster is not None:
+            self.broadcaster.close()
+
+    def _invalidate(self, namespace: str, key: str | None) -> None:
+        cache = self._caches.get(namespace)
+        if cache is None:
+            return
+        if key is None:
+            cache.clear()
+        else:
+            cache.delete(key)
+
+
+class _SQLiteFile:
+    """Autocommit connection to a SQLite file shared between processes."""
+
+    def __init__(self, path: str, schema: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False, timeout=5
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(schema)
+        self._lock = threading.Lock()
+
+    def execute(self, sql: str, parameters: tuple[Any, ...] = ()) -> list[Any]:
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class SQLiteBackend(CacheBackend):
+    """Backend in a SQLite file, shared by every worker of the host.
+
+    Expired entries are purged and namespaces trimmed to `maxsize`, oldest
+    expiration first, every `prune_every` writes.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cache_entry (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value BLOB NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (namespace, key)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS ix_cache_entry_expires_at
+            ON cache_entry (namespace, expires_at);
+    """
+
+    def __init__(
+        self,
+        path: str,
+        prune_every: int = 100,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        """SQLite file backend.
+
+        Args:
+            path (str): database file
+            prune_every (int, optional): writes between prunes. Defaults to 100.
+            timer (Callable[[], float], optional): wall clock, shared by \
+                processes. Defaults to time.time.
+        """
+        self.prune_every = prune_every
+        self.timer = timer
+        self._file = _SQLiteFile(path, self.SCHEMA)
+        self._maxsizes: dict[str, int] = {}
+        self._writes = 0
+
+    def register(self, namespace: str, maxsize: int) -> None:
+        """Declare max entries of namespace, enforced on prune.
+
+        Args:
+            namespace (str): cache namespace
+            maxsize (int): max number of entries
+        """
+        self._maxsizes[namespace] = maxsize
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        """Get value if present and not expired.
+
+        Args:
+            namespace (str): cache namespace
+            key (str): cache key
+
+        Returns:
+            Any | None: cached value or None
+        """
+        rows = self._file.execute(
+            "SELECT value FROM cache_entry"
+            " WHERE namespace = ? AND key = ? AND expires_at > ?",
+            (namespace, key, self.timer()),
+        )
+        return pickle.loads(rows[0][0]) if rows else None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        """Store value.
+
+        Args:
+            namespace (str): cache namespace
+            key (str): cache key
+            value (Any): value to store
+            ttl (float): time-to-live in seconds
+        """
+        self._file.execute(
+            "INSERT OR REPLACE INTO cache_entry VALUES (?, ?, ?, ?)",
+            (namespace, key, pickle.dumps(value), self.timer() + ttl),
+        )
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self.prune()
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove entry if present.
+
+        Args:
+            namespace (str): cache namespace
+            key (str): cache key
+        """
+        self._file.execute(
+            "DELETE FROM cache_entry WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        )
+
+    def clear(self, namespace: str) -> None:
+        """Remove all entries of a namespace.
+
+        Args:
+            namespace (str): cache namespace
+        """
+        self._file.execute("DELETE FROM cache_entry WHERE namespace = ?", (namespace,))
+
+    def prune(self) -> None:
+        """Purge expired entries and trim namespaces to their max size."""
+        self._file.execute(
+            "DELETE FROM cache_entry WHERE expires_at <= ?", (self.timer(),)
+        )
+        for namespace, maxsize in self._maxsizes.items():
+            self._file.execute(
+                "DELETE FROM cache_entry WHERE namespace = ? AND key IN ("
+                " SELECT key FROM cache_entry WHERE namespace = ?"
+                " ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (namespace, namespace, maxsize),
+            )
+
+    def close(self) -> None:
+        """Close database file."""
+        self._file.close()
+
+
+class RespConnection:
+    """Minimal blocking client of the Redis serialization protocol (RESP2)."""
+
+    def __init__(self, url: str, timeout: float = 1.0) -> None:
+        """Connect to `redis://[:password@]host[:port][/db]`.
+
+        Args:
+            url (str): server URL
+            timeout (float, optional): socket timeout in seconds. Defaults to 1.0.
+        """
+        parsed = urlparse(url)
+        self._socket = socket.create_connection(
+            (parsed.hostname or "localhost", parsed.port or 6379), timeout=timeout
+        )
+        self._reader = self._socket.makefile("rb")
+        if parsed.password:
+            self.execute("AUTH", parsed.password)
+        database = parsed.path.lstrip("/")
+        if database:
+            self.execute("SELECT", database)
+
+    def send(self, *args: str | bytes | int | float) -> None:
+        """Send command without reading its reply.
+
+        Args:
+            args (str | bytes | int | float): command & arguments
+        """
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts += [f"${len(data)}\r\n".encode(), data, b"\r\n"]
+        self._socket.sendall(b"".join(parts))
+
+    def execute(self, *args: str | bytes | int | float) -> Any:
+        """Send command and read its reply.
+
+        Args:
+            args (str | bytes | int | float): command & arguments
+
+        Returns:
+            Any: decoded reply
+        """
+        self.send(*args)
+        return self.read_reply()
+
+    def read_reply(self) -> Any:
+        """Read one reply.
+
+        Raises:
+            ConnectionError: raise if server closed connection.
+            RuntimeError: raise on error replies.
+
+        Returns:
+            Any: bytes, int, list or None
+        """
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload
+        if kind == b"-":
+            raise RuntimeError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            return None if length < 0 else self._reader.read(length + 2)[:-2]
+        length = int(payload)
+        return None if length < 0 else [self.read_reply() for _ in range(length)]
+
+    def settimeout(self, timeout: float | None) -> None:
+        """Change socket timeout, None blocks until data arrives.
+
+        Args:
+            timeout (float | None): seconds
+        """
+        self._socket.settimeout(timeout)
+
+    def shutdown(self) -> None:
+        """Interrupt reads blocked in other threads."""
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        """Close connection."""
+        self._reader.close()
+        self._socket.close()
+
+
+class RedisBackend(CacheBackend):
+    """Backend on a Redis protocol server, keys are `namespace:key`.
+
+    Lookups failing on connection errors count as misses and writes are
+    skipped, so a server outage degrades to no caching. Deletes raise, a
+    missed one leaves a stale entry until its TTL; `Cache.delete` logs it.
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0) -> None:
+        """Redis backend, connecting on first use.
+
+        Args:
+            url (str): `redis://[:password@]host[:port][/db]`
+            timeout (float, optional): socket timeout in seconds. Defaults to 1.0.
+        """
+        self.url = url
+        self.timeout = timeout
+        self._connection: RespConnection | None = None
+        self._lock = threading.Lock()
+
+    def _execute(self, *args: str | bytes | int | float) -> Any:
+        with self._lock:
+            if self._connection is None:
+                self._connection = RespConnection(self.url, self.timeout)
+            try:
+                return self._connection.execute(*args)
+            except OSError:
+                # reconnect on next command.
+                self._connection.close()
+                self._connection = None
+                raise
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        """Get value if present, expired keys are dropped by the server.
+
+        Args:
+            namespace (str): cache namespace
+            key (str): cache key
+
+        Returns:
+            Any | None: cached value or None
+        """
+        try:
+            value = self._execute("GET", f"{namespace}:{key}")
+        except OSError:
+            logger.warning("Cache server unavailable, %s lookup missed", namespace)
+            return None
+        return pickle.loads(value) if value is not None else None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        """Store value with millisecond expiration.
+
+        Args:
+            namespace (str): cache namespace
+            key (str): cache key
+            value (Any): value to store
+            ttl (float): time-to-live in seconds
+        """
+        try:
+            self._execute(
+                "SET",
+                f"{namespace}:{key}",
+                pickle.dumps(value),
+                "PX",
+                max(int(ttl * 1000), 1),
+            )
+        except OSError:
+            logger.warning("Cache server unavailable, %s write skipped", namespace)
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove entry if present.
+
+        Args:
+            namespace (str): cache namespace
+            key (str): cache key
+        """
+        self._execute("DEL", f"{namespace}:{key}")
+
+    def clear(self, namespace: str) -> None:
+        """Remove all entries of a namespace, scanning its keys.
+
+        Args:
+            namespace (str): cache namespace
+        """
+        cursor = b"0"
+        while True:
+            cursor, keys = self._execute(
+                "SCAN", cursor, "MATCH", f"{namespace}:*", "COUNT", 1000
+            )
+            if keys:
+                self._execute("DEL", *keys)
+            if cursor == b"0":
+                return
+
+    def close(self) -> None:
+        """Close connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class SQLiteBroadcaster(InvalidationBroadcaster):
+    """Invalidations appended to a SQLite file and polled by every worker.
+
+    Workers read rows above the last id they've seen; rows older than
+    `retention_seconds` are purged while polling.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cache_invalidation (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            namespace TEXT NOT NULL,
+            key TEXT,
+            created_at REAL NOT NULL
+        );
+    """
+
+    def __init__(
+        self,
+        path: str,
+        poll_seconds: float = 1.0,
+        retention_seconds: float = 3600.0,
+    ) -> None:
+        """SQLite file broadcaster.
+
+        Args:
+            path (str): database file
+            poll_seconds (float, optional): seconds between polls. Defaults to 1.0.
+            retention_seconds (float, optional): seconds invalidations are \
+                kept. Defaults to 3600.0.
+        """
+        self.poll_seconds = poll_seconds
+        self.retention_seconds = retention_seconds
+        self._file = _SQLiteFile(path, self.SCHEMA)
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.high_water_mark = int(
+            self._file.execute("SELECT COALESCE(MAX(id), 0) FROM cache_invalidation")[
+                0
+            ][0]
+        )
+
+    def publish(self, namespace: str, key: str | None) -> None:
+        """Append invalidation.
+
+        Args:
+            namespace (str): cache namespace
+            key (str | None): removed key, None if namespace was cleared
+        """
+        self._file.execute(
+            "INSERT INTO cache_invalidation (namespace, key, created_at)"
+            " VALUES (?, ?, ?)",
+            (namespace, key, time.time()),
+        )
+
+    def poll(self, callback: InvalidationCallback) -> int:
+        """Apply invalidations appended since last poll.
+
+        Args:
+            callback (InvalidationCallback): receives namespace & key
+
+        Returns:
+            int: applied invalidations
+        """
+        rows = self._file.execute(
+            "SELECT id, namespace, key FROM cache_invalidation"
+            " WHERE id > ? ORDER BY id",
+            (self.high_water_mark,),
+        )
+        for id, namespace, key in rows:
+            callback(namespace, key)
+            self.high_water_mark = id
+        self._file.execute(
+            "DELETE FROM cache_invalidation WHERE created_at < ?",
+            (time.time() - self.retention_seconds,),
+        )
+        return len(rows)
+
+    def start(self, callback: InvalidationCallback) -> None:
+        """Poll in a daemon thread.
+
+        Args:
+            callback (InvalidationCallback): receives namespace & key
+        """
+
+        def run() -> None:
+            while not self._stopped.wait(self.poll_seconds):
+                try:
+                    self.poll(callback)
+                except sqlite3.Error:
+                    logger.exception("Cache invalidation poll failed")
+
+        self._thread = threading.Thread(
+            target=run, name="cache-invalidation", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop polling and close database file."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._file.close()
+
+
+class RedisBroadcaster(InvalidationBroadcaster):
+    """Invalidations sent through Redis PUBLISH / SUBSCRIBE."""
+
+    def __init__(
+        self, url: str, channel: str = "cache-invalidation", timeout: float = 1.0
+    ) -> None:
+        """Redis pub/sub broadcaster.
+
+        Args:
+            url (str): `redis://[:password@]host[:port][/db]`
+            channel (str, optional): pub/sub channel. \
+                Defaults to "cache-invalidation".
+            timeout (float, optional): socket timeout in seconds. Defaults to 1.0.
+        """
+        self.channel = channel
+        self._publisher = RedisBackend(url, timeout)
+        self.url = url
+        self.timeout = timeout
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._subscriber: RespConnection | None = None
+
+    def publish(self, namespace: str, key: str | None) -> None:
+        """Publish invalidation, a NUL separates namespace and key.
+
+        Args:
+            namespace (str): cache namespace
+            key (str | None): removed key, None if namespace was cleared
+        """
+        message = namespace if key is None else f"{namespace}\0{key}"
+        self._publisher._execute("PUBLISH", self.channel, message)
+
+    def start(self, callback: InvalidationCallback) -> None:
+        """Subscribe in a daemon thread, reconnecting on errors.
+
+        Args:
+            callback (InvalidationCallback): receives namespace & key
+        """
+
+        def run() -> None:
+            while not self._stopped.is_set():
+                try:
+                    self._listen(callback)
+                except OSError:
+                    # messages published meanwhile are lost, like any pub/sub.
+                    self._stopped.wait(self.timeout)
+
+        self._thread = threading.Thread(
+            target=run, name="cache-invalidation", daemon=True
+        )
+        self._thread.start()
+
+    def _listen(self, callback: InvalidationCallback) -> None:
+        connection = RespConnection(self.url, self.timeout)
+        self._subscriber = connection
+        try:
+            connection.execute("SUBSCRIBE", self.channel)
+            # block until a message arrives, `close` shuts the socket down.
+            connection.settimeout(None)
+            while True:
+                kind, _, message = connection.read_reply()
+                if kind == b"message":
+                    namespace, separator, key = message.decode().partition("\0")
+                    callback(namespace, key if separator else None)
+        finally:
+            connection.close()
+
+    def close(self) -> None:
+        """Stop listening and close connections."""
+        self._stopped.set()
+        if self._subscriber is not None:
+            self._subscriber.shutdown()
+        if self._thread is not None:
+            self._thread.join()
+        self._publisher.close()
@@ -0,0 +1,123 @@
+"""Password hashing cost calibration.
+
+Measures verify time on this machine for increasing costs of a scheme and
+recommends the highest cost staying within a latency budget.
+"""
+import statistics
+import time
+from dataclasses import dataclass, field
+
+from fastapi_user_management.tools.encryption import build_crypt_context
+
+CALIBRATION_PASSWORD = "calibration-password"
+
+
+@dataclass
+class CalibrationResult:
+    """Measured verify time by cost and the recommended cost."""
+
+    scheme: str
+    target_ms: float
+    timings_ms: dict[int, float] = field(default_factory=dict)
+    recommended: int | None = None
+
+    def settings_snippet(self, memory_cost: int, parallelism: int) -> str:
+        """Format `hashing` section of `settings.yaml` for recommended cost.
+
+        Args:
+            memory_cost (int): argon2 KiB
+            parallelism (int): argon2 lanes
+
+        Returns:
+            str: YAML snippet
+        """
+        lines = ["hashing:", f"  scheme: {self.scheme}"]
+        if self.scheme == "bcrypt":
+            lines.append(f"  bcrypt_rounds: {self.recommended}")
+        else:
+            lines += [
+                f"  argon2_memory_cost: {memory_cost}",
+                f"  argon2_time_cost: {self.recommended}",
+                f"  argon2_parallelism: {parallelism}",
+            ]
+        return "\n".join(lines)
+
+
+def measure_verify_ms(
+    scheme: str,
+    cost: int,
+    *,
+    samples: int,
+    memory_cost: int,
+    parallelism: int,
+) -> float:
+    """Median time of verifying a password hashed with one cost.
+
+    Args:
+        scheme (str): `bcrypt` or `argon2`
+        cost (int): bcrypt rounds or argon2 time cost
+        samples (int): verifications to take the median of
+        memory_cost (int): argon2 KiB
+        parallelism (int): argon2 lanes
+
+    Returns:
+        float: median milliseconds
+    """
+    context = build_crypt_context(
+        scheme,
+        bcrypt_rounds=cost,
+        argon2_time_cost=cost,
+        argon2_memory_cost=memory_cost,
+        argon2_parallelism=parallelism,
+    )
+    hashed_password = context.hash(CALIBRATION_PASSWORD)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.verify(CALIBRATION_PASSWORD, hashed_password)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(
+    scheme: str,
+    target_ms: float,
+    *,
+    min_cost: int,
+    max_cost: int,
+    samples: int = 5,
+    memory_cost: int = 65536,
+    parallelism: int = 4,
+) -> CalibrationResult:
+    """Find the highest cost verifying within target time.
+
+    Costs are tried in increasing order and the search stops at the first
+    one over target, as verify time only grows with cost.
+
+    Args:
+        scheme (str): `bcrypt` or `argon2`
+        target_ms (float): verify time budget in milliseconds
+        min_cost (int): first cost tried
+        max_cost (int): last cost tried
+        samples (int, optional): verifications per cost. Defaults to 5.
+        memory_cost (int, optional): argon2 KiB. Defaults to 65536.
+        parallelism (int, optional): argon2 lanes. Defaults to 4.
+
+    Returns:
+        CalibrationResult: timings and recommended cost, None if even \
+            `min_cost` is over target.
+    """
+    result = CalibrationResult(scheme=scheme, target_ms=target_ms)
+    for cost in range(min_cost, max_cost + 1):
+        elapsed_ms = measure_verify_ms(
+            scheme,
+            cost,
+            samples=samples,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+        )
+        result.timings_ms[cost] = elapsed_ms
+        if elapsed_ms > target_ms:
+            break
+        result.recommended = cost
+    return result
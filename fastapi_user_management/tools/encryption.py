@@ -1,7 +1,85 @@
-"""Encrypt password."""
-from passlib.context import CryptContext
+"""Encrypt password.
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+The configured password context is built by `get_pwd_context` on first use,
+so importing the app doesn't import passlib.
+"""
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from fastapi_user_management.config import get_settings
+from fastapi_user_management.tools.metrics import (
+    PASSWORD_HASH_DURATION,
+    PASSWORD_VERIFY_DURATION,
+)
+from fastapi_user_management.tools.profiler import profile_timing
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+HASHING_SCHEMES = ("bcrypt", "argon2")
+
+
+def build_crypt_context(
+    scheme: str = "bcrypt",
+    *,
+    bcrypt_rounds: int = 12,
+    argon2_memory_cost: int = 65536,
+    argon2_time_cost: int = 3,
+    argon2_parallelism: int = 4,
+) -> "CryptContext":
+    """Build password context hashing with one scheme and parameters.
+
+    Every scheme of `HASHING_SCHEMES` verifies, but hashes of other schemes
+    or with other parameters need an update.
+
+    Args:
+        scheme (str, optional): `bcrypt` or `argon2`. Defaults to "bcrypt".
+        bcrypt_rounds (int, optional): bcrypt log2 cost. Defaults to 12.
+        argon2_memory_cost (int, optional): argon2 KiB. Defaults to 65536.
+        argon2_time_cost (int, optional): argon2 iterations. Defaults to 3.
+        argon2_parallelism (int, optional): argon2 lanes. Defaults to 4.
+
+    Raises:
+        ValueError: raise if scheme is unknown.
+
+    Returns:
+        CryptContext: password context
+    """
+    from passlib.context import CryptContext
+
+    if scheme not in HASHING_SCHEMES:
+        raise ValueError(f"Unknown hashing scheme: {scheme}")
+    return CryptContext(
+        schemes=[scheme, *(other for other in HASHING_SCHEMES if other != scheme)],
+        default=scheme,
+        deprecated="auto",
+        # equal min & max rounds flag any other cost for rehashing.
+        bcrypt__default_rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        bcrypt__max_rounds=bcrypt_rounds,
+        argon2__default_rounds=argon2_time_cost,
+        argon2__min_rounds=argon2_time_cost,
+        argon2__max_rounds=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+@lru_cache
+def get_pwd_context() -> "CryptContext":
+    """Password context of hashing settings, built on first use.
+
+    Returns:
+        CryptContext: password context
+    """
+    settings = get_settings()
+    return build_crypt_context(
+        settings.HASHING_SCHEME,
+        bcrypt_rounds=settings.HASHING_BCRYPT_ROUNDS,
+        argon2_memory_cost=settings.HASHING_ARGON2_MEMORY_COST,
+        argon2_time_cost=settings.HASHING_ARGON2_TIME_COST,
+        argon2_parallelism=settings.HASHING_ARGON2_PARALLELISM,
+    )
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -14,11 +92,29 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: password match or not?
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    with PASSWORD_VERIFY_DURATION.time(), profile_timing("hash"):
+        return get_pwd_context().verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Check password and rehash it if stored hash is outdated.
+
+    Args:
+        plain_password (str): plain text password
+        hashed_password (str): encrypted password
+
+    Returns:
+        tuple[bool, str | None]: password match or not? and new hash if the \
+            stored one doesn't match configured scheme & parameters.
+    """
+    with PASSWORD_VERIFY_DURATION.time(), profile_timing("hash"):
+        return get_pwd_context().verify_and_update(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Get plain password and hash woth bcrypt.
+    """Get plain password and hash with configured scheme.
 
     Args:
         password (str): plain password
@@ -26,4 +122,5 @@ def get_password_hash(password: str) -> str:
     Returns:
         str: hashed password
     """
-    return pwd_context.hash(password)
+    with PASSWORD_HASH_DURATION.time(), profile_timing("hash"):
+        return get_pwd_context().hash(password)
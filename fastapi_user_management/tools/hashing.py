@@ -0,0 +1,184 @@
+"""Run password hashing off the event loop with a bounded executor."""
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from fastapi_user_management.config import get_settings
+from fastapi_user_management.errors.exceptions import HashingQueueFullError
+from fastapi_user_management.tools.encryption import (
+    get_password_hash,
+    verify_and_update_password,
+    verify_password,
+)
+from fastapi_user_management.tools.profiler import profile_timing
+
+T = TypeVar("T")
+
+EXECUTORS: dict[str, type[Executor]] = {
+    "thread": ThreadPoolExecutor,
+    "process": ProcessPoolExecutor,
+}
+
+
+class HashingService:
+    """Password hash/verify in a worker pool with a cap on in-flight calls."""
+
+    def __init__(
+        self,
+        executor: str = "thread",
+        max_workers: int | None = None,
+        max_in_flight: int = 32,
+    ) -> None:
+        """Hashing service with a lazily created pool.
+
+        Args:
+            executor (str, optional): `thread` or `process`. Defaults to "thread".
+            max_workers (int | None, optional): pool size. Defaults to None.
+            max_in_flight (int, optional): running + queued calls allowed before
+                rejecting new ones. Defaults to 32.
+
+        Raises:
+            ValueError: raise if executor type is unknown.
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown hashing executor: {executor}")
+        self.executor_type = executor
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight
+        self._executor: Executor | None = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> Executor:
+        """Worker pool, created on first use.
+
+        Returns:
+            Executor: thread or process pool
+        """
+        if self._executor is None:
+            self._executor = EXECUTORS[self.executor_type](max_workers=self.max_workers)
+        return self._executor
+
+    @property
+    def in_flight(self) -> int:
+        """Number of hash/verify calls currently running or queued.
+
+        Returns:
+            int: in-flight calls
+        """
+        return self._in_flight
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                raise HashingQueueFullError
+            self._in_flight += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        self._acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            # workers don't inherit the request context, time the wait here.
+            with profile_timing("hash"):
+                return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self._release()
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Check password with hashed password in the worker pool.
+
+        Args:
+            plain_password (str): plain text password
+            hashed_password (str): encrypted password
+
+        Raises:
+            HashingQueueFullError: raise if too many calls are in flight.
+
+        Returns:
+            bool: password match or not?
+        """
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        """Check password and rehash outdated hash in the worker pool.
+
+        Args:
+            plain_password (str): plain text password
+            hashed_password (str): encrypted password
+
+        Raises:
+            HashingQueueFullError: raise if too many calls are in flight.
+
+        Returns:
+            tuple[bool, str | None]: password match or not? and new hash if \
+                stored one is outdated.
+        """
+        return await self._run(
+            verify_and_update_password, plain_password, hashed_password
+        )
+
+    async def hash(self, password: str) -> str:
+        """Hash plain password in the worker pool.
+
+        Args:
+            password (str): plain password
+
+        Raises:
+            HashingQueueFullError: raise if too many calls are in flight.
+
+        Returns:
+            str: hashed password
+        """
+        return await self._run(get_password_hash, password)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shutdown the worker pool, a new one is created on next use.
+
+        Args:
+            wait (bool, optional): wait for running calls. Defaults to True.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+@lru_cache
+def get_hashing_service() -> HashingService:
+    """Hashing service of logins & password changes, built on first use.
+
+    Returns:
+        HashingService: hashing service
+    """
+    settings = get_settings()
+    return HashingService(
+        executor=settings.HASHING_EXECUTOR,
+        max_workers=settings.HASHING_MAX_WORKERS,
+        max_in_flight=settings.HASHING_MAX_IN_FLIGHT,
+    )
+
+
+@lru_cache
+def get_import_hashing_service() -> HashingService:
+    """Hashing service of bulk imports, built on first use.
+
+    Bulk imports hash whole batches, this keeps them off the pool serving
+    logins.
+
+    Returns:
+        HashingService: hashing service
+    """
+    settings = get_settings()
+    return HashingService(
+        executor=settings.HASHING_EXECUTOR,
+        max_workers=settings.HASHING_IMPORT_MAX_WORKERS,
+    )
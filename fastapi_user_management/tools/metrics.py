@@ -0,0 +1,177 @@
+"""Prometheus metrics of requests, SQL, pools, hashing, JWT and caches.
+
+Metrics live in the default `prometheus_client` registry, one per process;
+run uvicorn with one worker per scrape target or use the client's
+multiprocess mode.
+"""
+import time
+from typing import Any
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import ExceptionContext
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+UNMATCHED_ROUTE = "<unmatched>"
+SQL_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE"})
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to send response headers, by route.",
+    ["method", "route"],
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "Handled requests, by status.", ["method", "route", "status"]
+)
+SQL_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time, by engine and operation.",
+    ["engine", "operation"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1, 1),
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections", "Connections in use, by engine.", ["engine"]
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Connections opened beyond pool size, by engine.",
+    ["engine"],
+)
+PASSWORD_HASHING_DURATION = Histogram(
+    "password_hashing_duration_seconds",
+    "bcrypt time, by operation.",
+    ["operation"],
+    buckets=(0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 1, 2.5),
+)
+JWT_DURATION = Histogram(
+    "jwt_duration_seconds",
+    "JWT signing & verification time, by operation.",
+    ["operation"],
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.01),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups, by namespace and result.",
+    ["namespace", "result"],
+)
+STARTUP_PHASE_DURATION = Gauge(
+    "app_startup_phase_seconds",
+    "Duration of last startup, by phase.",
+    ["phase"],
+)
+
+# label lookups resolved once, hot paths only observe.
+PASSWORD_HASH_DURATION = PASSWORD_HASHING_DURATION.labels(operation="hash")
+PASSWORD_VERIFY_DURATION = PASSWORD_HASHING_DURATION.labels(operation="verify")
+JWT_ENCODE_DURATION = JWT_DURATION.labels(operation="encode")
+JWT_DECODE_DURATION = JWT_DURATION.labels(operation="decode")
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Time SQL statements and expose pool usage of an engine.
+
+    Args:
+        engine (Engine): sync engine, `AsyncEngine.sync_engine` for async ones
+        name (str): `engine` label
+    """
+    durations: dict[str, Any] = {}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _observe(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        elapsed = time.perf_counter() - conn.info["metrics_started"].pop()
+        operation = statement.lstrip()[:6].upper()
+        if operation not in SQL_OPERATIONS:
+            operation = "OTHER"
+        histogram = durations.get(operation)
+        if histogram is None:
+            histogram = durations[operation] = SQL_STATEMENT_DURATION.labels(
+                engine=name, operation=operation
+            )
+        histogram.observe(elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def _discard_timer(context: ExceptionContext) -> None:
+        # failed statements skip `after_cursor_execute`, don't leak their start.
+        if context.execution_context is not None and context.connection is not None:
+            started = context.connection.info.get("metrics_started")
+            if started:
+                started.pop()
+
+    # read on scrape, pools without sizing (NullPool, StaticPool) report 0.
+    pool = engine.pool
+    POOL_CHECKED_OUT.labels(engine=name).set_function(
+        lambda: getattr(pool, "checkedout", int)()
+    )
+    POOL_OVERFLOW.labels(engine=name).set_function(
+        lambda: max(getattr(pool, "overflow", int)(), 0)
+    )
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting and timing requests by route template."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap application.
+
+        Args:
+            app (ASGIApp): ASGI application
+        """
+        self.app = app
+        # label lookups resolved once per route, bounded by route templates.
+        self._durations: dict[tuple[str, str], Any] = {}
+        self._counters: dict[tuple[str, str, int], Any] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle request.
+
+        Args:
+            scope (Scope): connection scope
+            receive (Receive): receive channel
+            send (Send): send channel
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                self._duration(scope["method"], _route(scope)).observe(
+                    time.perf_counter() - started
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            self._requests(scope["method"], _route(scope), status_code).inc()
+
+    def _duration(self, method: str, route: str) -> Any:
+        key = (method, route)
+        histogram = self._durations.get(key)
+        if histogram is None:
+            histogram = self._durations[key] = HTTP_REQUEST_DURATION.labels(*key)
+        return histogram
+
+    def _requests(self, method: str, route: str, status_code: int) -> Any:
+        key = (method, route, status_code)
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = HTTP_REQUESTS.labels(
+                method, route, str(status_code)
+            )
+        return counter
+
+
+def _route(scope: Scope) -> str:
+    # router adds matched route to scope, raw paths would explode cardinality.
+    route = scope.get("route")
+    return str(route.path) if route is not None else UNMATCHED_ROUTE
@@ -0,0 +1,55 @@
+"""Opaque cursors for keyset pagination."""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi_user_management.errors.exceptions import InvalidCursorError
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} can't be used in a cursor")
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Encode keyset values of the last row into an opaque cursor.
+
+    Args:
+        values (list[Any]): ordering column values
+
+    Returns:
+        str: url-safe cursor
+    """
+    raw = json.dumps(values, default=_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: list[type]) -> list[Any]:
+    """Decode cursor into keyset values.
+
+    Args:
+        cursor (str): cursor from `encode_cursor`
+        types (list[type]): python type of every ordering column
+
+    Raises:
+        InvalidCursorError: raise if cursor is malformed.
+
+    Returns:
+        list[Any]: ordering column values
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError) as e:
+        raise InvalidCursorError from e
+    if not isinstance(values, list) or len(values) != len(types):
+        raise InvalidCursorError
+    try:
+        return [
+            datetime.fromisoformat(value) if type_ is datetime else type_(value)
+            for value, type_ in zip(values, types, strict=True)
+        ]
+    except (TypeError, ValueError) as e:
+        raise InvalidCursorError from e
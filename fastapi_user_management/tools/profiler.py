@@ -0,0 +1,191 @@
+"""Per-request profiler of SQL, password hashing and JWT time.
+
+`ProfilerMiddleware` starts a `RequestProfile` for every request; engine
+events, `HashingService` and the token/encryption helpers add to the
+profile of the running request through a context variable, and the totals
+are sent back in a `Server-Timing` header.
+"""
+import logging
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import ExceptionContext
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+TIMINGS = ("db", "hash", "jwt")
+
+
+@dataclass
+class RequestProfile:
+    """Time spent per kind of work and SQL statements of one request."""
+
+    seconds: Counter[str] = field(default_factory=Counter)
+    statements: Counter[str] = field(default_factory=Counter)
+
+    def add(self, timing: str, seconds: float) -> None:
+        """Add time to a kind of work.
+
+        Args:
+            timing (str): one of `TIMINGS`
+            seconds (float): elapsed time
+        """
+        self.seconds[timing] += seconds
+
+    def repeated_statements(self, threshold: int) -> dict[str, int]:
+        """Statements executed more than `threshold` times.
+
+        Args:
+            threshold (int): allowed executions of one statement
+
+        Returns:
+            dict[str, int]: executions by statement
+        """
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count > threshold
+        }
+
+    def server_timing(self, total: float) -> str:
+        """Format `Server-Timing` header value.
+
+        Args:
+            total (float): seconds since request started
+
+        Returns:
+            str: header value in milliseconds
+        """
+        metrics = [
+            f"{timing};dur={self.seconds[timing] * 1000:.3f}" for timing in TIMINGS
+        ]
+        metrics[0] += f';desc="{sum(self.statements.values())} queries"'
+        metrics.append(f"total;dur={total * 1000:.3f}")
+        return ", ".join(metrics)
+
+
+_current_profile: ContextVar[RequestProfile | None] = ContextVar(
+    "current_profile", default=None
+)
+
+
+def current_profile() -> RequestProfile | None:
+    """Profile of the running request.
+
+    Returns:
+        RequestProfile | None: profile, None outside profiled requests
+    """
+    return _current_profile.get()
+
+
+@contextmanager
+def profile_timing(timing: str) -> Iterator[None]:
+    """Add block time to the running request's profile.
+
+    Args:
+        timing (str): one of `TIMINGS`
+
+    Yields:
+        Iterator[None]: timed block
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(timing, time.perf_counter() - started)
+
+
+def profile_engine(engine: Engine) -> None:
+    """Count and time SQL statements of profiled requests.
+
+    Args:
+        engine (Engine): sync engine, `AsyncEngine.sync_engine` for async ones
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        if _current_profile.get() is not None:
+            conn.info.setdefault("profiler_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _add_statement(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        profile = _current_profile.get()
+        if profile is None or not conn.info.get("profiler_started"):
+            return
+        profile.add("db", time.perf_counter() - conn.info["profiler_started"].pop())
+        # bound parameters are placeholders, so equal strings share a shape.
+        profile.statements[statement] += 1
+
+    @event.listens_for(engine, "handle_error")
+    def _discard_timer(context: ExceptionContext) -> None:
+        # failed statements skip `after_cursor_execute`, don't leak their start.
+        if context.execution_context is not None and context.connection is not None:
+            started = context.connection.info.get("profiler_started")
+            if started:
+                started.pop()
+
+
+class ProfilerMiddleware:
+    """ASGI middleware adding `Server-Timing` and warning about N+1 queries."""
+
+    def __init__(self, app: ASGIApp, *, repeated_statement_threshold: int) -> None:
+        """Wrap application.
+
+        Args:
+            app (ASGIApp): ASGI application
+            repeated_statement_threshold (int): executions of one statement \
+                within a request before warning
+        """
+        self.app = app
+        self.repeated_statement_threshold = repeated_statement_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle request.
+
+        Args:
+            scope (Scope): connection scope
+            receive (Receive): receive channel
+            send (Send): send channel
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    profile.server_timing(time.perf_counter() - started),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
+            repeated = profile.repeated_statements(self.repeated_statement_threshold)
+            for statement, count in repeated.items():
+                logger.warning(
+                    "Possible N+1 query, %s %s executed %d times: %s",
+                    scope["method"],
+                    scope["path"],
+                    count,
+                    statement,
+                )
@@ -0,0 +1,194 @@
+"""In-process list of revoked access tokens, synced from the database.
+
+Every worker keeps revoked `jti`s in memory, so checking a token costs a
+dict lookup. A background task polls tokens revoked by other workers with
+an id above the last one seen (high-water mark) and drops expired entries;
+tokens revoked by this worker are added right away.
+
+PostgreSQL hands out ids before commit, so a row may become visible after
+rows with larger ids; each poll re-reads `sync_overlap` ids below the mark
+to pick up such late commits.
+"""
+import asyncio
+import heapq
+import logging
+import threading
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from functools import lru_cache
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_user_management import crud
+from fastapi_user_management.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def _timestamp(moment: datetime) -> float:
+    # SQLite returns naive datetimes, stored values are UTC.
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return moment.timestamp()
+
+
+class RevocationList:
+    """Expiring set of revoked token ids."""
+
+    def __init__(
+        self, timer: Callable[[], float] = time.time, sync_overlap: int = 0
+    ) -> None:
+        """Empty revocation list.
+
+        Args:
+            timer (Callable[[], float], optional): wall clock, compared with \
+                token `exp`. Defaults to time.time.
+            sync_overlap (int, optional): ids below the high-water mark read \
+                again on sync. Defaults to 0.
+        """
+        self.timer = timer
+        self.sync_overlap = sync_overlap
+        self.high_water_mark = 0
+        self._expires: dict[str, float] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of revoked tokens, expired ones included until purged.
+
+        Returns:
+            int: tokens count
+        """
+        return len(self._expires)
+
+    def is_revoked(self, jti: str | None) -> bool:
+        """Check if token is revoked, without any SQL.
+
+        Args:
+            jti (str | None): token id, tokens without one can't be revoked
+
+        Returns:
+            bool: revoked or not?
+        """
+        return jti is not None and jti in self._expires
+
+    def add(self, jti: str, expires_at: float) -> bool:
+        """Remember revoked token until it expires.
+
+        Args:
+            jti (str): token id
+            expires_at (float): token expiration timestamp
+
+        Returns:
+            bool: token is new, False if already known
+        """
+        with self._lock:
+            if jti in self._expires:
+                return False
+            self._expires[jti] = expires_at
+            heapq.heappush(self._heap, (expires_at, jti))
+            return True
+
+    def purge_expired(self) -> int:
+        """Forget expired tokens, they fail verification anyway.
+
+        Returns:
+            int: forgotten tokens
+        """
+        now = self.timer()
+        purged = 0
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, jti = heapq.heappop(self._heap)
+                del self._expires[jti]
+                purged += 1
+        return purged
+
+    def clear(self) -> None:
+        """Forget every token and the high-water mark."""
+        with self._lock:
+            self._expires.clear()
+            self._heap.clear()
+            self.high_water_mark = 0
+
+    async def revoke_async(
+        self, db: AsyncSession, *, jti: str, expires_at: datetime
+    ) -> None:
+        """Revoke token for every worker.
+
+        Args:
+            db (AsyncSession): async database session
+            jti (str): token id
+            expires_at (datetime): token expiration, UTC
+        """
+        await crud.revoked_token.revoke_async(db, jti=jti, expires_at=expires_at)
+        self.add(jti, _timestamp(expires_at))
+
+    async def sync_async(self, db: AsyncSession) -> int:
+        """Load tokens revoked since the high-water mark and purge expired ones.
+
+        Args:
+            db (AsyncSession): async database session
+
+        Returns:
+            int: loaded tokens, not counting already known ones
+        """
+        revoked_tokens = await crud.revoked_token.get_since_async(
+            db, after_id=max(self.high_water_mark - self.sync_overlap, 0)
+        )
+        loaded = sum(
+            self.add(revoked_token.jti, _timestamp(revoked_token.expires_at))
+            for revoked_token in revoked_tokens
+        )
+        if revoked_tokens:
+            self.high_water_mark = max(self.high_water_mark, revoked_tokens[-1].id)
+        self.purge_expired()
+        return loaded
+
+    async def run(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        *,
+        sync_interval: float,
+        purge_interval: float,
+        purge_batch_size: int,
+    ) -> None:
+        """Sync every `sync_interval` and purge tables every `purge_interval`.
+
+        Expired rows of both `revoked_token` and `refresh_token` are purged.
+
+        Runs until cancelled, errors are logged and retried on next tick.
+
+        Args:
+            session_factory (Callable[[], AsyncSession]): async session maker
+            sync_interval (float): seconds between syncs
+            purge_interval (float): seconds between purges of expired rows
+            purge_batch_size (int): rows per purge delete
+        """
+        next_purge = time.monotonic() + purge_interval
+        while True:
+            try:
+                async with session_factory() as db:
+                    await self.sync_async(db)
+                    if time.monotonic() >= next_purge:
+                        next_purge = time.monotonic() + purge_interval
+                        await crud.revoked_token.purge_expired_async(
+                            db, batch_size=purge_batch_size
+                        )
+                        await crud.refresh_token.purge_expired_async(
+                            db, batch_size=purge_batch_size
+                        )
+            except Exception:
+                logger.exception("Revocation list sync failed")
+            await asyncio.sleep(sync_interval)
+
+
+@lru_cache
+def get_revocation_list() -> RevocationList:
+    """Revocation list of this worker, built on first use.
+
+    Returns:
+        RevocationList: revocation list
+    """
+    return RevocationList(sync_overlap=get_settings().REVOCATION_SYNC_OVERLAP)
@@ -0,0 +1,193 @@
+"""In-process login throttling run before credentials are checked.
+
+Each `LoginThrottle` tracks one kind of key (username or client IP) with a
+token bucket limiting attempts and a consecutive failures counter locking
+the key out, for twice as long on every repeated lockout. State is bounded:
+keys are kept in least recently used order, idle ones are evicted first and
+the oldest ones once `maxsize` is reached.
+"""
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from functools import lru_cache
+
+from fastapi_user_management.config import get_settings
+
+
+@dataclass
+class ThrottleState:
+    """Attempts & failures of one key."""
+
+    tokens: float
+    updated_at: float
+    failures: int = 0
+    lockouts: int = 0
+    locked_until: float = 0.0
+
+
+class LoginThrottle:
+    """Token bucket & lockout limiter of login attempts per key."""
+
+    def __init__(
+        self,
+        *,
+        rate_per_minute: float,
+        burst: int,
+        max_failures: int,
+        lockout_seconds: float,
+        max_lockout_seconds: float,
+        maxsize: int = 100_000,
+        idle_seconds: float = 900.0,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Login throttle.
+
+        Args:
+            rate_per_minute (float): sustained attempts per minute
+            burst (int): attempts allowed at once
+            max_failures (int): consecutive failures before lockout
+            lockout_seconds (float): first lockout duration
+            max_lockout_seconds (float): longest lockout duration
+            maxsize (int, optional): max tracked keys. Defaults to 100_000.
+            idle_seconds (float, optional): seconds without attempts before \
+                a key is forgotten, at least `max_lockout_seconds`. \
+                Defaults to 900.0.
+            timer (Callable[[], float], optional): clock. Defaults to time.monotonic.
+        """
+        self.rate = rate_per_minute / 60
+        self.burst = burst
+        self.max_failures = max_failures
+        self.lockout_seconds = lockout_seconds
+        self.max_lockout_seconds = max_lockout_seconds
+        self.maxsize = maxsize
+        # forgetting a key ends its lockout, so idle keys outlive lockouts.
+        self.idle_seconds = max(idle_seconds, max_lockout_seconds)
+        self.timer = timer
+        self._states: OrderedDict[Hashable, ThrottleState] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of tracked keys.
+
+        Returns:
+            int: keys count
+        """
+        return len(self._states)
+
+    def acquire(self, key: Hashable) -> float:
+        """Take an attempt of a key if it is allowed.
+
+        Args:
+            key (Hashable): username or client IP
+
+        Returns:
+            float: 0 if attempt is allowed, otherwise seconds to retry after
+        """
+        now = self.timer()
+        with self._lock:
+            state = self._touch(key, now)
+            if state.locked_until > now:
+                return state.locked_until - now
+            state.tokens = min(
+                self.burst, state.tokens + (now - state.updated_at) * self.rate
+            )
+            state.updated_at = now
+            if state.tokens < 1:
+                return (1 - state.tokens) / self.rate
+            state.tokens -= 1
+            return 0.0
+
+    def record_failure(self, key: Hashable) -> None:
+        """Count a failed login, locking the key out after `max_failures`.
+
+        Args:
+            key (Hashable): username or client IP
+        """
+        now = self.timer()
+        with self._lock:
+            state = self._touch(key, now)
+            state.failures += 1
+            if state.failures < self.max_failures:
+                return
+            state.failures = 0
+            state.lockouts += 1
+            state.locked_until = now + min(
+                self.lockout_seconds * 2 ** (state.lockouts - 1),
+                self.max_lockout_seconds,
+            )
+
+    def record_success(self, key: Hashable) -> None:
+        """Reset failures & lockout backoff of a key.
+
+        Args:
+            key (Hashable): username or client IP
+        """
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None:
+                state.failures = 0
+                state.lockouts = 0
+
+    def clear(self) -> None:
+        """Forget all keys."""
+        with self._lock:
+            self._states.clear()
+
+    def _touch(self, key: Hashable, now: float) -> ThrottleState:
+        state = self._states.get(key)
+        if state is None:
+            self._evict(now)
+            state = self._states[key] = ThrottleState(tokens=self.burst, updated_at=now)
+        self._states.move_to_end(key)
+        return state
+
+    def _evict(self, now: float) -> None:
+        # keys are in last-touched order, so idle ones are at the front.
+        while self._states:
+            oldest = next(iter(self._states.values()))
+            if (
+                now - oldest.updated_at < self.idle_seconds
+                and len(self._states) < self.maxsize
+            ):
+                return
+            self._states.popitem(last=False)
+
+
+@lru_cache
+def get_username_throttle() -> LoginThrottle:
+    """Login throttle of usernames, built from settings on first use.
+
+    Returns:
+        LoginThrottle: username throttle
+    """
+    settings = get_settings()
+    return LoginThrottle(
+        rate_per_minute=settings.LOGIN_THROTTLE_USERNAME_PER_MINUTE,
+        burst=settings.LOGIN_THROTTLE_USERNAME_BURST,
+        max_failures=settings.LOGIN_THROTTLE_USERNAME_MAX_FAILURES,
+        lockout_seconds=settings.LOGIN_THROTTLE_LOCKOUT_SECONDS,
+        max_lockout_seconds=settings.LOGIN_THROTTLE_MAX_LOCKOUT_SECONDS,
+        maxsize=settings.LOGIN_THROTTLE_MAXSIZE,
+        idle_seconds=settings.LOGIN_THROTTLE_IDLE_SECONDS,
+    )
+
+
+@lru_cache
+def get_ip_throttle() -> LoginThrottle:
+    """Login throttle of client IPs, built from settings on first use.
+
+    Returns:
+        LoginThrottle: client IP throttle
+    """
+    settings = get_settings()
+    return LoginThrottle(
+        rate_per_minute=settings.LOGIN_THROTTLE_IP_PER_MINUTE,
+        burst=settings.LOGIN_THROTTLE_IP_BURST,
+        max_failures=settings.LOGIN_THROTTLE_IP_MAX_FAILURES,
+        lockout_seconds=settings.LOGIN_THROTTLE_LOCKOUT_SECONDS,
+        max_lockout_seconds=settings.LOGIN_THROTTLE_MAX_LOCKOUT_SECONDS,
+        maxsize=settings.LOGIN_THROTTLE_MAXSIZE,
+        idle_seconds=settings.LOGIN_THROTTLE_IDLE_SECONDS,
+    )
@@ -1,14 +1,34 @@
-"""Token generation function."""
+"""Token generation function.
+
+jose is imported on first use, so importing the app doesn't import it.
+"""
+import hashlib
+import secrets
+import time
 from datetime import datetime, timedelta
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
 
-from jose import jwt
+from fastapi_user_management.config import get_settings
+from fastapi_user_management.errors.exceptions import InvalidTokenError
+from fastapi_user_management.schemas.user import UserPrincipal
+from fastapi_user_management.tools.cache import get_token_cache
+from fastapi_user_management.tools.metrics import (
+    JWT_DECODE_DURATION,
+    JWT_ENCODE_DURATION,
+)
+from fastapi_user_management.tools.profiler import profile_timing
 
-from fastapi_user_management.config import SETTINGS
+SchemaType = TypeVar("SchemaType", bound=BaseModel)
+JTI_BYTES = 16
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """Generate access token for specified time, default set to 15 minutes.
 
+    Every token gets a random `jti`, so it can be revoked before expiry.
+
     Args:
         data (dict): Information related to user.
         expires_delta (timedelta | None, optional): Token expiration time. Defaults to None.
@@ -16,13 +36,122 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     Returns:
         str: access token
     """
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, SETTINGS.SECRET_KEY, algorithm=SETTINGS.ALGORITHM
-    )
+    to_encode.setdefault("jti", secrets.token_urlsafe(JTI_BYTES))
+    settings = get_settings()
+    with JWT_ENCODE_DURATION.time(), profile_timing("jwt"):
+        encoded_jwt = jwt.encode(
+            to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
+        )
     return encoded_jwt
+
+
+def decode_access_token(token: str) -> dict[str, Any]:
+    """Verify signature & expiration of access token and return its claims.
+
+    Args:
+        token (str): access token
+
+    Raises:
+        InvalidTokenError: raise if token is invalid or expired.
+
+    Returns:
+        dict[str, Any]: token claims
+    """
+    from jose import JWTError, jwt
+
+    settings = get_settings()
+    with JWT_DECODE_DURATION.time(), profile_timing("jwt"):
+        try:
+            return jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
+        except JWTError as e:
+            raise InvalidTokenError(str(e)) from e
+
+
+def verify_access_token(token: str, schema: type[SchemaType]) -> SchemaType:
+    """Decode access token into schema, cached until the token expires.
+
+    Tokens are cached by digest, so a reused token pays signature
+    verification and schema validation once.
+
+    Args:
+        token (str): access token
+        schema (type[SchemaType]): schema to validate claims with
+
+    Raises:
+        InvalidTokenError: raise if token is invalid or expired.
+        ValidationError: raise if claims don't match schema.
+
+    Returns:
+        SchemaType: validated claims, shared between callers, don't mutate.
+    """
+    key = _token_cache_key(token, schema)
+    cached: SchemaType | None = get_token_cache().get(key)
+    if cached is not None:
+        return cached
+    verified, ttl = _verify_claims(token, schema)
+    get_token_cache().set(key, verified, ttl=ttl)
+    return verified
+
+
+async def verify_access_token_async(token: str, schema: type[SchemaType]) -> SchemaType:
+    """Decode access token into schema, cache I/O off the event loop.
+
+    Args:
+        token (str): access token
+        schema (type[SchemaType]): schema to validate claims with
+
+    Raises:
+        InvalidTokenError: raise if token is invalid or expired.
+        ValidationError: raise if claims don't match schema.
+
+    Returns:
+        SchemaType: validated claims, shared between callers, don't mutate.
+    """
+    key = _token_cache_key(token, schema)
+    cached: SchemaType | None = await get_token_cache().get_async(key)
+    if cached is not None:
+        return cached
+    verified, ttl = _verify_claims(token, schema)
+    await get_token_cache().set_async(key, verified, ttl=ttl)
+    return verified
+
+
+def _token_cache_key(token: str, schema: type[BaseModel]) -> str:
+    return f"{schema.__name__}:{hashlib.sha256(token.encode()).hexdigest()}"
+
+
+def _verify_claims(
+    token: str, schema: type[SchemaType]
+) -> tuple[SchemaType, float | None]:
+    claims = decode_access_token(token)
+    ttl = claims["exp"] - time.time() if "exp" in claims else None
+    return schema.model_validate(claims), ttl
+
+
+def create_user_claims(user: UserPrincipal) -> dict[str, Any]:
+    """Build token claims for stateless authorization.
+
+    Args:
+        user (UserPrincipal): authenticated user
+
+    Returns:
+        dict[str, Any]: claims to encode in access token
+    """
+    return {
+        "sub": user.username,
+        "uid": user.id,
+        "name": user.fullname,
+        "status": user.status.value,
+        "roles": [role.value for role in user.roles],
+        "ver": user.security_version,
+    }
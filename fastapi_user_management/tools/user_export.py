@@ -0,0 +1,56 @@
+"""Serialize users for streaming export as NDJSON or CSV."""
+import csv
+import io
+import json
+from collections.abc import Iterable
+
+from fastapi_user_management.schemas.user import UserRead
+from fastapi_user_management.tools.user_import import ROLE_SEPARATOR
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_FIELDS = list(UserRead.model_fields)
+
+
+def export_header(file_format: str) -> str:
+    """Header written once before any user.
+
+    Args:
+        file_format (str): `ndjson` or `csv`
+
+    Returns:
+        str: CSV header line or empty string
+    """
+    if file_format != "csv":
+        return ""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_FIELDS)
+    return buffer.getvalue()
+
+
+def serialize_users(users: Iterable[UserRead], file_format: str) -> str:
+    """Serialize a chunk of users.
+
+    CSV rows join role names with `;` so exports can be imported back.
+
+    Args:
+        users (Iterable[UserRead]): users
+        file_format (str): `ndjson` or `csv`
+
+    Raises:
+        ValueError: raise if file format is unknown.
+
+    Returns:
+        str: serialized chunk
+    """
+    rows = (user.model_dump(mode="json") for user in users)
+    if file_format == "ndjson":
+        return "".join(json.dumps(row) + "\n" for row in rows)
+    if file_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+        for row in rows:
+            # same `;` separated roles column as CSV imports
+            row["roles"] = ROLE_SEPARATOR.join(role["name"] for role in row["roles"])
+            writer.writerow(row)
+        return buffer.getvalue()
+    raise ValueError(f"Unknown export format: {file_format}")
@@ -0,0 +1,60 @@
+"""Stream users for bulk import from CSV or JSON Lines files."""
+import csv
+import json
+from collections.abc import Iterator
+from typing import Any, TextIO
+
+from fastapi_user_management.schemas.role import RoleBase
+from fastapi_user_management.schemas.user import UserImport
+
+IMPORT_FORMATS = ("csv", "jsonl")
+ROLE_SEPARATOR = ";"
+
+
+def _parse_roles(roles: Any) -> list[RoleBase]:
+    if roles is None or roles == "":
+        return []
+    if isinstance(roles, str):
+        roles = roles.split(ROLE_SEPARATOR)
+    return [
+        RoleBase(name=role.strip()) if isinstance(role, str) else RoleBase(**role)
+        for role in roles
+    ]
+
+
+def _parse_record(record: dict[str, Any]) -> UserImport:
+    data = {key: value for key, value in record.items() if value not in ("", None)}
+    data["roles"] = _parse_roles(data.get("roles"))
+    return UserImport(**data)
+
+
+def read_users(stream: TextIO, file_format: str) -> Iterator[UserImport]:
+    """Lazily parse users from a text stream.
+
+    CSV files need a header with `fullname`, `username` and optionally
+    `password`, `password_hash`, `status` and `roles` (separated by `;`).
+    JSON Lines files hold one object per line with the same keys, `roles`
+    may also be a list.
+
+    Args:
+        stream (TextIO): opened file
+        file_format (str): `csv` or `jsonl`
+
+    Raises:
+        ValueError: raise if file format is unknown or the file is malformed.
+
+    Yields:
+        Iterator[UserImport]: parsed users
+    """
+    if file_format == "csv":
+        try:
+            for row in csv.DictReader(stream):
+                yield _parse_record(row)
+        except csv.Error as e:
+            raise ValueError(f"Invalid CSV file: {e}") from e
+    elif file_format == "jsonl":
+        for line in stream:
+            if line.strip():
+                yield _parse_record(json.loads(line))
+    else:
+        raise ValueError(f"Unknown import format: {file_format}")
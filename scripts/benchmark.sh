@@ -0,0 +1,23 @@
+#! /bin/bash
+# Compare benchmarks with the latest stored baseline and fail when a minimum
+# is 50% slower. Minimums over 20 rounds are the steadiest statistic, still
+# they varied by up to ~40% between runs on the single-core machine that
+# recorded the baseline, so smaller thresholds only report noise.
+#
+# The committed baseline in benchmarks/baselines is machine-specific (see its
+# `machine_info`), comparisons on any other machine or CI runner are
+# meaningless. Store a new baseline there first and compare against it.
+#
+#   scripts/benchmark.sh                                  # 10k users
+#   scripts/benchmark.sh --users=10000,100000,1000000     # every size
+#   scripts/benchmark.sh --benchmark-save=baseline        # store a new baseline
+
+python -m pytest benchmarks \
+    --no-cov \
+    --benchmark-storage=benchmarks/baselines \
+    --benchmark-compare \
+    --benchmark-compare-fail=min:50% \
+    --benchmark-min-rounds=20 \
+    --benchmark-group-by=func \
+    --benchmark-columns=min,mean,median,max,rounds \
+    "$@"
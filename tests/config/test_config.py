@@ -0,0 +1,95 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from fastapi_user_management.config import SETTINGS, Settings, get_settings
+from fastapi_user_management.config._config import (
+    PROJECT_SETTINGS_FILE,
+    async_database_uri,
+    default_runtime_dir,
+)
+
+
+@pytest.fixture()
+def settings_file(tmp_path: Path) -> Path:
+    """Copy of project settings with another title."""
+    path = tmp_path / "settings.yaml"
+    path.write_text(
+        PROJECT_SETTINGS_FILE.read_text().replace(
+            f"title: {SETTINGS.TITLE}", "title: Custom Title", 1
+        )
+    )
+    return path
+
+
+@pytest.mark.unit()
+def test_settings_loaded_once() -> None:
+    """Test settings are cached and read from settings file."""
+    assert get_settings() is SETTINGS
+    assert SETTINGS.SETTINGS_FILE is not None
+    assert isinstance(SETTINGS.DATABASE_REPLICA_URIS, list)
+    assert isinstance(SETTINGS.SQLITE_PRAGMAS, dict)
+
+
+@pytest.mark.unit()
+def test_settings_file_override(
+    settings_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test settings file is set by argument or environment."""
+    assert get_settings(str(settings_file)).TITLE == "Custom Title"
+
+    monkeypatch.setenv("SETTINGS_FILE", str(settings_file))
+    monkeypatch.setenv("ACCESS_TOKEN_EXPIRE_MINUTES", "5")
+    settings = Settings()
+    assert settings.TITLE == "Custom Title"
+    assert settings.ACCESS_TOKEN_EXPIRE_MINUTES == 5
+
+
+@pytest.mark.unit()
+def test_settings_loaded_on_first_use() -> None:
+    """Test importing config reads nothing until settings are used."""
+    code = (
+        "import sys, fastapi_user_management.config as config;"
+        "loaded = 'omegaconf' in sys.modules;"
+        "config.SETTINGS;"
+        "print(loaded, 'omegaconf' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.split() == ["False", "True"]
+
+
+@pytest.mark.unit()
+def test_async_database_uri_derived(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test async engines follow database URI unless set explicitly."""
+    monkeypatch.setenv("DATABASE_URI", "postgresql+psycopg2://user@db/users")
+    monkeypatch.setenv("DATABASE_REPLICA_URIS", '["sqlite:///replica.sqlite3"]')
+    settings = Settings()
+    assert settings.ASYNC_DATABASE_URI == "postgresql+asyncpg://user@db/users"
+    assert settings.ASYNC_DATABASE_REPLICA_URIS == [
+        "sqlite+aiosqlite:///replica.sqlite3"
+    ]
+
+    monkeypatch.setenv("ASYNC_DATABASE_URI", "postgresql+psycopg://user@db/users")
+    assert Settings().ASYNC_DATABASE_URI == "postgresql+psycopg://user@db/users"
+
+    with pytest.raises(ValueError):
+        async_database_uri("oracle://user@db")
+
+
+@pytest.mark.unit()
+def test_runtime_paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test lock & cache files live in the runtime directory, not the CWD."""
+    settings = Settings()
+    assert settings.RUNTIME_DIR == default_runtime_dir(settings.DATABASE_URI)
+    assert Path(settings.STARTUP_LOCK_PATH).parent == Path(settings.RUNTIME_DIR)
+    assert Path(settings.CACHE_SQLITE_PATH).is_absolute()
+
+    monkeypatch.setenv("RUNTIME_DIR", str(tmp_path))
+    monkeypatch.setenv("CACHE_SQLITE_PATH", "/var/cache/users.sqlite3")
+    settings = Settings()
+    assert settings.STARTUP_LOCK_PATH == str(tmp_path / "startup.lock")
+    assert settings.CACHE_SQLITE_PATH == "/var/cache/users.sqlite3"
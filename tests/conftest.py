@@ -1,12 +1,19 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
-from fastapi_user_management.app import app
+from fastapi_user_management.app import create_app
+from fastapi_user_management.crud.crud_base import CRUDBase
 from fastapi_user_management.models.base import Base
+from fastapi_user_management.tools.throttle import (
+    get_ip_throttle,
+    get_username_throttle,
+)
 
 
 @pytest.fixture(scope="session")
@@ -24,6 +31,43 @@ def db_session():
     TestSessionLocal.close_all()
 
 
+@pytest.fixture()
+def anyio_backend() -> str:
+    """Run async tests on asyncio only."""
+    return "asyncio"
+
+
+@pytest.fixture()
+async def async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """SQLAlchemy async session instance."""
+    # set up
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    TestAsyncSessionLocal = async_sessionmaker(
+        bind=engine, autoflush=False, expire_on_commit=False
+    )
+    async with TestAsyncSessionLocal() as session:
+        yield session
+
+    # tear down
+    await engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def reset_login_throttle() -> Generator[None, None, None]:
+    """Start every test with no login attempts recorded."""
+    yield
+    get_ip_throttle().clear()
+    get_username_throttle().clear()
+
+
+@pytest.fixture()
+def strict_loading(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Raise on lazy loads of CRUD reads for one test."""
+    monkeypatch.setattr(CRUDBase, "strict_loading", True)
+
+
 @pytest.fixture(scope="session")
 def test_app() -> Generator[TestClient, None, None]:
     """FastAPI App Instance.
@@ -32,7 +76,7 @@ def test_app() -> Generator[TestClient, None, None]:
         Generator[TestClient, None, None]: generated client.
     """
     # set up
-    with TestClient(app) as test_client:
+    with TestClient(create_app()) as test_client:
         # testing
         yield test_client
 
@@ -45,6 +89,15 @@ def valid_credentials() -> dict[str, str]:
     return {"username": "admin@gmail.com", "password": "super-secret"}
 
 
+@pytest.fixture(scope="session")
+def admin_headers(
+    test_app: TestClient, valid_credentials: dict[str, str]
+) -> dict[str, str]:
+    """Authorization header of the startup admin user."""
+    response = test_app.post("/auth/token", data=valid_credentials)
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
 @pytest.fixture(scope="session")
 def invalid_credentials() -> dict[str, str]:
     """Invalid User."""
@@ -1,7 +1,24 @@
+from pathlib import Path
+
 import pytest
-from sqlalchemy.orm import Session
+from sqlalchemy import Engine, create_engine, event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 
-from fastapi_user_management.core.database import get_db
+from fastapi_user_management.config import SETTINGS
+from fastapi_user_management.core.database import (
+    ReplicaRouter,
+    RoutingSession,
+    engine_options,
+    get_async_db,
+    get_async_engine,
+    get_db,
+    get_engine,
+    set_sqlite_pragmas,
+)
+from fastapi_user_management.models.base import Base
+from fastapi_user_management.models.role import RoleModel, RoleNames
 
 
 @pytest.mark.unit()
@@ -17,3 +34,194 @@ def test_db_session() -> None:
     finally:
         # Clean up
         db.close()
+
+
+@pytest.mark.anyio()
+async def test_async_db_session() -> None:
+    """Test async db session created correctly."""
+    # Arrange
+    db_gen = get_async_db()
+    db = await anext(db_gen)
+
+    try:
+        # Act
+        assert isinstance(db, AsyncSession)
+    finally:
+        # Clean up
+        await db_gen.aclose()
+
+
+@pytest.mark.integration()
+def test_sqlite_pragmas(tmp_path: Path) -> None:
+    """Test PRAGMAs are applied on every new connection."""
+    test_engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'test.db'}")
+    set_sqlite_pragmas(
+        test_engine, {"busy_timeout": 1234, "journal_mode": "WAL", "temp_store": 2}
+    )
+
+    with test_engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert connection.exec_driver_sql("PRAGMA busy_timeout").scalar() == 1234
+        assert connection.exec_driver_sql("PRAGMA temp_store").scalar() == 2
+    test_engine.dispose()
+
+
+@pytest.mark.anyio()
+async def test_settings_sqlite_pragmas() -> None:
+    """Test app engines use the PRAGMAs of settings."""
+    with get_engine().connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+        assert (
+            connection.exec_driver_sql("PRAGMA cache_size").scalar()
+            == SETTINGS.SQLITE_PRAGMAS["cache_size"]
+        )
+    async with get_async_engine().connect() as connection:
+        result = await connection.exec_driver_sql("PRAGMA journal_mode")
+        assert result.scalar() == "wal"
+
+
+@pytest.mark.unit()
+def test_engine_options() -> None:
+    """Test pool settings and dialect defaults of engine options."""
+    sqlite_options = engine_options("sqlite+pysqlite:///db.sqlite3")
+    postgres_options = engine_options("postgresql+psycopg://localhost/db")
+    async_options = engine_options("sqlite+aiosqlite:///db.sqlite3", is_async=True)
+
+    assert sqlite_options["connect_args"] == {"check_same_thread": False}
+    assert postgres_options["connect_args"] == {}
+    assert sqlite_options["poolclass"] is QueuePool
+    assert async_options["poolclass"] is AsyncAdaptedQueuePool
+    assert sqlite_options["pool_size"] == SETTINGS.DATABASE_POOL_SIZE
+    assert sqlite_options["pool_pre_ping"] is SETTINGS.DATABASE_POOL_PRE_PING
+    assert get_engine().pool.size() == SETTINGS.DATABASE_POOL_SIZE
+
+
+@pytest.mark.unit()
+def test_engine_options_pool_class(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test non queue pools don't get sizing options and unknown ones fail."""
+    monkeypatch.setattr(SETTINGS, "DATABASE_POOL_CLASS", "null")
+    monkeypatch.setattr(SETTINGS, "DATABASE_CONNECT_ARGS", {"timeout": 10})
+    options = engine_options("sqlite+pysqlite:///db.sqlite3")
+
+    assert options["poolclass"] is NullPool
+    assert "pool_size" not in options
+    assert options["connect_args"] == {"check_same_thread": False, "timeout": 10}
+
+    monkeypatch.setattr(SETTINGS, "DATABASE_POOL_CLASS", "unknown")
+    with pytest.raises(ValueError):
+        engine_options("sqlite+pysqlite:///db.sqlite3")
+
+
+def _sqlite_engine(path: Path, role: str) -> Engine:
+    """File engine with one role row telling databases apart."""
+    new_engine = create_engine(f"sqlite+pysqlite:///{path}")
+    Base.metadata.create_all(new_engine)
+    with Session(new_engine) as session:
+        session.add(RoleModel(name=role))
+        session.commit()
+    return new_engine
+
+
+@pytest.mark.integration()
+def test_routing_session_reads_from_replicas(tmp_path: Path) -> None:
+    """Test SELECTs go round-robin to replicas until the session writes."""
+    primary = _sqlite_engine(tmp_path / "primary.db", RoleNames.ADMIN)
+    replicas = [
+        _sqlite_engine(tmp_path / f"replica-{index}.db", RoleNames.USER)
+        for index in range(2)
+    ]
+    router = ReplicaRouter(primary, replicas)
+    TestSessionLocal = sessionmaker(bind=primary, class_=RoutingSession, router=router)
+
+    with TestSessionLocal() as session:
+        binds = [session.get_bind(clause=select(RoleModel)).engine for _ in range(3)]
+        assert binds == [replicas[0], replicas[1], replicas[0]]
+        assert session.get_bind() is primary
+        assert not session.use_primary
+        assert session.scalar(select(RoleModel.name)) == RoleNames.USER
+
+        session.add(RoleModel(name=RoleNames.USER))
+        session.commit()
+        assert session.scalars(select(RoleModel.name)).all() == [
+            RoleNames.ADMIN,
+            RoleNames.USER,
+        ]
+    with TestSessionLocal() as session:
+        assert session.scalars(select(RoleModel.name)).all() == [RoleNames.USER]
+
+    for replica in replicas:
+        assert replica.pool.checkedout() == 0  # type: ignore[attr-defined]
+    for test_engine in (primary, *replicas):
+        test_engine.dispose()
+
+
+@pytest.mark.integration()
+def test_replica_router_skips_unhealthy_replicas(tmp_path: Path) -> None:
+    """Test reads fall back to primary while the replica can't connect."""
+    now = 0.0
+    primary = _sqlite_engine(tmp_path / "primary.db", RoleNames.ADMIN)
+    replica = create_engine(f"sqlite+pysqlite:///{tmp_path / 'missing' / 'r.db'}")
+    router = ReplicaRouter(primary, [replica], retry_seconds=10, timer=lambda: now)
+
+    TestSessionLocal = sessionmaker(bind=primary, class_=RoutingSession, router=router)
+    with TestSessionLocal() as session:
+        assert session.scalar(select(RoleModel.name)) == RoleNames.ADMIN
+        assert router.read_engine() is primary
+        assert not session.use_primary
+
+    now = 10.0
+    assert router.read_engine() is replica
+    primary.dispose()
+
+
+@pytest.mark.integration()
+def test_routing_session_retries_lost_replica_on_primary(tmp_path: Path) -> None:
+    """Test a read losing its replica connection is retried on primary."""
+    primary = _sqlite_engine(tmp_path / "primary.db", RoleNames.ADMIN)
+    replica = _sqlite_engine(tmp_path / "replica.db", RoleNames.USER)
+    router = ReplicaRouter(primary, [replica])
+    TestSessionLocal = sessionmaker(bind=primary, class_=RoutingSession, router=router)
+
+    with TestSessionLocal() as session:
+        assert session.scalar(select(RoleModel.name)) == RoleNames.USER
+
+        # replica losing its data, errors are reported as disconnects.
+        with replica.begin() as connection:
+            connection.execute(text("DROP TABLE role"))
+        event.listen(
+            replica,
+            "handle_error",
+            lambda context: setattr(context, "is_disconnect", True),
+        )
+        assert session.scalar(select(RoleModel.name)) == RoleNames.ADMIN
+        assert router.read_engine() is primary
+
+        session.add(RoleModel(name=RoleNames.USER))
+        session.commit()
+
+    # replica connections are released with the session transaction.
+    assert replica.pool.checkedout() == 0  # type: ignore[attr-defined]
+    for test_engine in (primary, replica):
+        test_engine.dispose()
+
+
+@pytest.mark.anyio()
+async def test_async_routing_session(tmp_path: Path) -> None:
+    """Test async sessions route their sync session."""
+    primary = _sqlite_engine(tmp_path / "primary.db", RoleNames.ADMIN)
+    replica = _sqlite_engine(tmp_path / "replica.db", RoleNames.USER)
+    async_primary = create_async_engine(f"sqlite+aiosqlite:///{primary.url.database}")
+    async_replica = create_async_engine(f"sqlite+aiosqlite:///{replica.url.database}")
+    TestAsyncSessionLocal = async_sessionmaker(
+        bind=async_primary,
+        sync_session_class=RoutingSession,
+        router=ReplicaRouter(async_primary.sync_engine, [async_replica.sync_engine]),
+    )
+
+    async with TestAsyncSessionLocal() as session:
+        assert await session.scalar(select(RoleModel.name)) == RoleNames.USER
+
+    for async_test_engine in (async_primary, async_replica):
+        await async_test_engine.dispose()
+    primary.dispose()
+    replica.dispose()
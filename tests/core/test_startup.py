@@ -0,0 +1,95 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import Engine, create_engine, text
+
+from fastapi_user_management.core.startup import (
+    SchemaState,
+    StartupTimings,
+    prepare_schema,
+    startup_lock,
+)
+from fastapi_user_management.models.base import Base
+
+
+@pytest.fixture()
+def sqlite_engine(tmp_path: Path) -> Engine:
+    """Engine of an empty database file."""
+    return create_engine(f"sqlite:///{tmp_path / 'startup.db'}")
+
+
+def _revision(engine: Engine) -> str | None:
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+@pytest.mark.integration()
+def test_prepare_schema_skips_create_all_at_head(
+    sqlite_engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test empty database is created & stamped, then left as is."""
+    assert prepare_schema(sqlite_engine) == SchemaState.CREATED
+    assert _revision(sqlite_engine) is not None
+
+    def fail_create_all(*args: object, **kwargs: object) -> None:
+        raise AssertionError("create_all called at head")
+
+    monkeypatch.setattr(Base.metadata, "create_all", fail_create_all)
+    assert prepare_schema(sqlite_engine) == SchemaState.CURRENT
+
+
+@pytest.mark.integration()
+def test_prepare_schema_unversioned(sqlite_engine: Engine) -> None:
+    """Test tables without alembic version are completed but not stamped."""
+    Base.metadata.tables["role"].create(sqlite_engine)
+
+    assert prepare_schema(sqlite_engine) == SchemaState.UNVERSIONED
+    assert _revision(sqlite_engine) is None
+    with sqlite_engine.connect() as connection:
+        connection.execute(text("SELECT id FROM refresh_token"))
+
+
+@pytest.mark.integration()
+def test_prepare_schema_behind(sqlite_engine: Engine) -> None:
+    """Test database at an older revision is left to migrations."""
+    with sqlite_engine.begin() as connection:
+        MigrationContext.configure(connection)._ensure_version_table()
+        connection.execute(text("INSERT INTO alembic_version VALUES ('a3afeda948e8')"))
+
+    assert prepare_schema(sqlite_engine) == SchemaState.BEHIND
+    assert _revision(sqlite_engine) == "a3afeda948e8"
+
+
+@pytest.mark.unit()
+def test_startup_lock_serializes(sqlite_engine: Engine, tmp_path: Path) -> None:
+    """Test a second holder waits until the lock is released."""
+    path = str(tmp_path / "startup.lock")
+    acquired = threading.Event()
+
+    def other_worker() -> None:
+        with startup_lock(sqlite_engine, path):
+            acquired.set()
+
+    with startup_lock(sqlite_engine, path):
+        thread = threading.Thread(target=other_worker)
+        thread.start()
+        assert not acquired.wait(0.2)
+    assert acquired.wait(2)
+    thread.join()
+
+
+@pytest.mark.unit()
+def test_startup_timings() -> None:
+    """Test phases are timed even when they fail."""
+    timings = StartupTimings()
+    with timings.phase("ok"):
+        time.sleep(0.01)
+    with pytest.raises(RuntimeError), timings.phase("failed"):
+        raise RuntimeError
+
+    assert timings.phases["ok"] >= 0.01
+    assert "failed" in timings.phases
+    timings.report()
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_user_management import crud
+from fastapi_user_management.models.refresh_token import RefreshTokenModel
+from fastapi_user_management.models.user import UserModel
+from fastapi_user_management.schemas.role import RoleBase
+from fastapi_user_management.schemas.user import UserCreate
+
+
+@pytest.fixture()
+async def user(async_db_session: AsyncSession) -> UserModel:
+    """Persisted user owning refresh tokens."""
+    return await crud.user.create_async(
+        db=async_db_session,
+        obj_in=UserCreate(
+            fullname="Refresh User",
+            username="refresh-user@mail.com",
+            password="password",
+            roles=[RoleBase(name="user")],
+        ),
+    )
+
+
+async def _count(db: AsyncSession) -> int:
+    return int(await db.scalar(select(func.count()).select_from(RefreshTokenModel)))
+
+
+@pytest.mark.anyio()
+async def test_rotate_refresh_token(
+    async_db_session: AsyncSession, user: UserModel
+) -> None:
+    """Test refresh token is exchanged once for a new one."""
+    token = await crud.refresh_token.issue_async(async_db_session, user=user)
+
+    rotated = await crud.refresh_token.rotate_async(async_db_session, token=token)
+
+    assert rotated is not None
+    rotated_user, new_token = rotated
+    assert rotated_user.id == user.id
+    assert new_token != token
+    stored = await async_db_session.scalar(
+        select(RefreshTokenModel.token_hash).where(RefreshTokenModel.used.is_(False))
+    )
+    assert stored is not None
+    assert new_token.encode() not in stored
+
+
+@pytest.mark.anyio()
+async def test_reused_refresh_token_revokes_family(
+    async_db_session: AsyncSession, user: UserModel
+) -> None:
+    """Test presenting a rotated token revokes every token of its login."""
+    other_login = await crud.refresh_token.issue_async(async_db_session, user=user)
+    token = await crud.refresh_token.issue_async(async_db_session, user=user)
+    rotated = await crud.refresh_token.rotate_async(async_db_session, token=token)
+    assert rotated is not None
+
+    assert await crud.refresh_token.rotate_async(async_db_session, token=token) is None
+    assert (
+        await crud.refresh_token.rotate_async(async_db_session, token=rotated[1])
+        is None
+    )
+    assert await crud.refresh_token.rotate_async(async_db_session, token=other_login)
+
+
+@pytest.mark.anyio()
+async def test_refresh_token_rejected_after_security_change(
+    async_db_session: AsyncSession, user: UserModel
+) -> None:
+    """Test unknown tokens and tokens older than user security version fail."""
+    token = await crud.refresh_token.issue_async(async_db_session, user=user)
+    assert await crud.refresh_token.rotate_async(async_db_session, token="x") is None
+
+    await async_db_session.execute(
+        update(UserModel)
+        .where(UserModel.id == user.id)
+        .values(security_version=UserModel.security_version + 1)
+    )
+    await async_db_session.commit()
+
+    assert await crud.refresh_token.rotate_async(async_db_session, token=token) is None
+
+
+@pytest.mark.anyio()
+async def test_purge_expired_refresh_tokens(
+    async_db_session: AsyncSession, user: UserModel
+) -> None:
+    """Test expired tokens are rejected and purged."""
+    token = await crud.refresh_token.issue_async(async_db_session, user=user)
+    await crud.refresh_token.issue_async(async_db_session, user=user)
+    await crud.refresh_token.issue_async(async_db_session, user=user)
+    await async_db_session.execute(
+        update(RefreshTokenModel)
+        .where(RefreshTokenModel.id.in_([1, 2]))
+        .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+    )
+    await async_db_session.commit()
+
+    assert await crud.refresh_token.rotate_async(async_db_session, token=token) is None
+    assert (
+        await crud.refresh_token.purge_expired_async(async_db_session, batch_size=1)
+        == 2
+    )
+    assert await _count(async_db_session) == 1
@@ -0,0 +1,102 @@
+from typing import Any
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from fastapi_user_management import crud
+from fastapi_user_management.crud.crud_role import RoleRegistry
+from fastapi_user_management.models.role import RoleNames
+from fastapi_user_management.schemas.role import RoleBase
+
+
+@pytest.mark.integration()
+def test_role_registry_load(db_session: Session) -> None:
+    """Tests that registry loads every role of the database."""
+    role_obj = RoleBase(name=RoleNames.ADMIN)
+    admin_role = crud.role.get_registered(
+        db=db_session, role_obj=role_obj
+    ) or crud.role.create(db=db_session, obj_in=role_obj)
+    registry = RoleRegistry()
+
+    assert registry.get_id(db_session, RoleNames.ADMIN) is None
+    registry.load(db_session)
+    assert registry.get_id(db_session, RoleNames.ADMIN) == admin_role.id
+    assert registry.get_id(db_session, None) is None
+    registry.clear()
+    assert registry.get_id(db_session, RoleNames.ADMIN) is None
+
+
+@pytest.mark.integration()
+def test_get_registered_role_without_query(db_session: Session) -> None:
+    """Tests that registered roles are resolved without SQL."""
+    role_obj = RoleBase(name=RoleNames.USER)
+    role = crud.role.get_registered(
+        db=db_session, role_obj=role_obj
+    ) or crud.role.create(db=db_session, obj_in=role_obj)
+    statements: list[str] = []
+
+    def count_statement(*args: Any) -> None:
+        statements.append(args[2])
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        registered_role = crud.role.get_registered(db=db_session, role_obj=role_obj)
+        role_id = crud.role.get_registered_id(db=db_session, name=RoleNames.USER)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+    assert registered_role is not None
+    assert registered_role.id == role.id
+    assert role_id == role.id
+    assert statements == []
+
+
+@pytest.mark.anyio()
+async def test_role_registry_refreshed_on_create(
+    async_db_session: AsyncSession,
+) -> None:
+    """Tests that created roles are registered and engines don't share ids."""
+    sync_session = async_db_session.sync_session
+    assert crud.role.registry.get_id(sync_session, RoleNames.ADMIN) is None
+    assert (
+        await crud.role.get_registered_id_async(async_db_session, name=RoleNames.ADMIN)
+        is None
+    )
+
+    role = await crud.role.create_async(
+        db=async_db_session, obj_in=RoleBase(name=RoleNames.ADMIN)
+    )
+
+    assert crud.role.registry.get_id(sync_session, RoleNames.ADMIN) == role.id
+    registered_role = await crud.role.get_registered_async(
+        db=async_db_session, role_obj=RoleBase(name=RoleNames.ADMIN)
+    )
+    assert registered_role is role
+
+
+@pytest.mark.anyio()
+async def test_role_registry_forgets_removed_role(
+    async_db_session: AsyncSession,
+) -> None:
+    """Tests that removed roles aren't resolved from the registry."""
+    for role_name in RoleNames:
+        role = await crud.role.create_async(
+            db=async_db_session, obj_in=RoleBase(name=role_name)
+        )
+        sync_session = async_db_session.sync_session
+        assert crud.role.registry.get_id(sync_session, role_name) == role.id
+
+        if role_name == RoleNames.ADMIN:
+            await crud.role.remove_async(db=async_db_session, id=role.id)
+        else:
+            await async_db_session.run_sync(
+                lambda session, role_id=role.id: crud.role.remove(session, id=role_id)
+            )
+
+        assert crud.role.registry.get_id(sync_session, role_name) is None
+        assert (
+            await crud.role.get_registered_id_async(async_db_session, name=role_name)
+            is None
+        )
@@ -1,15 +1,33 @@
-from typing import TypedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypedDict
 
 import pytest
 from mimesis import Person
 from mimesis.locales import Locale
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError, InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from fastapi_user_management import crud
-from fastapi_user_management.errors.exceptions import PasswordMatchError
+from fastapi_user_management.errors.exceptions import (
+    PasswordMatchError,
+    UserImportError,
+)
+from fastapi_user_management.models.user_role import UserRoleModel
 from fastapi_user_management.schemas.role import RoleBase
-from fastapi_user_management.schemas.user import UserCreate, UserUpdate
-from fastapi_user_management.tools.encryption import verify_password
+from fastapi_user_management.schemas.user import (
+    UserCreate,
+    UserImport,
+    UserRead,
+    UserUpdate,
+)
+from fastapi_user_management.tools.cache import get_principal_cache
+from fastapi_user_management.tools.encryption import (
+    build_crypt_context,
+    get_password_hash,
+    verify_password,
+)
 
 
 class SampleUserStub(TypedDict):
@@ -202,3 +220,496 @@ def test_create_new_user_with_invalid_email_format(db_session: Session) -> None:
     }
     with pytest.raises(Exception):  # noqa: B017
         crud.user.create(db=db_session, obj_in=UserCreate(**user_data))
+
+
+@pytest.mark.anyio()
+async def test_create_new_user_async(
+    async_db_session: AsyncSession, sample_user: SampleUserStub
+) -> None:
+    """Test to create new user with async session."""
+    user = await crud.user.create_async(
+        db=async_db_session,
+        obj_in=UserCreate(**sample_user),
+    )
+    assert user is not None
+    assert user.fullname == sample_user["fullname"]
+    assert user.username == sample_user["username"]
+    assert user.roles[0].name == "user"
+
+
+@pytest.mark.anyio()
+async def test_get_by_username_async(
+    async_db_session: AsyncSession, sample_user: SampleUserStub
+) -> None:
+    """Tests that a user can be loaded by username with async session."""
+    await crud.user.create_async(
+        db=async_db_session,
+        obj_in=UserCreate(**sample_user),
+    )
+    user = await crud.user.get_by_username_async(
+        db=async_db_session, username=sample_user["username"]
+    )
+    missing_user = await crud.user.get_by_username_async(
+        db=async_db_session, username="missing@mail.com"
+    )
+    assert user is not None
+    assert user.username == sample_user["username"]
+    assert missing_user is None
+
+
+@pytest.mark.anyio()
+async def test_update_user_info_async(
+    async_db_session: AsyncSession, sample_user: SampleUserStub
+) -> None:
+    """Tests that user password can be updated with async session."""
+    user = await crud.user.create_async(
+        db=async_db_session,
+        obj_in=UserCreate(**sample_user),
+    )
+    with pytest.raises(PasswordMatchError):
+        await crud.user.update_async(
+            db=async_db_session,
+            db_obj=user,
+            obj_in={"new_password": "newpassword123", "new_password_confirm": "no"},
+        )
+    updated_user = await crud.user.update_async(
+        db=async_db_session,
+        db_obj=user,
+        obj_in=UserUpdate(
+            new_password="newpassword123", new_password_confirm="newpassword123"
+        ),
+    )
+    assert verify_password(
+        plain_password="newpassword123", hashed_password=updated_user.password
+    )
+
+
+@pytest.mark.anyio()
+async def test_authenticate_user_async(
+    async_db_session: AsyncSession, sample_user: SampleUserStub
+) -> None:
+    """Tests authentication with async session."""
+    await crud.user.create_async(
+        db=async_db_session,
+        obj_in=UserCreate(**sample_user),
+    )
+    authenticated_user = await crud.user.authenticate_async(
+        db=async_db_session,
+        username=sample_user["username"],
+        password=sample_user["password"],
+    )
+    invalid_user = await crud.user.authenticate_async(
+        db=async_db_session,
+        username=sample_user["username"],
+        password="password",
+    )
+    assert authenticated_user is not None
+    assert authenticated_user.username == sample_user["username"]
+    assert invalid_user is None
+
+
+@pytest.mark.anyio()
+async def test_get_user_record_role_async(
+    async_db_session: AsyncSession, sample_user: SampleUserStub
+) -> None:
+    """Tests that for `is_admin_async` in `crud.user`."""
+    sample_user["roles"].append(RoleBase(name="admin"))
+    new_user = await crud.user.create_async(
+        db=async_db_session,
+        obj_in=UserCreate(**sample_user),
+    )
+    user = await crud.user.get_by_username_async(
+        db=async_db_session, username=sample_user["username"]
+    )
+    assert await crud.user.is_admin_async(db=async_db_session, db_obj=new_user)
+    assert await crud.user.is_admin_async(db=async_db_session, db_obj=user)
+
+
+@pytest.mark.anyio()
+async def test_remove_user_by_username_async(
+    async_db_session: AsyncSession, sample_user: SampleUserStub
+) -> None:
+    """Tests that a user can be removed by username with async session."""
+    await crud.user.create_async(
+        db=async_db_session,
+        obj_in=UserCreate(**sample_user),
+    )
+    removed_user = await crud.user.remove_by_username_async(
+        db=async_db_session, username=sample_user["username"]
+    )
+    assert removed_user.username == sample_user["username"]
+    assert (
+        await crud.user.get_by_username_async(
+            db=async_db_session, username=sample_user["username"]
+        )
+        is None
+    )
+
+
+@pytest.mark.anyio()
+async def test_get_principal_async_is_cached(
+    async_db_session: AsyncSession, sample_user: SampleUserStub
+) -> None:
+    """Tests that user view is served from cache after first load."""
+    await crud.user.create_async(
+        db=async_db_session,
+        obj_in=UserCreate(**sample_user),
+    )
+    principal = await crud.user.get_principal_async(
+        db=async_db_session, username=sample_user["username"]
+    )
+    assert principal is not None
+    assert principal.username == sample_user["username"]
+    assert principal.roles == ("user",)
+    assert get_principal_cache().get(sample_user["username"]) is principal
+    assert (
+        await crud.user.get_principal_async(
+            db=async_db_session, username=sample_user["username"]
+        )
+        is principal
+    )
+    assert (
+        await crud.user.get_principal_async(
+            db=async_db_session, username="missing@mail.com"
+        )
+        is None
+    )
+
+
+@pytest.mark.anyio()
+async def test_principal_cache_invalidated_on_update_and_remove(
+    async_db_session: AsyncSession, sample_user: SampleUserStub
+) -> None:
+    """Tests that writes drop the cached user view."""
+    user = await crud.user.create_async(
+        db=async_db_session,
+        obj_in=UserCreate(**sample_user),
+    )
+    await crud.user.get_principal_async(
+        db=async_db_session, username=sample_user["username"]
+    )
+    await crud.user.update_async(
+        db=async_db_session,
+        db_obj=user,
+        obj_in={
+            "new_password": "newpassword123",
+            "new_password_confirm": "newpassword123",
+        },
+    )
+    assert get_principal_cache().get(sample_user["username"]) is None
+
+    await crud.user.get_principal_async(
+        db=async_db_session, username=sample_user["username"]
+    )
+    await crud.user.remove_by_username_async(
+        db=async_db_session, username=sample_user["username"]
+    )
+    assert get_principal_cache().get(sample_user["username"]) is None
+    assert (
+        await crud.user.get_principal_async(
+            db=async_db_session, username=sample_user["username"]
+        )
+        is None
+    )
+
+
+@pytest.mark.anyio()
+async def test_principal_cache_invalidated_on_rename(
+    async_db_session: AsyncSession, sample_user: SampleUserStub
+) -> None:
+    """Tests that renaming a user drops the view cached under its old name."""
+    user = await crud.user.create_async(
+        db=async_db_session,
+        obj_in=UserCreate(**sample_user),
+    )
+    old_username = sample_user["username"]
+    await crud.user.get_principal_async(db=async_db_session, username=old_username)
+    assert get_principal_cache().get(old_username) is not None
+
+    await crud.user.update_async(
+        db=async_db_session,
+        db_obj=user,
+        obj_in={
+            "username": f"renamed-{old_username}",
+            "new_password": "newpassword123",
+            "new_password_confirm": "newpassword123",
+        },
+    )
+
+    assert get_principal_cache().get(old_username) is None
+    assert (
+        await crud.user.get_principal_async(db=async_db_session, username=old_username)
+        is None
+    )
+
+
+def test_create_many_users(db_session: Session) -> None:
+    """Tests bulk creation with parallel hashing and legacy hashes."""
+    person = Person(Locale.EN)
+    legacy_hash = get_password_hash("legacy-password")
+    users = [
+        UserImport(
+            fullname=person.full_name(),
+            username=person.email(unique=True),
+            password=f"password-{index}",
+            roles=[RoleBase(name="user"), RoleBase(name="user")],
+        )
+        for index in range(4)
+    ]
+    users.append(
+        UserImport(
+            fullname=person.full_name(),
+            username=person.email(unique=True),
+            password_hash=legacy_hash,
+            roles=[RoleBase(name="admin"), RoleBase(name="user")],
+        )
+    )
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        created = crud.user.create_many(
+            db_session, objs_in=iter(users), batch_size=2, executor=executor
+        )
+
+    assert created == 5
+    first_user = crud.user.get_by_username(db_session, username=users[0].username)
+    assert [role.name for role in first_user.roles] == ["user"]
+    assert verify_password("password-0", first_user.password)
+    legacy_user = crud.user.get_by_username(db_session, username=users[-1].username)
+    assert legacy_user.password == legacy_hash
+    assert crud.user.is_admin(db=db_session, db_obj=legacy_user)
+
+
+def test_create_many_users_with_unknown_hash(db_session: Session) -> None:
+    """Tests bulk creation rejects unrecognized password hashes."""
+    person = Person(Locale.EN)
+    user = UserImport(
+        fullname=person.full_name(),
+        username=person.email(unique=True),
+        password_hash="not-a-hash",
+        roles=[RoleBase(name="user")],
+    )
+    with pytest.raises(UserImportError) as exc_info:
+        crud.user.create_many(db_session, objs_in=[user])
+    assert exc_info.value.created == 0
+    assert isinstance(exc_info.value.__cause__, ValueError)
+    assert crud.user.get_by_username(db_session, username=user.username) is None
+
+
+def test_create_many_users_reports_partial_import(db_session: Session) -> None:
+    """Tests a failing batch reports users created by committed batches."""
+    person = Person(Locale.EN)
+    users = [
+        UserImport(
+            fullname=person.full_name(),
+            username=person.email(unique=True),
+            password_hash=get_password_hash("password"),
+            roles=[RoleBase(name="user")],
+        )
+        for _ in range(2)
+    ]
+    users.append(users[0])
+
+    with pytest.raises(UserImportError) as exc_info:
+        crud.user.create_many(db_session, objs_in=users, batch_size=2)
+
+    assert exc_info.value.created == 2
+    assert isinstance(exc_info.value.__cause__, IntegrityError)
+    assert crud.user.get_by_username(db_session, username=users[1].username)
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize("order_by", ["id", "created_at"])
+async def test_get_page_async(async_db_session: AsyncSession, order_by: str) -> None:
+    """Tests keyset pagination walks every user exactly once."""
+    person = Person(Locale.EN)
+    for _ in range(5):
+        await crud.user.create_async(
+            db=async_db_session,
+            obj_in=UserCreate(
+                fullname=person.full_name(),
+                username=person.email(unique=True),
+                password="password",
+                roles=[RoleBase(name="user")],
+            ),
+        )
+
+    usernames: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        page = await crud.user.get_page_async(
+            async_db_session, cursor=cursor, limit=2, order_by=order_by
+        )
+        usernames.extend(user.username for user in page.items)
+        pages += 1
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    all_users = await crud.user.get_multi_async(async_db_session)
+    assert pages == 3
+    assert usernames == [user.username for user in all_users]
+
+
+def test_get_page_invalid_order_by(db_session: Session) -> None:
+    """Tests that only keyset columns can be used for ordering."""
+    with pytest.raises(ValueError):
+        crud.user.get_page(db_session, order_by="password")
+    assert crud.user.get_page(db_session, limit=1).items
+
+
+@pytest.mark.anyio()
+async def test_iter_partitions_async(async_db_session: AsyncSession) -> None:
+    """Tests users are streamed in partitions and released from session."""
+    person = Person(Locale.EN)
+    users = [
+        UserImport(
+            fullname=person.full_name(),
+            username=person.email(unique=True),
+            password_hash=get_password_hash("password"),
+            roles=[],
+        )
+        for _ in range(5)
+    ]
+    await async_db_session.run_sync(
+        lambda session: crud.user.create_many(session, objs_in=users)
+    )
+
+    partitions = []
+    async for partition in crud.user.iter_partitions_async(
+        async_db_session, batch_size=2
+    ):
+        partitions.append([user.username for user in partition])
+
+    assert [len(partition) for partition in partitions] == [2, 2, 1]
+    assert sum(partitions, []) == [user.username for user in users]
+    assert len(async_db_session.identity_map) == 0
+
+
+@pytest.mark.integration()
+@pytest.mark.usefixtures("strict_loading")
+def test_get_by_username_loads_roles_eagerly(
+    db_session: Session, sample_user: SampleUserStub
+) -> None:
+    """Tests roles are loaded with the user, so `is_admin` doesn't lazy load."""
+    crud.user.create(db=db_session, obj_in=UserCreate(**sample_user))
+    db_session.expunge_all()
+
+    user = crud.user.get_by_username(db_session, username=sample_user["username"])
+
+    assert [role.name for role in user.roles] == ["user"]
+    assert crud.user.is_admin(db_session, db_obj=user) is False
+
+
+@pytest.mark.integration()
+@pytest.mark.usefixtures("strict_loading")
+def test_strict_loading_raises_on_lazy_load(
+    db_session: Session, sample_user: SampleUserStub
+) -> None:
+    """Tests strict mode fails on roles which weren't loaded up front."""
+    crud.user.create(db=db_session, obj_in=UserCreate(**sample_user))
+    db_session.expunge_all()
+
+    user = crud.user.get_by_username(
+        db_session, username=sample_user["username"], options=[]
+    )
+
+    with pytest.raises(InvalidRequestError):
+        _ = user.roles
+    db_session.expunge_all()
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("strict_loading")
+async def test_get_page_async_loads_roles_in_one_query(
+    async_db_session: AsyncSession,
+) -> None:
+    """Tests listing users loads roles with one extra query per page."""
+    person = Person(Locale.EN)
+    for _ in range(4):
+        await crud.user.create_async(
+            db=async_db_session,
+            obj_in=UserCreate(
+                fullname=person.full_name(),
+                username=person.email(unique=True),
+                password="password",
+                roles=[RoleBase(name="user")],
+            ),
+        )
+    async_db_session.expunge_all()
+    statements: list[str] = []
+
+    def count_statement(*args: Any) -> None:
+        statements.append(args[2])
+
+    engine = async_db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        page = await crud.user.get_page_async(async_db_session, limit=10)
+        users = [UserRead.model_validate(user) for user in page.items]
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    assert len(users) == 4
+    assert all([role.name for role in user.roles] == ["user"] for user in users)
+    assert len(statements) == 2
+
+
+@pytest.mark.integration()
+def test_create_user_with_duplicated_roles(
+    db_session: Session, sample_user: SampleUserStub
+) -> None:
+    """Tests a role is linked once and duplicated links are rejected."""
+    sample_user["roles"] = [RoleBase(name="user"), RoleBase(name="user")]
+    user = crud.user.create(db=db_session, obj_in=UserCreate(**sample_user))
+    assert [role.name for role in user.roles] == ["user"]
+
+    db_session.add(UserRoleModel(user_id=user.id, role_id=user.roles[0].id))
+    with pytest.raises(IntegrityError):
+        db_session.commit()
+    db_session.rollback()
+
+
+def test_authenticate_rehashes_outdated_password(
+    db_session: Session, sample_user: SampleUserStub
+) -> None:
+    """Tests that a hash with outdated cost is replaced on login."""
+    new_user = crud.user.create(db=db_session, obj_in=UserCreate(**sample_user))
+    new_user.password = build_crypt_context(bcrypt_rounds=4).hash(
+        sample_user["password"]
+    )
+    db_session.commit()
+
+    authenticated_user = crud.user.authenticate(
+        db=db_session,
+        username=sample_user["username"],
+        password=sample_user["password"],
+    )
+
+    assert authenticated_user is not None
+    assert authenticated_user.password.startswith("$2b$12$")
+    assert verify_password(sample_user["password"], authenticated_user.password)
+
+
+@pytest.mark.anyio()
+async def test_authenticate_async_rehashes_outdated_password(
+    async_db_session: AsyncSession, sample_user: SampleUserStub
+) -> None:
+    """Tests that a hash with outdated cost is replaced on async login."""
+    new_user = await crud.user.create_async(
+        db=async_db_session, obj_in=UserCreate(**sample_user)
+    )
+    new_user.password = build_crypt_context(bcrypt_rounds=4).hash(
+        sample_user["password"]
+    )
+    await async_db_session.commit()
+
+    authenticated_user = await crud.user.authenticate_async(
+        db=async_db_session,
+        username=sample_user["username"],
+        password=sample_user["password"],
+    )
+
+    assert authenticated_user is not None
+    assert authenticated_user.password.startswith("$2b$12$")
+    assert authenticated_user.security_version == new_user.security_version
@@ -1,6 +1,9 @@
 import pytest
 
-from fastapi_user_management.errors.exceptions import PasswordMatchError
+from fastapi_user_management.errors.exceptions import (
+    HashingQueueFullError,
+    PasswordMatchError,
+)
 
 
 @pytest.mark.unit()
@@ -16,3 +19,10 @@ def test_password_error_custom_message() -> None:
     error_msg: str = "Error Message!"
     error = PasswordMatchError(message=error_msg)
     assert str(error) == error_msg
+
+
+@pytest.mark.unit()
+def test_hashing_queue_full_error_default_message() -> None:
+    """Test HashingQueueFullError default massage."""
+    error = HashingQueueFullError()
+    assert str(error) == "Too many password hashing requests!"
@@ -1,5 +1,31 @@
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_user_management import crud
+from fastapi_user_management.config import SETTINGS
+from fastapi_user_management.models.role import RoleNames
+from fastapi_user_management.models.user import UserStatusValues
+from fastapi_user_management.routes.auth import (
+    get_current_active_user,
+    get_current_user,
+    get_current_user_from_claims,
+)
+from fastapi_user_management.schemas.role import RoleBase
+from fastapi_user_management.schemas.user import UserCreate, UserPrincipal
+from fastapi_user_management.tools.cache import get_security_version_cache
+from fastapi_user_management.tools.hashing import get_hashing_service
+from fastapi_user_management.tools.throttle import (
+    get_ip_throttle,
+    get_username_throttle,
+)
+from fastapi_user_management.tools.token import (
+    create_access_token,
+    create_user_claims,
+    decode_access_token,
+)
 
 
 @pytest.mark.integration()
@@ -11,6 +37,7 @@ def test_login_for_access_token_success(
     assert response.status_code == 200
     data = response.json()
     assert "access_token" in data
+    assert "refresh_token" in data
     assert "token_type" in data
     assert data["token_type"] == "bearer"
     assert isinstance(data["access_token"], str)
@@ -39,3 +66,218 @@ def test_login_for_access_token_missing_credentials(
     assert response.status_code == 422
     data = response.json()
     assert "detail" in data
+
+
+@pytest.mark.integration()
+def test_login_for_access_token_hashing_saturated(
+    test_app: TestClient, valid_credentials: dict[str, str], mocker: MockerFixture
+) -> None:
+    """Test login is rejected with 503 when password hashing is saturated."""
+    mocker.patch.object(get_hashing_service(), "max_in_flight", 0)
+    response = test_app.post("/auth/token", data=valid_credentials)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+@pytest.mark.integration()
+def test_refresh_access_token(
+    test_app: TestClient, valid_credentials: dict[str, str]
+) -> None:
+    """Test refresh token is rotated and reusing it revokes its login."""
+    tokens = test_app.post("/auth/token", data=valid_credentials).json()
+
+    response = test_app.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 200
+    refreshed = response.json()
+    assert refreshed["refresh_token"] != tokens["refresh_token"]
+    me = test_app.get(
+        "/users/me",
+        headers={"Authorization": f"Bearer {refreshed['access_token']}"},
+    )
+    assert me.json()["username"] == valid_credentials["username"]
+
+    for refresh_token in (tokens["refresh_token"], refreshed["refresh_token"]):
+        response = test_app.post("/auth/refresh", json={"refresh_token": refresh_token})
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Invalid refresh token"
+
+
+@pytest.mark.integration()
+def test_logout_revokes_access_token(
+    test_app: TestClient, valid_credentials: dict[str, str]
+) -> None:
+    """Test revoked access token is rejected before its expiry."""
+    access_token = test_app.post("/auth/token", data=valid_credentials).json()[
+        "access_token"
+    ]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    assert decode_access_token(access_token)["jti"]
+
+    assert test_app.post("/auth/logout", headers=headers).status_code == 204
+    assert test_app.get("/users/me", headers=headers).status_code == 401
+    assert test_app.post("/auth/logout", headers=headers).status_code == 401
+
+
+@pytest.mark.integration()
+def test_login_for_access_token_throttled(
+    test_app: TestClient, invalid_credentials: dict[str, str], mocker: MockerFixture
+) -> None:
+    """Test locked out username is rejected with 429 before authentication."""
+    mocker.patch.object(get_username_throttle(), "max_failures", 2)
+    for _ in range(2):
+        assert test_app.post("/auth/token", data=invalid_credentials).status_code == 401
+
+    authenticate = mocker.spy(crud.user, "authenticate_async")
+    response = test_app.post(
+        "/auth/token",
+        data={**invalid_credentials, "username": "ADMIN@gmail.com"},
+    )
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+    authenticate.assert_not_called()
+
+
+@pytest.mark.integration()
+def test_login_for_access_token_success_resets_throttle(
+    test_app: TestClient,
+    valid_credentials: dict[str, str],
+    invalid_credentials: dict[str, str],
+) -> None:
+    """Test successful login resets failures of username & client IP."""
+    test_app.post("/auth/token", data=invalid_credentials)
+    assert test_app.post("/auth/token", data=valid_credentials).status_code == 200
+
+    assert get_username_throttle()._states["admin@gmail.com"].failures == 0
+    assert get_ip_throttle()._states["testclient"].failures == 0
+
+
+@pytest.mark.anyio()
+async def test_get_current_user_from_token(async_db_session: AsyncSession) -> None:
+    """Test current user is resolved from token subject."""
+    user_in = UserCreate(
+        fullname="John Doe",
+        username="current-user@mail.com",
+        password="password",
+        status=UserStatusValues.ACTIVE,
+        roles=[RoleBase(name=RoleNames.USER)],
+    )
+    await crud.user.create_async(db=async_db_session, obj_in=user_in)
+    token = create_access_token(data={"sub": user_in.username})
+
+    current_user = await get_current_user(token=token, db=async_db_session)
+    active_user = await get_current_active_user(current_user=current_user)
+
+    assert isinstance(current_user, UserPrincipal)
+    assert active_user.username == user_in.username
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(token="invalid-token", db=async_db_session)
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.integration()
+def test_login_for_access_token_stateless_claims(
+    test_app: TestClient, valid_credentials: dict[str, str], mocker: MockerFixture
+) -> None:
+    """Test stateless mode embeds status, roles and version in token."""
+    mocker.patch.object(SETTINGS, "STATELESS_AUTH", True)
+    response = test_app.post("/auth/token", data=valid_credentials)
+    assert response.status_code == 200
+    claims = decode_access_token(response.json()["access_token"])
+    assert claims["sub"] == valid_credentials["username"]
+    assert claims["status"] == "active"
+    assert claims["roles"] == ["admin"]
+    assert isinstance(claims["ver"], int)
+
+
+@pytest.mark.anyio()
+async def test_get_current_user_from_claims(
+    async_db_session: AsyncSession, mocker: MockerFixture
+) -> None:
+    """Test claims are trusted until the user security version changes."""
+    user_in = UserCreate(
+        fullname="John Doe",
+        username="claims-user@mail.com",
+        password="password",
+        status=UserStatusValues.ACTIVE,
+        roles=[RoleBase(name=RoleNames.ADMIN)],
+    )
+    user = await crud.user.create_async(db=async_db_session, obj_in=user_in)
+    principal = await crud.user.build_principal_async(user)
+    token = create_access_token(data=create_user_claims(principal))
+    spy = mocker.spy(crud.user, "get_by_username_async")
+
+    current_user = await get_current_user_from_claims(token=token, db=async_db_session)
+
+    assert current_user == principal
+    assert spy.call_count == 0
+
+    await crud.user.update_async(
+        db=async_db_session,
+        db_obj=user,
+        obj_in={
+            "new_password": "newpassword123",
+            "new_password_confirm": "newpassword123",
+        },
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user_from_claims(token=token, db=async_db_session)
+    assert exc_info.value.status_code == 401
+    assert spy.call_count == 1
+
+    with pytest.raises(HTTPException):
+        await get_current_user_from_claims(
+            token=create_access_token(data={"sub": user_in.username}),
+            db=async_db_session,
+        )
+
+
+@pytest.mark.anyio()
+async def test_get_current_user_from_claims_unknown_version(
+    async_db_session: AsyncSession, mocker: MockerFixture
+) -> None:
+    """Test unknown versions are checked in database, and user ids compared."""
+    user_in = UserCreate(
+        fullname="John Doe",
+        username="claims-unknown@mail.com",
+        password="password",
+        status=UserStatusValues.ACTIVE,
+        roles=[RoleBase(name=RoleNames.USER)],
+    )
+    user = await crud.user.create_async(db=async_db_session, obj_in=user_in)
+    token = create_access_token(
+        data=create_user_claims(await crud.user.build_principal_async(user))
+    )
+    # as in a worker which never read this user, or evicted it.
+    get_security_version_cache().clear()
+    spy = mocker.spy(crud.user, "get_by_username_async")
+
+    assert (await get_current_user_from_claims(token=token, db=async_db_session)).id
+    assert (await get_current_user_from_claims(token=token, db=async_db_session)).id
+    assert spy.call_count == 1
+
+    await crud.user.remove_by_username_async(
+        db=async_db_session, username=user_in.username
+    )
+    await crud.user.create_async(db=async_db_session, obj_in=user_in)
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user_from_claims(token=token, db=async_db_session)
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.integration()
+def test_stateless_auth_dependency(
+    test_app: TestClient, valid_credentials: dict[str, str], mocker: MockerFixture
+) -> None:
+    """Test routes authorize from claims in stateless mode."""
+    mocker.patch.object(SETTINGS, "STATELESS_AUTH", True)
+    response = test_app.post("/auth/token", data=valid_credentials)
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    spy = mocker.spy(crud.user, "get_principal_async")
+
+    response = test_app.get("/users/me", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["username"] == valid_credentials["username"]
+    assert spy.call_count == 0
@@ -0,0 +1,59 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from fastapi_user_management.config import SETTINGS
+
+
+@pytest.mark.integration()
+def test_metrics(
+    test_app: TestClient,
+    admin_headers: dict[str, str],
+    valid_credentials: dict,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test requests, SQL, pools, hashing and JWT are exposed."""
+    test_app.get("/")
+    test_app.get("/users/me", headers=admin_headers)
+    test_app.post("/auth/token", data=valid_credentials)
+    test_app.get("/unknown")
+
+    monkeypatch.setattr(SETTINGS, "METRICS_TOKEN", "metrics-token")
+    response = test_app.get(
+        "/metrics", headers={"Authorization": "Bearer metrics-token"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    for sample in (
+        'http_requests_total{method="GET",route="/",status="200"}',
+        'http_requests_total{method="GET",route="<unmatched>",status="404"}',
+        'http_request_duration_seconds_count{method="GET",route="/users/me"}',
+        'db_statement_duration_seconds_count{engine="async_primary",operation="SELECT"}',
+        'db_pool_checked_out_connections{engine="primary"}',
+        'db_pool_overflow_connections{engine="async_primary"}',
+        'password_hashing_duration_seconds_count{operation="verify"}',
+        'jwt_duration_seconds_count{operation="encode"}',
+        'jwt_duration_seconds_count{operation="decode"}',
+    ):
+        assert sample in response.text
+
+
+@pytest.mark.integration()
+@pytest.mark.parametrize(
+    ("token", "headers"),
+    [
+        (None, {"Authorization": "Bearer "}),
+        ("metrics-token", {}),
+        ("metrics-token", {"Authorization": "Bearer wrong"}),
+    ],
+)
+def test_metrics_requires_token(
+    test_app: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+    token: str | None,
+    headers: dict[str, str],
+) -> None:
+    """Test scrapes without the configured token are refused."""
+    monkeypatch.setattr(SETTINGS, "METRICS_TOKEN", token)
+    response = test_app.get("/metrics", headers=headers)
+    assert response.status_code == 401
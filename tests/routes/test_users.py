@@ -0,0 +1,177 @@
+import json
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.mark.integration()
+def test_import_users(test_app: TestClient, admin_headers: dict[str, str]) -> None:
+    """Test admin can bulk import users from CSV."""
+    content = (
+        "fullname,username,password,roles\n"
+        f"Import One,import-{uuid4()}@mail.com,password,user\n"
+        f"Import Two,import-{uuid4()}@mail.com,password,user\n"
+    )
+    response = test_app.post(
+        "/users/import",
+        files={"file": ("users.csv", content, "text/csv")},
+        headers=admin_headers,
+    )
+    assert response.status_code == 201
+    assert response.json() == {"created": 2}
+
+    response = test_app.post(
+        "/users/import",
+        params={"batch_size": 1},
+        files={
+            "file": (
+                "users.csv",
+                "fullname,username,password,roles\n"
+                f"Import Three,import-{uuid4()}@mail.com,password,user\n"
+                + content.splitlines(keepends=True)[1],
+                "text/csv",
+            )
+        },
+        headers=admin_headers,
+    )
+    assert response.status_code == 409
+    assert response.json()["detail"] == {
+        "message": "User already exists",
+        "created": 1,
+    }
+
+
+@pytest.mark.integration()
+def test_import_users_invalid_file(
+    test_app: TestClient, admin_headers: dict[str, str]
+) -> None:
+    """Test invalid rows are rejected with 422."""
+    response = test_app.post(
+        "/users/import",
+        params={"file_format": "jsonl"},
+        files={"file": ("users.jsonl", '{"fullname": "No Email"}\n')},
+        headers=admin_headers,
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.integration()
+def test_import_users_malformed_csv(
+    test_app: TestClient, admin_headers: dict[str, str]
+) -> None:
+    """Test CSV the parser rejects is a 422, not a server error."""
+    response = test_app.post(
+        "/users/import",
+        files={
+            "file": ("users.csv", f'fullname,username\n"{"x" * 200_000}",a@mail.com\n')
+        },
+        headers=admin_headers,
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"]["created"] == 0
+
+
+@pytest.mark.integration()
+@pytest.mark.parametrize(
+    "params", [{"batch_size": 0}, {"batch_size": 10**6}, {"file_format": "xml"}]
+)
+def test_import_users_invalid_params(
+    test_app: TestClient, admin_headers: dict[str, str], params: dict
+) -> None:
+    """Test batch size is bounded and only known formats are accepted."""
+    response = test_app.post(
+        "/users/import",
+        params=params,
+        files={"file": ("users.csv", "fullname,username\n")},
+        headers=admin_headers,
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.integration()
+def test_import_users_requires_admin(test_app: TestClient) -> None:
+    """Test import without token is rejected."""
+    response = test_app.post(
+        "/users/import", files={"file": ("users.csv", "fullname,username\n")}
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.integration()
+def test_list_users(
+    test_app: TestClient, admin_headers: dict[str, str], valid_credentials: dict
+) -> None:
+    """Test admin can page through users with cursors."""
+    usernames = [f"{uuid4().hex}@mail.com" for _ in range(2)]
+    test_app.post(
+        "/users/import",
+        files={
+            "file": (
+                "users.csv",
+                "fullname,username\n"
+                + "".join(f"List,{username}\n" for username in usernames),
+            )
+        },
+        headers=admin_headers,
+    )
+    users = []
+    pages = 0
+    cursor = None
+    while True:
+        response = test_app.get(
+            "/users",
+            params={"limit": 2, **({"cursor": cursor} if cursor else {})},
+            headers=admin_headers,
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert 0 < len(page["items"]) <= 2
+        users.extend(page["items"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages > 1
+
+    ids = [user["id"] for user in users]
+    assert ids == sorted(set(ids))
+    by_username = {user["username"]: user for user in users}
+    assert by_username[valid_credentials["username"]]["roles"] == [{"name": "admin"}]
+    assert all(by_username[username]["roles"] == [] for username in usernames)
+
+    response = test_app.get("/users", params={"cursor": "bad"}, headers=admin_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.integration()
+@pytest.mark.parametrize("file_format", ["ndjson", "csv"])
+def test_export_users(
+    test_app: TestClient, admin_headers: dict[str, str], file_format: str
+) -> None:
+    """Test admin can stream every user."""
+    response = test_app.get(
+        "/users/export", params={"file_format": file_format}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert "admin@gmail.com" in response.text
+    if file_format == "ndjson":
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert json.loads(response.text.splitlines()[0])["id"]
+    else:
+        assert response.text.startswith("id,fullname,username,status,created_at,roles")
+
+
+@pytest.mark.integration()
+def test_read_current_user(
+    test_app: TestClient, admin_headers: dict[str, str], valid_credentials: dict
+) -> None:
+    """Test active users can read their own view."""
+    response = test_app.get("/users/me", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["username"] == valid_credentials["username"]
+    assert response.json()["roles"] == ["admin"]
+    assert "security_version" not in response.json()
+
+    assert test_app.get("/users/me").status_code == 401
@@ -1,6 +1,10 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from fastapi_user_management import crud
+from fastapi_user_management.core.database import get_async_session_local
+from fastapi_user_management.models.role import RoleNames
+
 
 @pytest.mark.unit()
 def test_health_check_endpoint(test_app: TestClient) -> None:
@@ -12,3 +16,34 @@ def test_health_check_endpoint(test_app: TestClient) -> None:
     resp = test_app.get("/")
     assert resp.status_code == 200
     assert resp.json() == {"message": "hello-world!", "status": "ok"}
+
+
+@pytest.mark.integration()
+def test_startup_timings(test_app: TestClient) -> None:
+    """Test every startup phase is timed.
+
+    Args:
+        test_app (TestClient): app instance.
+    """
+    timings = test_app.app.state.startup_timings  # type: ignore[attr-defined]
+    assert set(timings) == {
+        "lock",
+        "schema",
+        "seed",
+        "roles",
+        "async_roles",
+        "revocations",
+    }
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+@pytest.mark.integration()
+@pytest.mark.anyio()
+async def test_startup_loads_async_roles(test_app: TestClient) -> None:
+    """Test roles of the async engine are known before the first request.
+
+    Args:
+        test_app (TestClient): app instance.
+    """
+    async with get_async_session_local()() as db:
+        assert crud.role.registry.get_id(db.sync_session, RoleNames.ADMIN)
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy.orm import Session, sessionmaker
+
+from fastapi_user_management import cli, crud
+from fastapi_user_management.core import database
+
+
+@pytest.mark.integration()
+def test_cli_import_users(
+    db_session: Session,
+    tmp_path: Path,
+    mocker: MockerFixture,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test `import-users` command imports JSON Lines file."""
+    path = tmp_path / "users.jsonl"
+    path.write_text(
+        '{"fullname": "Cli User", "username": "cli-user@mail.com",'
+        ' "password": "password", "roles": ["user"]}\n'
+    )
+    mocker.patch.object(
+        database,
+        "get_session_local",
+        lambda: sessionmaker(bind=db_session.get_bind()),
+    )
+
+    exit_code = cli.main(["import-users", str(path), "--workers", "1"])
+
+    assert exit_code == 0
+    assert "Imported 1 users" in capsys.readouterr().out
+    assert crud.user.get_by_username(db_session, username="cli-user@mail.com")
+
+
+@pytest.mark.integration()
+def test_cli_calibrate_hashing(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test `calibrate-hashing` prints timings and recommended settings."""
+    exit_code = cli.main(
+        [
+            "calibrate-hashing",
+            "--scheme=bcrypt",
+            "--target-ms=10000",
+            "--samples=1",
+            "--min-cost=4",
+            "--max-cost=5",
+        ]
+    )
+
+    out = capsys.readouterr().out
+    assert exit_code == 0
+    assert "bcrypt cost 4:" in out
+    assert "bcrypt_rounds: 5" in out
+
+
+@pytest.mark.integration()
+def test_cli_calibrate_hashing_over_target(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test `calibrate-hashing` fails if lowest cost is over target."""
+    exit_code = cli.main(
+        ["calibrate-hashing", "--scheme=bcrypt", "--target-ms=0", "--min-cost=4"]
+    )
+
+    assert exit_code == 1
+    assert "No cost verifies within" in capsys.readouterr().out
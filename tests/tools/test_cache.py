@@ -0,0 +1,69 @@
+import pytest
+
+from fastapi_user_management.tools.cache import TTLCache
+
+
+class FakeTimer:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Start clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Current time."""
+        return self.now
+
+
+@pytest.mark.unit()
+def test_ttl_cache_get_and_set() -> None:
+    """Tests stored values are returned and statistics are counted."""
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    assert cache.get("missing") is None
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+@pytest.mark.unit()
+def test_ttl_cache_expiration() -> None:
+    """Tests entries expire after their time-to-live."""
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=2, ttl=10, timer=timer)
+    cache.set("default", 1)
+    cache.set("short", 2, ttl=1)
+    timer.now = 5
+    assert cache.get("short") is None
+    assert cache.get("default") == 1
+    timer.now = 10
+    assert cache.get("default") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.unit()
+def test_ttl_cache_lru_eviction() -> None:
+    """Tests least recently used entry is evicted when full."""
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+@pytest.mark.unit()
+def test_ttl_cache_delete_and_clear() -> None:
+    """Tests entries can be removed."""
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.delete("a")
+    cache.delete("missing")
+    assert cache.get("a") is None
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 0
+    assert cache.misses == 0
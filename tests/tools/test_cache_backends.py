@@ -0,0 +1,326 @@
+import fnmatch
+import socketserver
+import threading
+import time
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from fastapi_user_management.schemas.user import UserPrincipal
+from fastapi_user_management.tools.cache import (
+    Cache,
+    build_cache_backend,
+    cache_stats,
+)
+from fastapi_user_management.tools.cache_backends import (
+    MemoryBackend,
+    RedisBackend,
+    RedisBroadcaster,
+    SQLiteBackend,
+    SQLiteBroadcaster,
+)
+
+
+class FakeTimer:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Start clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Current time."""
+        return self.now
+
+
+class RespStandIn(socketserver.ThreadingTCPServer):
+    """In-memory server of the Redis commands used by cache backends."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        """Listen on a free local port."""
+        super().__init__(("127.0.0.1", 0), RespHandler)
+        self.data: dict[bytes, tuple[bytes, float]] = {}
+        self.subscribers: dict[bytes, list[Any]] = {}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """Server URL."""
+        host, port = self.server_address
+        return f"redis://{host}:{port}/0"
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    """Serve one connection."""
+
+    server: RespStandIn
+
+    def reply(self, value: Any) -> None:
+        """Encode & send reply."""
+        self.wfile.write(self.encode(value))
+
+    def encode(self, value: Any) -> bytes:
+        """Encode RESP value."""
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, bytes):
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if isinstance(value, str):
+            return f"+{value}\r\n".encode()
+        return b"*%d\r\n" % len(value) + b"".join(self.encode(v) for v in value)
+
+    def read_command(self) -> list[bytes] | None:
+        """Read array of bulk strings."""
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self) -> None:
+        """Execute commands until client disconnects."""
+        server = self.server
+        while (args := self.read_command()) is not None:
+            command = args[0].upper()
+            with server.lock:
+                if command in (b"SELECT", b"AUTH", b"PING"):
+                    self.reply("OK")
+                elif command == b"GET":
+                    value, expires_at = server.data.get(args[1], (None, 0.0))
+                    self.reply(value if expires_at > time.time() else None)
+                elif command == b"SET":
+                    server.data[args[1]] = (args[2], time.time() + int(args[4]) / 1000)
+                    self.reply("OK")
+                elif command == b"DEL":
+                    self.reply(
+                        sum(server.data.pop(k, None) is not None for k in args[1:])
+                    )
+                elif command == b"SCAN":
+                    pattern = args[3].decode()
+                    keys = [
+                        k for k in server.data if fnmatch.fnmatch(k.decode(), pattern)
+                    ]
+                    self.reply([b"0", keys])
+                elif command == b"PUBLISH":
+                    receivers = server.subscribers.get(args[1], [])
+                    for wfile in receivers:
+                        wfile.write(self.encode([b"message", args[1], args[2]]))
+                    self.reply(len(receivers))
+                elif command == b"SUBSCRIBE":
+                    server.subscribers.setdefault(args[1], []).append(self.wfile)
+                    self.reply([b"subscribe", args[1], 1])
+
+
+@pytest.fixture()
+def resp_server() -> Generator[RespStandIn, None, None]:
+    """Running Redis protocol stand-in."""
+    server = RespStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _wait_for(condition: Any, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.mark.unit()
+def test_cache_namespace_stats() -> None:
+    """Tests namespaces of one backend are isolated and count hits & misses."""
+    backend = MemoryBackend()
+    users = Cache("test-users", backend, maxsize=2, ttl=10)
+    tokens = Cache("test-tokens", backend, maxsize=2, ttl=10)
+
+    users.set("key", "user")
+    tokens.set("key", "token")
+    assert users.get("key") == "user"
+    assert tokens.get("key") == "token"
+    assert users.get("missing") is None
+
+    assert cache_stats()["test-users"] == {"hits": 1, "misses": 1}
+    assert cache_stats()["test-tokens"] == {"hits": 1, "misses": 0}
+    users.clear()
+    assert tokens.get("key") == "token"
+    assert cache_stats()["test-users"] == {"hits": 0, "misses": 0}
+
+
+@pytest.mark.unit()
+def test_build_cache_backend(tmp_path: Path) -> None:
+    """Tests backends are built from settings and unknown ones fail."""
+    assert isinstance(build_cache_backend("memory"), MemoryBackend)
+    sqlite_backend = build_cache_backend(
+        "sqlite", sqlite_path=str(tmp_path / "cache.sqlite3")
+    )
+    assert isinstance(sqlite_backend, SQLiteBackend)
+    sqlite_backend.close()
+    assert isinstance(build_cache_backend("redis"), RedisBackend)
+
+    with pytest.raises(ValueError):
+        build_cache_backend("memcached")
+    with pytest.raises(ValueError):
+        build_cache_backend("memory", broadcast="kafka")
+
+
+@pytest.mark.integration()
+def test_sqlite_backend_shared_between_workers(tmp_path: Path) -> None:
+    """Tests entries written by one worker are read & deleted by another."""
+    path = str(tmp_path / "cache.sqlite3")
+    worker, other_worker = SQLiteBackend(path), SQLiteBackend(path)
+    principal = UserPrincipal(
+        id=1,
+        fullname="Cached User",
+        username="cached@mail.com",
+        status="active",
+        roles=("user",),
+        security_version=0,
+    )
+
+    worker.set("principal", "cached@mail.com", principal, ttl=3600)
+    assert other_worker.get("principal", "cached@mail.com") == principal
+    other_worker.delete("principal", "cached@mail.com")
+    assert worker.get("principal", "cached@mail.com") is None
+
+    worker.set("ns", "short", 1, ttl=-1)
+    assert other_worker.get("ns", "short") is None
+    worker.close()
+    other_worker.close()
+
+
+@pytest.mark.integration()
+def test_sqlite_backend_prune(tmp_path: Path) -> None:
+    """Tests prune drops expired entries and trims namespaces to max size."""
+    timer = FakeTimer()
+    backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"), prune_every=3, timer=timer)
+    backend.register("ns", 1)
+    backend.set("ns", "old", 1, ttl=10)
+    backend.set("ns", "new", 2, ttl=20)
+    backend.set("other", "expired", 3, ttl=-1)
+
+    assert backend.get("ns", "old") is None
+    assert backend.get("ns", "new") == 2
+    rows = backend._file.execute("SELECT namespace, key FROM cache_entry")
+    assert rows == [("ns", "new")]
+    backend.close()
+
+
+@pytest.mark.integration()
+def test_memory_backend_sqlite_broadcast(tmp_path: Path) -> None:
+    """Tests deletes & clears of one worker reach memory of another one."""
+    path = str(tmp_path / "cache.sqlite3")
+    broadcaster = SQLiteBroadcaster(path)
+    worker = MemoryBackend(SQLiteBroadcaster(path, poll_seconds=0.01))
+    other_worker = MemoryBackend(broadcaster)
+    for backend in (worker, other_worker):
+        backend.set("ns", "a", 1, ttl=10)
+        backend.set("ns", "b", 2, ttl=10)
+
+    worker.delete("ns", "a")
+    assert _wait_for(lambda: other_worker.get("ns", "a") is None)
+    assert other_worker.get("ns", "b") == 2
+    worker.clear("ns")
+    assert _wait_for(lambda: other_worker.get("ns", "b") is None)
+    worker.close()
+    other_worker.close()
+
+
+@pytest.mark.integration()
+def test_redis_backend(resp_server: RespStandIn) -> None:
+    """Tests Redis backend against protocol stand-in."""
+    backend = RedisBackend(resp_server.url)
+    backend.set("ns", "a", {"value": 1}, ttl=10)
+    backend.set("ns", "b", 2, ttl=10)
+    backend.set("other", "a", 3, ttl=10)
+
+    assert backend.get("ns", "a") == {"value": 1}
+    backend.delete("ns", "a")
+    assert backend.get("ns", "a") is None
+    backend.clear("ns")
+    assert backend.get("ns", "b") is None
+    assert backend.get("other", "a") == 3
+    backend.close()
+
+
+@pytest.mark.integration()
+def test_redis_backend_unavailable() -> None:
+    """Tests lookups miss and writes are skipped while server is down."""
+    backend = RedisBackend("redis://127.0.0.1:1/0", timeout=0.1)
+    backend.set("ns", "a", 1, ttl=10)
+    assert backend.get("ns", "a") is None
+    with pytest.raises(OSError):
+        backend.delete("ns", "a")
+
+
+@pytest.mark.integration()
+def test_cache_delete_unavailable(caplog: pytest.LogCaptureFixture) -> None:
+    """Tests a failing invalidation is logged instead of raised."""
+    cache = Cache(
+        "test-unavailable", RedisBackend("redis://127.0.0.1:1/0", timeout=0.1)
+    )
+    cache.delete("a")
+    assert "test-unavailable delete failed" in caplog.text
+
+
+@pytest.mark.anyio()
+async def test_cache_async_off_event_loop(tmp_path: Path) -> None:
+    """Tests shared backends are used from worker threads, memory ones inline."""
+    sqlite_backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+    memory_backend = MemoryBackend()
+    threads: dict[str, set[int]] = {"sqlite": set(), "memory": set()}
+
+    def record(name: str, method: Any) -> Any:
+        def wrapper(*args: Any) -> Any:
+            threads[name].add(threading.get_ident())
+            return method(*args)
+
+        return wrapper
+
+    for name, backend in (("sqlite", sqlite_backend), ("memory", memory_backend)):
+        for method in ("get", "set", "delete"):
+            setattr(backend, method, record(name, getattr(backend, method)))
+        cache = Cache(f"test-async-{name}", backend)
+        await cache.set_async("a", 1)
+        assert await cache.get_async("a") == 1
+        await cache.delete_async("a")
+        assert await cache.get_async("a") is None
+
+    assert threading.get_ident() not in threads["sqlite"]
+    assert threads["memory"] == {threading.get_ident()}
+    sqlite_backend.close()
+
+
+@pytest.mark.integration()
+def test_memory_backend_redis_broadcast(resp_server: RespStandIn) -> None:
+    """Tests invalidations are sent through Redis pub/sub."""
+    worker = MemoryBackend(RedisBroadcaster(resp_server.url))
+    other_worker = MemoryBackend(RedisBroadcaster(resp_server.url))
+    assert _wait_for(
+        lambda: len(resp_server.subscribers.get(b"cache-invalidation", [])) == 2
+    )
+    for backend in (worker, other_worker):
+        backend.set("ns", "a", 1, ttl=10)
+        backend.set("ns", "b", 2, ttl=10)
+
+    worker.delete("ns", "a")
+    assert _wait_for(lambda: other_worker.get("ns", "a") is None)
+    assert other_worker.get("ns", "b") == 2
+    worker.clear("ns")
+    assert _wait_for(lambda: other_worker.get("ns", "b") is None)
+    worker.close()
+    other_worker.close()
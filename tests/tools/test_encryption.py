@@ -1,9 +1,12 @@
 # Generated by CodiumAI
 import pytest
 
+from fastapi_user_management.tools import encryption
 from fastapi_user_management.tools.encryption import (
+    build_crypt_context,
     get_password_hash,
-    pwd_context,
+    get_pwd_context,
+    verify_and_update_password,
     verify_password,
 )
 
@@ -12,7 +15,7 @@ from fastapi_user_management.tools.encryption import (
 def test_correct_password_match() -> None:
     """Tests that a correct plain password matches the correct hashed password."""
     plain_password = "password"
-    hashed_password = pwd_context.hash(plain_password)
+    hashed_password = get_pwd_context().hash(plain_password)
     assert verify_password(plain_password, hashed_password) is True
 
 
@@ -21,7 +24,7 @@ def test_different_correct_password_match() -> None:
     """Tests that a different correct plain password matches the correct hashed password."""
     plain_password = "password"
     different_plain_password = "different_password"
-    hashed_password = pwd_context.hash(plain_password)
+    hashed_password = get_pwd_context().hash(plain_password)
     assert verify_password(different_plain_password, hashed_password) is False
 
 
@@ -30,7 +33,7 @@ def test_incorrect_password_no_match() -> None:
     """Tests that an incorrect plain password does not match the correct hashed password."""
     plain_password = "password"
     incorrect_plain_password = "incorrect_password"
-    hashed_password = pwd_context.hash(plain_password)
+    hashed_password = get_pwd_context().hash(plain_password)
     assert verify_password(incorrect_plain_password, hashed_password) is False
 
 
@@ -38,7 +41,7 @@ def test_incorrect_password_no_match() -> None:
 def test_empty_plain_password() -> None:
     """Tests that an empty plain password does not match the correct hashed password."""
     plain_password = ""
-    hashed_password = pwd_context.hash("password")
+    hashed_password = get_pwd_context().hash("password")
     assert verify_password(plain_password, hashed_password) is False
 
 
@@ -46,7 +49,7 @@ def test_empty_plain_password() -> None:
 def test_incorrect_hashed_password() -> None:
     """Tests that a correct plain password does not match an incorrect hashed password."""
     plain_password = "password"
-    incorrect_hashed_password = pwd_context.hash("incorrect_password")
+    incorrect_hashed_password = get_pwd_context().hash("incorrect_password")
     assert verify_password(plain_password, incorrect_hashed_password) is False
 
 
@@ -59,3 +62,44 @@ def test_get_password_hash() -> None:
 
     assert isinstance(hashed_password, str)
     assert hashed_password != plain_password
+
+
+@pytest.mark.unit()
+def test_build_crypt_context_unknown_scheme() -> None:
+    """Test unknown hashing scheme is rejected."""
+    with pytest.raises(ValueError):
+        build_crypt_context("md5")
+
+
+@pytest.mark.unit()
+def test_verify_and_update_password_outdated_hash(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test hashes with other cost are rehashed with configured one."""
+    context = build_crypt_context(bcrypt_rounds=5)
+    monkeypatch.setattr(encryption, "get_pwd_context", lambda: context)
+    hashed_password = build_crypt_context(bcrypt_rounds=4).hash("password")
+
+    valid, new_hash = verify_and_update_password("password", hashed_password)
+    assert valid is True
+    assert new_hash is not None
+    assert new_hash.startswith("$2b$05$")
+
+    assert verify_and_update_password("password", new_hash) == (True, None)
+    assert verify_and_update_password("wrong", hashed_password) == (False, None)
+
+
+@pytest.mark.unit()
+def test_verify_and_update_password_other_scheme(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test bcrypt hashes are migrated to argon2 once it's configured."""
+    pytest.importorskip("argon2")
+    context = build_crypt_context("argon2", argon2_memory_cost=1024, argon2_time_cost=1)
+    monkeypatch.setattr(encryption, "get_pwd_context", lambda: context)
+    hashed_password = build_crypt_context(bcrypt_rounds=4).hash("password")
+
+    valid, new_hash = verify_and_update_password("password", hashed_password)
+    assert valid is True
+    assert new_hash is not None
+    assert new_hash.startswith("$argon2id$")
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from fastapi_user_management.errors.exceptions import HashingQueueFullError
+from fastapi_user_management.tools.encryption import verify_password
+from fastapi_user_management.tools.hashing import HashingService
+
+
+@pytest.mark.unit()
+def test_hashing_service_invalid_executor() -> None:
+    """Tests that an unknown executor type is rejected."""
+    with pytest.raises(ValueError):
+        HashingService(executor="fiber")
+
+
+@pytest.mark.anyio()
+async def test_hashing_service_hash_and_verify() -> None:
+    """Tests hash & verify run through the worker pool."""
+    service = HashingService(executor="thread", max_workers=2)
+    try:
+        hashed_password = await service.hash("password")
+        assert verify_password("password", hashed_password)
+        assert await service.verify("password", hashed_password) is True
+        assert await service.verify("wrong-password", hashed_password) is False
+        assert service.in_flight == 0
+    finally:
+        service.shutdown()
+
+
+@pytest.mark.anyio()
+async def test_hashing_service_rejects_when_full() -> None:
+    """Tests that calls beyond `max_in_flight` are rejected without queueing."""
+    service = HashingService(executor="thread", max_workers=1, max_in_flight=1)
+    try:
+        running = asyncio.create_task(service.hash("password"))
+        await asyncio.sleep(0)
+        with pytest.raises(HashingQueueFullError):
+            await service.hash("password")
+        await running
+        assert service.in_flight == 0
+    finally:
+        service.shutdown()
@@ -0,0 +1,59 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+from fastapi_user_management.tools.metrics import instrument_engine
+
+
+@pytest.mark.unit()
+def test_instrument_engine() -> None:
+    """Test statements are timed by operation and pool gauges read the pool."""
+    engine = create_engine("sqlite+pysqlite:///:memory:", poolclass=StaticPool)
+    instrument_engine(engine, "test")
+    labels = {"engine": "test", "operation": "SELECT"}
+
+    with engine.connect() as connection:
+        connection.exec_driver_sql("SELECT 1")
+        connection.exec_driver_sql("PRAGMA user_version")
+        assert (
+            REGISTRY.get_sample_value(
+                "db_pool_checked_out_connections", {"engine": "test"}
+            )
+            == 0
+        )
+
+    assert REGISTRY.get_sample_value("db_statement_duration_seconds_count", labels) == 1
+    assert (
+        REGISTRY.get_sample_value(
+            "db_statement_duration_seconds_count",
+            {"engine": "test", "operation": "OTHER"},
+        )
+        == 1
+    )
+    assert (
+        REGISTRY.get_sample_value("db_pool_overflow_connections", {"engine": "test"})
+        == 0
+    )
+
+
+@pytest.mark.unit()
+def test_instrument_engine_failed_statement() -> None:
+    """Test a failing statement doesn't leave its timer behind."""
+    engine = create_engine("sqlite+pysqlite:///:memory:", poolclass=StaticPool)
+    instrument_engine(engine, "test_failed")
+
+    with engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.exec_driver_sql("SELECT * FROM missing")
+        assert connection.info["metrics_started"] == []
+        connection.exec_driver_sql("SELECT 1")
+
+    assert (
+        REGISTRY.get_sample_value(
+            "db_statement_duration_seconds_count",
+            {"engine": "test_failed", "operation": "SELECT"},
+        )
+        == 1
+    )
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+import pytest
+
+from fastapi_user_management.errors.exceptions import InvalidCursorError
+from fastapi_user_management.tools.pagination import decode_cursor, encode_cursor
+
+
+@pytest.mark.unit()
+def test_cursor_round_trip() -> None:
+    """Test cursor decodes to the encoded values."""
+    created_at = datetime(2023, 10, 4, 14, 9, 58, 8496)
+
+    cursor = encode_cursor([created_at, 42])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, [datetime, int]) == [created_at, 42]
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    "cursor",
+    ["not-base64!", encode_cursor([1, 2]), encode_cursor(["not-a-number"]), "e30"],
+)
+def test_invalid_cursor(cursor: str) -> None:
+    """Test malformed cursors are rejected."""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, [int])
@@ -0,0 +1,86 @@
+import logging
+from datetime import timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from fastapi_user_management.tools.hashing import get_hashing_service
+from fastapi_user_management.tools.profiler import (
+    ProfilerMiddleware,
+    current_profile,
+    profile_engine,
+    profile_timing,
+)
+from fastapi_user_management.tools.token import create_access_token
+
+
+@pytest.fixture()
+def profiled_client() -> TestClient:
+    """App running SQL, bcrypt and JWT under the profiler."""
+    # requests may run on different portal threads, all sharing one connection.
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    profile_engine(engine)
+    app = FastAPI()
+    app.add_middleware(ProfilerMiddleware, repeated_statement_threshold=2)
+
+    @app.get("/work")
+    async def work(queries: int = 1) -> dict[str, int]:
+        with engine.connect() as connection:
+            for _ in range(queries):
+                connection.exec_driver_sql("SELECT 1")
+        await get_hashing_service().hash("password")
+        create_access_token({"sub": "user"}, expires_delta=timedelta(minutes=1))
+        return {"queries": queries}
+
+    return TestClient(app)
+
+
+def _server_timing(header: str) -> dict[str, str]:
+    return {
+        metric.split(";")[0]: metric.split(";")[1].removeprefix("dur=")
+        for metric in header.split(", ")
+    }
+
+
+@pytest.mark.integration()
+def test_server_timing_header(profiled_client: TestClient) -> None:
+    """Test db, hash, jwt & total time are sent back."""
+    response = profiled_client.get("/work")
+
+    timing = _server_timing(response.headers["Server-Timing"])
+    assert set(timing) == {"db", "hash", "jwt", "total"}
+    assert float(timing["hash"]) > 0
+    assert float(timing["jwt"]) > 0
+    assert float(timing["total"]) >= float(timing["hash"])
+    assert "db;dur=" in response.headers["Server-Timing"]
+    assert 'desc="1 queries"' in response.headers["Server-Timing"]
+
+
+@pytest.mark.integration()
+def test_repeated_statements_warning(
+    profiled_client: TestClient, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a statement running more often than threshold is logged."""
+    with caplog.at_level(logging.WARNING):
+        profiled_client.get("/work", params={"queries": 2})
+        assert not caplog.records
+        profiled_client.get("/work", params={"queries": 3})
+
+    assert len(caplog.records) == 1
+    assert "executed 3 times: SELECT 1" in caplog.records[0].getMessage()
+
+
+@pytest.mark.unit()
+def test_profile_timing_outside_request() -> None:
+    """Test timing blocks outside requests is a no-op."""
+    assert current_profile() is None
+    with profile_timing("db"):
+        pass
+    assert current_profile() is None
@@ -0,0 +1,187 @@
+import asyncio
+import contextlib
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from fastapi_user_management import crud
+from fastapi_user_management.models.refresh_token import RefreshTokenModel
+from fastapi_user_management.models.revoked_token import RevokedTokenModel
+from fastapi_user_management.schemas.role import RoleBase
+from fastapi_user_management.schemas.user import UserCreate
+from fastapi_user_management.tools.revocation import RevocationList
+
+
+class FakeTimer:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Start clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Current time."""
+        return self.now
+
+
+@pytest.mark.unit()
+def test_revocation_list_expiration() -> None:
+    """Tests revoked tokens are remembered until they expire."""
+    timer = FakeTimer()
+    revocation_list = RevocationList(timer=timer)
+    revocation_list.add("short", 5)
+    revocation_list.add("long", 10)
+
+    assert revocation_list.is_revoked("short")
+    assert not revocation_list.is_revoked("missing")
+    assert not revocation_list.is_revoked(None)
+
+    timer.now = 5
+    assert revocation_list.purge_expired() == 1
+    assert not revocation_list.is_revoked("short")
+    assert revocation_list.is_revoked("long")
+    assert len(revocation_list) == 1
+
+
+@pytest.mark.anyio()
+async def test_revocation_list_sync(async_db_session: AsyncSession) -> None:
+    """Tests tokens revoked by other workers are loaded past high-water mark."""
+    expires_at = datetime.utcnow() + timedelta(minutes=5)
+    worker, other_worker = RevocationList(), RevocationList()
+
+    await other_worker.revoke_async(
+        async_db_session, jti="first", expires_at=expires_at
+    )
+    assert other_worker.is_revoked("first")
+    assert not worker.is_revoked("first")
+
+    assert await worker.sync_async(async_db_session) == 1
+    assert worker.is_revoked("first")
+    await other_worker.revoke_async(
+        async_db_session, jti="second", expires_at=expires_at
+    )
+    assert await worker.sync_async(async_db_session) == 1
+    assert await worker.sync_async(async_db_session) == 0
+    assert worker.high_water_mark == 2
+
+
+@pytest.mark.anyio()
+async def test_revocation_list_sync_overlap(async_db_session: AsyncSession) -> None:
+    """Tests rows committed below the high-water mark are loaded in overlap."""
+    expires_at = datetime.utcnow() + timedelta(minutes=5)
+    worker = RevocationList(sync_overlap=1)
+    async_db_session.add_all(
+        [
+            RevokedTokenModel(id=2, jti="second", expires_at=expires_at),
+            RevokedTokenModel(id=3, jti="third", expires_at=expires_at),
+        ]
+    )
+    await async_db_session.commit()
+    assert await worker.sync_async(async_db_session) == 2
+    assert worker.high_water_mark == 3
+
+    # id 1 was taken before the others but its transaction committed last.
+    async_db_session.add(RevokedTokenModel(id=1, jti="first", expires_at=expires_at))
+    await async_db_session.commit()
+    assert await worker.sync_async(async_db_session) == 0
+    assert not worker.is_revoked("first")
+
+    worker.sync_overlap = 3
+    assert await worker.sync_async(async_db_session) == 1
+    assert worker.is_revoked("first")
+    assert worker.high_water_mark == 3
+
+
+@pytest.mark.anyio()
+async def test_revoke_twice(async_db_session: AsyncSession) -> None:
+    """Tests revoking an already revoked token, e.g. from two workers, is a no-op."""
+    expires_at = datetime.utcnow() + timedelta(minutes=5)
+    first = await crud.revoked_token.revoke_async(
+        async_db_session, jti="twice", expires_at=expires_at
+    )
+    second = await crud.revoked_token.revoke_async(
+        async_db_session, jti="twice", expires_at=expires_at
+    )
+    assert second.id == first.id
+
+    other_worker = RevocationList()
+    await other_worker.revoke_async(
+        async_db_session, jti="twice", expires_at=expires_at
+    )
+    assert other_worker.is_revoked("twice")
+    assert (
+        await async_db_session.scalar(
+            select(func.count()).select_from(RevokedTokenModel)
+        )
+        == 1
+    )
+
+
+@pytest.mark.anyio()
+async def test_purge_expired_revoked_tokens(async_db_session: AsyncSession) -> None:
+    """Tests expired rows are deleted in batches and ids are never reused."""
+    expired_at = datetime.utcnow() - timedelta(seconds=1)
+    for index in range(5):
+        await crud.revoked_token.revoke_async(
+            async_db_session, jti=f"expired-{index}", expires_at=expired_at
+        )
+
+    deleted = await crud.revoked_token.purge_expired_async(
+        async_db_session, batch_size=2
+    )
+    assert deleted == 5
+    assert not await async_db_session.scalar(
+        select(func.count()).select_from(RevokedTokenModel)
+    )
+
+    revoked_token = await crud.revoked_token.revoke_async(
+        async_db_session,
+        jti="new",
+        expires_at=datetime.utcnow() + timedelta(minutes=5),
+    )
+    assert revoked_token.id == 6
+
+
+@pytest.mark.anyio()
+async def test_revocation_list_run_purges_expired_rows(
+    async_db_session: AsyncSession,
+) -> None:
+    """Tests the background task purges revoked and refresh tokens."""
+    expired_at = datetime.utcnow() - timedelta(seconds=1)
+    await crud.revoked_token.revoke_async(
+        async_db_session, jti="expired", expires_at=expired_at
+    )
+    user = await crud.user.create_async(
+        db=async_db_session,
+        obj_in=UserCreate(
+            fullname="Purge User",
+            username="purge-user@mail.com",
+            password="password",
+            roles=[RoleBase(name="user")],
+        ),
+    )
+    await crud.refresh_token.issue_async(async_db_session, user=user)
+    await async_db_session.execute(
+        update(RefreshTokenModel).values(expires_at=expired_at)
+    )
+    await async_db_session.commit()
+
+    task = asyncio.create_task(
+        RevocationList().run(
+            async_sessionmaker(async_db_session.bind, expire_on_commit=False),
+            sync_interval=60,
+            purge_interval=0,
+            purge_batch_size=1,
+        )
+    )
+    await asyncio.sleep(0.1)
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+
+    for model in (RevokedTokenModel, RefreshTokenModel):
+        assert not await async_db_session.scalar(
+            select(func.count()).select_from(model)
+        )
@@ -0,0 +1,95 @@
+import pytest
+
+from fastapi_user_management.tools.throttle import LoginThrottle
+
+
+class FakeTimer:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Start clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Current time."""
+        return self.now
+
+
+def _throttle(timer: FakeTimer, **kwargs: float) -> LoginThrottle:
+    options = {
+        "rate_per_minute": 60,
+        "burst": 2,
+        "max_failures": 3,
+        "lockout_seconds": 10,
+        "max_lockout_seconds": 25,
+        "idle_seconds": 25,
+        **kwargs,
+    }
+    return LoginThrottle(timer=timer, **options)
+
+
+@pytest.mark.unit()
+def test_throttle_token_bucket() -> None:
+    """Tests burst is allowed and tokens refill at configured rate."""
+    timer = FakeTimer()
+    throttle = _throttle(timer)
+
+    assert throttle.acquire("user") == 0
+    assert throttle.acquire("user") == 0
+    assert throttle.acquire("user") == pytest.approx(1)
+    assert throttle.acquire("other") == 0
+    timer.now = 0.5
+    assert throttle.acquire("user") == pytest.approx(0.5)
+    timer.now = 1
+    assert throttle.acquire("user") == 0
+
+
+@pytest.mark.unit()
+def test_throttle_lockout_backoff() -> None:
+    """Tests consecutive failures lock key out for doubling durations."""
+    timer = FakeTimer()
+    throttle = _throttle(timer, burst=100)
+
+    for _ in range(3):
+        throttle.record_failure("user")
+    assert throttle.acquire("user") == pytest.approx(10)
+
+    timer.now = 10
+    assert throttle.acquire("user") == 0
+    for _ in range(3):
+        throttle.record_failure("user")
+    assert throttle.acquire("user") == pytest.approx(20)
+
+    timer.now = 30
+    for _ in range(3):
+        throttle.record_failure("user")
+    assert throttle.acquire("user") == pytest.approx(25)
+
+
+@pytest.mark.unit()
+def test_throttle_success_resets_failures() -> None:
+    """Tests successful login resets failures and backoff."""
+    timer = FakeTimer()
+    throttle = _throttle(timer, burst=100)
+
+    throttle.record_failure("user")
+    throttle.record_failure("user")
+    throttle.record_success("user")
+    throttle.record_failure("user")
+    assert throttle.acquire("user") == 0
+
+
+@pytest.mark.unit()
+def test_throttle_evicts_idle_and_oldest_keys() -> None:
+    """Tests tracked keys are bounded by idle time and max size."""
+    timer = FakeTimer()
+    throttle = _throttle(timer, maxsize=2)
+
+    throttle.acquire("first")
+    throttle.acquire("second")
+    throttle.acquire("third")
+    assert len(throttle) == 2
+
+    timer.now = 30
+    throttle.acquire("fourth")
+    assert len(throttle) == 1
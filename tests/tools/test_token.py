@@ -2,9 +2,23 @@ from datetime import timedelta
 
 import pytest
 from jose import jwt
+from pytest_mock import MockerFixture
 
 from fastapi_user_management.config import SETTINGS
-from fastapi_user_management.tools.token import create_access_token
+from fastapi_user_management.errors.exceptions import InvalidTokenError
+from fastapi_user_management.models.role import RoleNames
+from fastapi_user_management.models.user import UserStatusValues
+from fastapi_user_management.schemas.auth import TokenData
+from fastapi_user_management.schemas.user import UserPrincipal
+from fastapi_user_management.tools import token as token_module
+from fastapi_user_management.tools.cache import get_token_cache
+from fastapi_user_management.tools.token import (
+    create_access_token,
+    create_user_claims,
+    decode_access_token,
+    verify_access_token,
+    verify_access_token_async,
+)
 
 
 @pytest.mark.unit()
@@ -32,3 +46,83 @@ def test_create_access_token_without_expiration() -> None:
     assert decoded["sub"] == "user_id"
     assert "exp" in decoded
     assert isinstance(decoded["exp"], int)
+
+
+@pytest.mark.unit()
+def test_decode_access_token() -> None:
+    """Test decode_access_token returns claims & rejects tampered tokens."""
+    token = create_access_token({"sub": "user_id"})
+
+    assert decode_access_token(token)["sub"] == "user_id"
+    with pytest.raises(InvalidTokenError):
+        decode_access_token(token + "tampered")
+
+
+@pytest.mark.unit()
+def test_create_user_claims() -> None:
+    """Test stateless claims contain status, roles & security version."""
+    user = UserPrincipal(
+        id=1,
+        fullname="John Doe",
+        username="johndoe@mail.com",
+        status=UserStatusValues.ACTIVE,
+        roles=(RoleNames.ADMIN,),
+        security_version=3,
+    )
+
+    claims = create_user_claims(user)
+
+    assert claims == {
+        "sub": "johndoe@mail.com",
+        "uid": 1,
+        "name": "John Doe",
+        "status": "active",
+        "roles": ["admin"],
+        "ver": 3,
+    }
+
+
+@pytest.mark.unit()
+def test_verify_access_token_is_cached(mocker: MockerFixture) -> None:
+    """Test reused token is decoded once and cached until its expiration."""
+    token = create_access_token(
+        {"sub": "cached@mail.com"}, expires_delta=timedelta(minutes=5)
+    )
+    decode_spy = mocker.spy(token_module, "decode_access_token")
+    token_cache = get_token_cache()
+    set_spy = mocker.spy(token_cache, "set")
+    hits = token_cache.hits
+
+    first = verify_access_token(token, TokenData)
+    second = verify_access_token(token, TokenData)
+
+    assert first.username == "cached@mail.com"
+    assert second is first
+    assert decode_spy.call_count == 1
+    assert token_cache.hits == hits + 1
+    assert 0 < set_spy.call_args.kwargs["ttl"] <= 5 * 60
+
+
+@pytest.mark.anyio()
+async def test_verify_access_token_async(mocker: MockerFixture) -> None:
+    """Test async verification shares the token cache."""
+    token = create_access_token(
+        {"sub": "cached-async@mail.com"}, expires_delta=timedelta(minutes=5)
+    )
+    decode_spy = mocker.spy(token_module, "decode_access_token")
+
+    first = await verify_access_token_async(token, TokenData)
+
+    assert first.username == "cached-async@mail.com"
+    assert verify_access_token(token, TokenData) is first
+    assert decode_spy.call_count == 1
+
+
+@pytest.mark.unit()
+def test_verify_access_token_invalid_not_cached() -> None:
+    """Test invalid token raises every time."""
+    token = create_access_token({"sub": "user_id"}) + "tampered"
+
+    for _ in range(2):
+        with pytest.raises(InvalidTokenError):
+            verify_access_token(token, TokenData)
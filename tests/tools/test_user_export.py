@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from fastapi_user_management.models.role import RoleNames
+from fastapi_user_management.models.user import UserStatusValues
+from fastapi_user_management.schemas.role import RoleBase
+from fastapi_user_management.schemas.user import UserRead
+from fastapi_user_management.tools.user_export import export_header, serialize_users
+
+
+@pytest.fixture()
+def users() -> list[UserRead]:
+    """Sample users to export."""
+    return [
+        UserRead(
+            id=index,
+            fullname=f"John Doe {index}",
+            username=f"john-{index}@mail.com",
+            status=UserStatusValues.ACTIVE,
+            created_at=datetime(2023, 10, 4),
+            roles=[RoleBase(name=RoleNames.ADMIN), RoleBase(name=RoleNames.USER)],
+        )
+        for index in range(2)
+    ]
+
+
+@pytest.mark.unit()
+def test_serialize_users_ndjson(users: list[UserRead]) -> None:
+    """Test users are written one JSON object per line."""
+    content = export_header("ndjson") + serialize_users(users, "ndjson")
+
+    rows = [json.loads(line) for line in content.splitlines()]
+
+    assert [row["username"] for row in rows] == ["john-0@mail.com", "john-1@mail.com"]
+    assert rows[0]["status"] == "active"
+    assert rows[0]["roles"] == [{"name": "admin"}, {"name": "user"}]
+
+
+@pytest.mark.unit()
+def test_serialize_users_csv(users: list[UserRead]) -> None:
+    """Test users are written as CSV rows after header."""
+    content = export_header("csv") + serialize_users(users, "csv")
+
+    rows = list(csv.DictReader(io.StringIO(content)))
+
+    assert [row["id"] for row in rows] == ["0", "1"]
+    assert rows[1]["fullname"] == "John Doe 1"
+    assert rows[1]["roles"] == "admin;user"
+
+
+@pytest.mark.unit()
+def test_serialize_users_unknown_format(users: list[UserRead]) -> None:
+    """Test unknown format is rejected."""
+    with pytest.raises(ValueError):
+        serialize_users(users, "xml")
@@ -0,0 +1,56 @@
+import io
+
+import pytest
+
+from fastapi_user_management.models.role import RoleNames
+from fastapi_user_management.models.user import UserStatusValues
+from fastapi_user_management.tools.user_import import read_users
+
+
+@pytest.mark.unit()
+def test_read_users_csv() -> None:
+    """Test users are parsed from CSV with optional columns."""
+    stream = io.StringIO(
+        "fullname,username,password,password_hash,status,roles\n"
+        "John Doe,john@mail.com,secret,,active,admin;user\n"
+        "Jane Doe,jane@mail.com,,$2b$12$hash,,\n"
+    )
+
+    john, jane = list(read_users(stream, "csv"))
+
+    assert john.password == "secret"
+    assert john.status is UserStatusValues.ACTIVE
+    assert [role.name for role in john.roles] == [RoleNames.ADMIN, RoleNames.USER]
+    assert jane.password is None
+    assert jane.password_hash == "$2b$12$hash"
+    assert jane.roles == []
+
+
+@pytest.mark.unit()
+def test_read_users_jsonl() -> None:
+    """Test users are parsed from JSON Lines."""
+    stream = io.StringIO(
+        '{"fullname": "John Doe", "username": "john@mail.com", "roles": ["user"]}\n'
+        "\n"
+        '{"fullname": "Jane Doe", "username": "jane@mail.com", "roles": "admin"}\n'
+    )
+
+    john, jane = list(read_users(stream, "jsonl"))
+
+    assert john.roles[0].name is RoleNames.USER
+    assert jane.roles[0].name is RoleNames.ADMIN
+
+
+@pytest.mark.unit()
+def test_read_users_unknown_format() -> None:
+    """Test unknown format is rejected."""
+    with pytest.raises(ValueError):
+        list(read_users(io.StringIO(""), "xml"))
+
+
+@pytest.mark.unit()
+def test_read_users_malformed_csv() -> None:
+    """Test CSV parser errors surface as ValueError like invalid rows."""
+    stream = io.StringIO(f'fullname,username\n"{"x" * 200_000}",a@mail.com\n')
+    with pytest.raises(ValueError, match="Invalid CSV file"):
+        list(read_users(stream, "csv"))